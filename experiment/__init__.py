@@ -0,0 +1 @@
+"""Experiment orchestration shared by gather_results.py and run_with_game_logic.py."""
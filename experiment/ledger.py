@@ -0,0 +1,112 @@
+"""SQLite work ledger of (game, model, rep) units, so an interrupted run can resume."""
+
+import glob
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+# Pending until generation starts, running until its result is logged, then
+# done; a running unit keeps its start time for reusing recorded responses
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+LEDGER_SUFFIX = '.ledger.sqlite3'
+
+class WorkLedger:
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS units ("
+                " game TEXT, model TEXT, rep INTEGER, state TEXT,"
+                " started REAL, finished REAL, PRIMARY KEY (game, model, rep))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Same short-lived connection pattern as testing.result_cache, so
+        # generation and evaluation threads can both update the ledger
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, units):
+        """Register units as pending; units already in the ledger keep their state."""
+        with self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO units (game, model, rep, state) VALUES (?, ?, ?, ?)",
+                             [(game, model, rep, PENDING) for game, model, rep in units])
+
+    def start(self, unit):
+        with self._connect() as conn:
+            conn.execute("UPDATE units SET state = ?, started = ? WHERE game = ? AND model = ? AND rep = ?",
+                         (RUNNING, time.time(), *unit))
+
+    def finish(self, unit):
+        with self._connect() as conn:
+            conn.execute("UPDATE units SET state = ?, finished = ? WHERE game = ? AND model = ? AND rep = ?",
+                         (DONE, time.time(), *unit))
+
+    def finish_logged(self, record):
+        """Mark a logged record's unit done if the run stopped before finish()."""
+        if record is None:
+            return
+        with self._connect() as conn:
+            conn.execute("UPDATE units SET state = ?, finished = ? WHERE game = ? AND model = ? AND rep = ?"
+                         " AND state = ?",
+                         (DONE, time.time(), record['game'], record['model'], record['rep'], RUNNING))
+
+    def states(self):
+        """{(game, model, rep): (state, started)} for every unit."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT game, model, rep, state, started FROM units").fetchall()
+        return {(game, model, rep): (state, started) for game, model, rep, state, started in rows}
+
+    def remaining(self, units):
+        """The units that are not done, in the given order."""
+        states = self.states()
+        return [unit for unit in units if states.get(tuple(unit), (PENDING, None))[0] != DONE]
+
+    def interrupted(self):
+        """{unit: start time} for units that were running when the run stopped."""
+        return {unit: started for unit, (state, started) in self.states().items() if state == RUNNING}
+
+    def counts(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall()
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0}
+        counts.update(dict(rows))
+        return counts
+
+def ledger_path(run_base):
+    return run_base + LEDGER_SUFFIX
+
+def latest_run(prefix):
+    """Base path of the newest <prefix><timestamp> run that has a ledger, or None."""
+    pattern = re.compile(re.escape(os.path.basename(prefix)) + r'\d+' + re.escape(LEDGER_SUFFIX) + '$')
+    candidates = [path for path in glob.glob(prefix + '*' + LEDGER_SUFFIX)
+                  if pattern.match(os.path.basename(path))]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)[:-len(LEDGER_SUFFIX)]
+
+def run_base(path):
+    """Base path of a run from its .json, .jsonl or ledger file name."""
+    if path.endswith(LEDGER_SUFFIX):
+        return path[:-len(LEDGER_SUFFIX)]
+    return os.path.splitext(path)[0]
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: python -m experiment.ledger <run>{LEDGER_SUFFIX}")
+        return
+    counts = WorkLedger(sys.argv[1]).counts()
+    print(', '.join(f"{state}: {count}" for state, count in counts.items()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Bounded producer/consumer pipeline that overlaps generation and evaluation."""
+
+import queue
+import threading
+import time
+
+DEFAULT_GENERATORS = 4
+DEFAULT_EVALUATORS = 1
+DEFAULT_QUEUE_SIZE = 4
+
+_DONE = object()
+
+class _Abort:
+    def __init__(self, error):
+        self.error = error
+
+class StageError:
+    """Stands in for a stage's output when the stage raised."""
+
+    def __init__(self, stage, error):
+        self.stage = stage
+        self.error = error
+
+    def __repr__(self):
+        return f"StageError({self.stage!r}, {self.error!r})"
+
+class DepthGauge:
+    """Queue depth seen by each put and get: max and time-weighted mean."""
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.depth = 0
+        self.max = 0
+        self.area = 0.0
+        self.started = time.monotonic()
+        self.changed = self.started
+
+    def _move(self, delta):
+        with self.lock:
+            now = time.monotonic()
+            self.area += self.depth * (now - self.changed)
+            self.changed = now
+            self.depth += delta
+            self.max = max(self.max, self.depth)
+
+    def added(self):
+        self._move(1)
+
+    def removed(self):
+        self._move(-1)
+
+    def summary(self):
+        with self.lock:
+            now = time.monotonic()
+            area = self.area + self.depth * (now - self.changed)
+            elapsed = now - self.started
+            return {
+                'capacity': self.capacity,
+                'max': self.max,
+                'mean': area / elapsed if elapsed > 0 else 0.0,
+            }
+
+class StageTimer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+
+    def record(self, busy, blocked=0.0):
+        with self.lock:
+            self.count += 1
+            self.busy += busy
+            self.blocked += blocked
+
+    def summary(self, workers):
+        with self.lock:
+            return {
+                'workers': workers,
+                'done': self.count,
+                'busy_s': round(self.busy, 3),
+                'mean_s': round(self.busy / self.count, 3) if self.count else None,
+                # Time spent waiting on a full queue (back-pressure)
+                'blocked_s': round(self.blocked, 3),
+            }
+
+class Pipeline:
+    def __init__(self, generate, evaluate, on_result, generators=DEFAULT_GENERATORS,
+                 evaluators=DEFAULT_EVALUATORS, queue_size=DEFAULT_QUEUE_SIZE):
+        self.generate = generate
+        self.evaluate = evaluate
+        self.on_result = on_result
+        self.generators = max(1, generators)
+        self.evaluators = max(1, evaluators)
+        self.queue_size = max(1, queue_size)
+        self._reset()
+
+    def _reset(self):
+        self.ready = queue.Queue(self.queue_size)
+        self.results = queue.Queue()
+        self.ready_depth = DepthGauge(self.queue_size)
+        self.reorder_depth = DepthGauge()
+        self.generate_timer = StageTimer()
+        self.evaluate_timer = StageTimer()
+        self.wall = 0.0
+        self._stop = threading.Event()
+
+    def _put_ready(self, item):
+        # Give up once the run is aborted, instead of blocking forever on a
+        # queue nobody drains
+        while not self._stop.is_set():
+            try:
+                self.ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _generate_worker(self, units, units_lock):
+        while not self._stop.is_set():
+            with units_lock:
+                try:
+                    index, unit = next(units)
+                except StopIteration:
+                    return
+            start = time.monotonic()
+            try:
+                generated = self.generate(unit)
+            except Exception as e:
+                generated = StageError('generate', f"{type(e).__name__}: {e}")
+            except BaseException as e:
+                self.results.put(_Abort(e))
+                return
+            generated_at = time.monotonic()
+            if not self._put_ready((index, unit, generated)):
+                return
+            self.ready_depth.added()
+            self.generate_timer.record(generated_at - start, time.monotonic() - generated_at)
+
+    def _evaluate_worker(self):
+        while True:
+            item = self.ready.get()
+            if item is _DONE:
+                return
+            self.ready_depth.removed()
+            index, unit, generated = item
+            start = time.monotonic()
+            try:
+                result = self.evaluate(unit, generated)
+            except Exception as e:
+                result = StageError('evaluate', f"{type(e).__name__}: {e}")
+            except BaseException as e:
+                self.results.put(_Abort(e))
+                return
+            self.evaluate_timer.record(time.monotonic() - start)
+            self.results.put((index, unit, result))
+
+    def run(self, units):
+        """Process every unit, delivering results to on_result in unit order."""
+        self._reset()
+        units = list(units)
+        started = time.monotonic()
+        source = iter(enumerate(units))
+        source_lock = threading.Lock()
+        generators = [threading.Thread(target=self._generate_worker, args=(source, source_lock),
+                                       name=f'generate-{i}', daemon=True)
+                      for i in range(min(self.generators, len(units)) or 1)]
+        evaluators = [threading.Thread(target=self._evaluate_worker, name=f'evaluate-{i}', daemon=True)
+                      for i in range(self.evaluators)]
+        for thread in generators + evaluators:
+            thread.start()
+
+        pending = {}
+        next_index = 0
+        try:
+            while next_index < len(units):
+                item = self.results.get()
+                if isinstance(item, _Abort):
+                    raise item.error
+                index, unit, result = item
+                pending[index] = (unit, result)
+                self.reorder_depth.added()
+                while next_index in pending:
+                    unit, result = pending.pop(next_index)
+                    self.reorder_depth.removed()
+                    self.on_result(unit, result)
+                    next_index += 1
+        except BaseException:
+            # Workers are daemons: stop handing out units and leave any
+            # stage call still running to finish on its own
+            self._stop.set()
+            self.wall = time.monotonic() - started
+            raise
+        for thread in generators:
+            thread.join()
+        for _ in evaluators:
+            self.ready.put(_DONE)
+        for thread in evaluators:
+            thread.join()
+        self.wall = time.monotonic() - started
+
+    def metrics(self):
+        return {
+            'wall_s': round(self.wall, 3),
+            'generate': self.generate_timer.summary(self.generators),
+            'ready_queue': self.ready_depth.summary(),
+            'evaluate': self.evaluate_timer.summary(self.evaluators),
+            'reorder_buffer': self.reorder_depth.summary(),
+        }
+
+def format_metrics(metrics):
+    """One line per stage, for the end-of-run log."""
+    g, q, e, r = metrics['generate'], metrics['ready_queue'], metrics['evaluate'], metrics['reorder_buffer']
+    return '\n'.join([
+        f"Pipeline: {metrics['wall_s']:.1f}s wall",
+        f"  generate: {g['done']} done by {g['workers']} workers, {g['busy_s']:.1f}s busy, "
+        f"{g['blocked_s']:.1f}s blocked on a full queue",
+        f"  ready queue: max {q['max']}/{q['capacity']}, mean {q['mean']:.2f}",
+        f"  evaluate: {e['done']} done by {e['workers']} workers, {e['busy_s']:.1f}s busy",
+        f"  reorder buffer: max {r['max']}, mean {r['mean']:.2f}",
+    ])
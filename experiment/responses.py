@@ -0,0 +1,138 @@
+"""Append-only gzip store of raw LLM responses, for re-evaluation without API calls."""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+DEFAULT_STORE_PATH = os.path.join('responses', 'responses.jsonl.gz')
+GZIP_MAGIC = b'\x1f\x8b\x08'
+READ_BLOCK = 65536
+
+def prompt_hash(prompt):
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+def _read_member(data, offset):
+    """(record, end offset) for the gzip member at offset; record is None if it is torn."""
+    decompressor = zlib.decompressobj(wbits=31)
+    view = memoryview(data)
+    pieces = []
+    position = offset
+    try:
+        while not decompressor.eof and position < len(data):
+            block = view[position:position + READ_BLOCK]
+            pieces.append(decompressor.decompress(block))
+            position += len(block)
+    except zlib.error:
+        return None, None
+    if not decompressor.eof:
+        return None, None
+    end = position - len(decompressor.unused_data)
+    try:
+        return json.loads(b''.join(pieces)), end
+    except ValueError:
+        return None, end
+
+def _members(data):
+    """(record, end offset) for every complete member, oldest first."""
+    offset = 0
+    while offset < len(data):
+        record, end = _read_member(data, offset)
+        if record is not None:
+            yield record, end
+            offset = end
+        else:
+            # Torn by a crash; a later writer's member starts at a header
+            offset = data.find(GZIP_MAGIC, offset + 1)
+            if offset == -1:
+                return
+
+def _repair_tail(path):
+    """Drop a torn last member, so appends follow a complete one."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        data = f.read()
+        end = 0
+        for _, end in _members(data):
+            pass
+        if end != len(data):
+            f.truncate(end)
+
+class ResponseStore:
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('LLM_RESPONSE_STORE', DEFAULT_STORE_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _repair_tail(self.path)
+        self._lock = threading.Lock()
+        self._index = None
+
+    def append(self, provider, model, prompt, temperature, rep, response):
+        record = {
+            'provider': provider,
+            'model': model,
+            'prompt_hash': prompt_hash(prompt),
+            'temperature': temperature,
+            'rep': rep,
+            'timestamp': time.time(),
+            'response': response,
+        }
+        # One gzip member per record in a single O_APPEND write, so concurrent
+        # writers never interleave
+        member = gzip.compress((json.dumps(record) + '\n').encode('utf-8'))
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, member)
+            finally:
+                os.close(fd)
+            if self._index is not None:
+                self._add(self._index, record)
+
+    def records(self):
+        """Every complete record, oldest first."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for record, _ in _members(data):
+            yield record
+
+    @staticmethod
+    def _add(index, record):
+        key = (record['provider'], record['model'], record['prompt_hash'],
+               record['temperature'], record['rep'])
+        if key not in index or index[key]['timestamp'] <= record['timestamp']:
+            index[key] = record
+
+    def lookup(self, provider, model, prompt, temperature, rep, since=None):
+        """The latest matching response (no earlier than since), or None."""
+        with self._lock:
+            if self._index is None:
+                self._index = {}
+                for record in self.records():
+                    self._add(self._index, record)
+            record = self._index.get((provider, model, prompt_hash(prompt), temperature, rep))
+        if record is None or (since is not None and record['timestamp'] < since):
+            return None
+        return record['response']
+
+def main():
+    store = ResponseStore(sys.argv[1] if len(sys.argv) > 1 else None)
+    counts = Counter((r['provider'], r['model'], r['temperature']) for r in store.records())
+    if not counts:
+        print(f"No responses in {store.path}")
+        return
+    print(f"{store.path}:")
+    for (provider, model, temperature), count in sorted(counts.items()):
+        print(f"  {provider} ({model}), temperature {temperature}: {count} responses")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Append-only JSONL log of experiment results, compacted to the nested view on demand."""
+
+import json
+import os
+import sys
+import threading
+import time
+
+# Every line is flushed; fsync bounds what a machine crash can lose
+DEFAULT_FSYNC_EVERY = 16
+DEFAULT_FSYNC_INTERVAL = 5.0
+TAIL_BLOCK = 64 * 1024
+
+def _repair_tail(path):
+    """Drop a partial last line left by a crash, so appends start on a fresh line."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - TAIL_BLOCK)
+            f.seek(start)
+            block = f.read(end - start)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            f.truncate(end)
+
+class ResultLog:
+    def __init__(self, path, fsync_every=DEFAULT_FSYNC_EVERY, fsync_interval=DEFAULT_FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _repair_tail(path)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def append(self, game, model, rep, result):
+        line = json.dumps({'game': game, 'model': model, 'rep': rep, 'result': result})
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._synced_at >= self.fsync_interval):
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            self._sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_log(path):
+    """Every complete record, in write order."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                # Cut off by a crash
+                return
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def compact(records):
+    """The nested {game: {model: [result, ...]}} view, ordered by rep; later records win."""
+    view = {}
+    for record in records:
+        view.setdefault(record['game'], {}).setdefault(record['model'], {})[record['rep']] = record['result']
+    return {game: {model: [by_rep[rep] for rep in sorted(by_rep)] for model, by_rep in models.items()}
+            for game, models in view.items()}
+
+def materialize(log_path, output_path):
+    """Write the compacted view of a log as indented JSON, atomically."""
+    view = compact(read_log(log_path))
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(view, f, indent=2)
+    os.replace(temp_path, output_path)
+    return view
+
+def last_record(path):
+    """The last complete record, read from the end of the file."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b''
+        while end > 0:
+            start = max(0, end - TAIL_BLOCK)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+            lines = tail.split(b'\n')
+            # lines[-1] is a partial line (or empty); lines[0] may be
+            # partial unless the read reached the start of the file
+            complete = lines[:-1] if end == 0 else lines[1:-1]
+            for line in reversed(complete):
+                try:
+                    return json.loads(line)
+                except ValueError:
+                    continue
+    return None
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m experiment.result_log <log.jsonl> [view.json]")
+        return
+    log_path = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(log_path)[0] + '.json'
+    view = materialize(log_path, output_path)
+    count = sum(len(results) for models in view.values() for results in models.values())
+    print(f"Wrote {count} results to {output_path}")
+
+if __name__ == '__main__':
+    main()
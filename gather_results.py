@@ -1,78 +1,56 @@
 import json
 import os
 import sys
-import subprocess
 import time
+from experiment.pipeline import Pipeline, StageError, format_metrics
+from experiment.responses import ResponseStore
+from experiment.ledger import LEDGER_SUFFIX, WorkLedger, latest_run, ledger_path, run_base
+from experiment.result_log import ResultLog, compact, last_record, materialize, read_log
+from llm import providers
 from testing.evaluator import evaluate_code, generate_summary
+from testing.result_cache import ResultCache
 from prompts.templates import get_prompt, GAME_PROMPTS
 
 GAMES = list(GAME_PROMPTS.keys())
 REPETITIONS = 20
 TEMPERATURE = 0.75
 RUNTIME_ITERATIONS = 10
+RUNTIME_MODE = 'subprocess'
+RUNTIME_WORKERS = os.cpu_count() or 1
+RUNTIME_EARLY_STOP = False
+RUNTIME_CONFIDENCE = None
+RUNTIME_FRAME_BUDGET = None
+RUNTIME_INJECT_INPUT = False
+STATIC_PRESCREEN = False
+DIFFERENTIAL_CHECK = False
+USE_RESULT_CACHE = True
+PIPELINE_GENERATORS = 4
+PIPELINE_EVALUATORS = 1
+PIPELINE_QUEUE_SIZE = 4
+RECORD_RESPONSES = True
+STREAM_GENERATION = False
 
 os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY', '')
 os.environ['GEMINI_API_KEY'] = os.getenv('GEMINI_API_KEY', '')
 
 def call_llm_api(prompt, model_name, temperature=TEMPERATURE):
-    if model_name == "openai":
-        try:
-            import openai
-            client = openai.OpenAI()
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"OpenAI API error: {e}")
-            return None
-    elif model_name == "gemini":
-        try:
-            import google.generativeai as genai
-            genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(
-                prompt,
-                generation_config={'temperature': temperature}
-            )
-            return response.text
-        except Exception as e:
-            print(f"Gemini API error: {e}")
-            return None
-    elif model_name == "anthropic":
-        try:
-            import anthropic
-            client = anthropic.Anthropic()
-            message = client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4096,
-                temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return message.content[0].text
-        except Exception as e:
-            print(f"Anthropic API error: {e}")
-            return None
-    elif model_name.startswith("local_"):
-        try:
-            model_path = model_name.replace("local_", "")
-            result = subprocess.run(
-                ["python", "-c", f"import sys; sys.path.insert(0, '.'); from local_llm import generate; print(generate('''{prompt}''', '{model_path}', {temperature}))"],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-            return None
-        except Exception as e:
-            print(f"Local model error: {e}")
-            return None
-    else:
+    # Concurrency, rate limits and retries live in the shared provider
+    try:
+        if STREAM_GENERATION:
+            # Stops once the first python block closes; prose-only and
+            # over-long responses are cancelled
+            scanner = providers.generate_streaming_sync(model_name, prompt, temperature)
+            if scanner.abort_reason:
+                print(f"{model_name}: generation stopped early ({scanner.abort_reason})")
+                return None
+            return scanner.text
+        return providers.generate_sync(model_name, prompt, temperature)
+    except providers.UnknownProvider:
         print(f"Unknown model: {model_name}")
         return None
+    except Exception as e:
+        print(f"{model_name} API error: {e}")
+        return None
 
 def extract_code_from_response(response):
     if "```python" in response:
@@ -85,13 +63,36 @@ def extract_code_from_response(response):
         return response[start:end].strip()
     return response.strip()
 
-def run_experiment(game_name, model_name, repetition):
+def get_response(prompt, model_name, repetition, responses=None, replay=False, recorded_since=None):
+    """The API response, recorded in responses, or the recorded one in replay mode."""
+    model = providers.get_provider(model_name).model
+    if replay:
+        return responses.lookup(model_name, model, prompt, TEMPERATURE, repetition)
+    # Reuse what an interrupted run recorded after recorded_since
+    if recorded_since is not None and responses is not None:
+        response = responses.lookup(model_name, model, prompt, TEMPERATURE, repetition,
+                                    since=recorded_since)
+        if response is not None:
+            return response
+    response = call_llm_api(prompt, model_name, TEMPERATURE)
+    if response is not None and responses is not None:
+        responses.append(model_name, model, prompt, TEMPERATURE, repetition, response)
+    return response
+
+def generate_sample(game_name, model_name, repetition, responses=None, replay=False, recorded_since=None):
+    """API call plus extraction; returns the code or None."""
     prompt = get_prompt(game_name)
-    print(f"  Rep {repetition+1}/{REPETITIONS}: Generating code...", flush=True)
+    if replay:
+        print(f"  Rep {repetition+1}/{REPETITIONS}: Loading recorded response...", flush=True)
+    else:
+        print(f"  Rep {repetition+1}/{REPETITIONS}: Generating code...", flush=True)
     
-    response = call_llm_api(prompt, model_name, TEMPERATURE)
+    response = get_response(prompt, model_name, repetition, responses, replay, recorded_since)
     if response is None:
-        print(f"  Rep {repetition+1}/{REPETITIONS}: API call failed", flush=True)
+        if replay:
+            print(f"  Rep {repetition+1}/{REPETITIONS}: No recorded response", flush=True)
+        else:
+            print(f"  Rep {repetition+1}/{REPETITIONS}: API call failed", flush=True)
         return None
     
     print(f"  Rep {repetition+1}/{REPETITIONS}: Extracting code...", flush=True)
@@ -99,9 +100,14 @@ def run_experiment(game_name, model_name, repetition):
     if not code:
         print(f"  Rep {repetition+1}/{REPETITIONS}: Code extraction failed", flush=True)
         return None
-    
+    return code
+
+def evaluate_sample(code, game_name, repetition, cache=None):
     print(f"  Rep {repetition+1}/{REPETITIONS}: Evaluating (this may take a minute)...", flush=True)
-    results = evaluate_code(code, game_name, RUNTIME_ITERATIONS)
+    results = evaluate_code(code, game_name, RUNTIME_ITERATIONS, runtime_mode=RUNTIME_MODE, runtime_workers=RUNTIME_WORKERS,
+                            runtime_early_stop=RUNTIME_EARLY_STOP, runtime_confidence=RUNTIME_CONFIDENCE,
+                            runtime_frame_budget=RUNTIME_FRAME_BUDGET, runtime_inject_input=RUNTIME_INJECT_INPUT,
+                            static_check=STATIC_PRESCREEN, differential_check=DIFFERENTIAL_CHECK, cache=cache)
     summary = generate_summary(results)
     print(f"  Rep {repetition+1}/{REPETITIONS}: Done - Syntax:{summary['syntax_passed']} Runtime:{summary['runtime_passed']} Semantic:{summary['semantic_passed']}", flush=True)
     
@@ -111,74 +117,141 @@ def run_experiment(game_name, model_name, repetition):
         'summary': summary
     }
 
-def save_incremental(all_results, output_file):
-    try:
-        with open(output_file, 'w') as f:
-            json.dump(all_results, f, indent=2)
-    except Exception as e:
-        print(f"Warning: Could not save results: {e}")
+def run_experiment(game_name, model_name, repetition, cache=None, responses=None, replay=False):
+    code = generate_sample(game_name, model_name, repetition, responses, replay)
+    if code is None:
+        return None
+    return evaluate_sample(code, game_name, repetition, cache)
+
+def failed_result():
+    return {
+        'code': None,
+        'results': None,
+        'summary': {'syntax_passed': False, 'runtime_passed': False, 'semantic_passed': False, 'overall_passed': False}
+    }
+
+def print_model_summary(results, model):
+    passed_counts = {'syntax': 0, 'runtime': 0, 'semantic': 0, 'overall': 0}
+    for r in results:
+        if r and r.get('summary'):
+            s = r['summary']
+            if s.get('syntax_passed'):
+                passed_counts['syntax'] += 1
+            if s.get('runtime_passed'):
+                passed_counts['runtime'] += 1
+            if s.get('semantic_passed'):
+                passed_counts['semantic'] += 1
+            if s.get('overall_passed'):
+                passed_counts['overall'] += 1
+    
+    print(f"\n  Results for {model}:")
+    print(f"    Syntax: {passed_counts['syntax']}/{REPETITIONS}")
+    print(f"    Runtime: {passed_counts['runtime']}/{REPETITIONS}")
+    print(f"    Semantic: {passed_counts['semantic']}/{REPETITIONS}")
+    print(f"    Overall: {passed_counts['overall']}/{REPETITIONS}")
 
 def main():
     models = []
-    if len(sys.argv) > 1:
-        models = sys.argv[1].split(',')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    replay = '--replay' in sys.argv[1:]
+    resume = [arg for arg in sys.argv[1:] if arg == '--resume' or arg.startswith('--resume=')]
+    if args:
+        models = args[0].split(',')
     else:
-        print("Usage: python gather_results.py <model1,model2,...>")
+        print("Usage: python gather_results.py <model1,model2,...> [--replay] [--resume[=<run file>]]")
         print("Example: python gather_results.py openai,anthropic")
+        print("--replay re-evaluates recorded responses instead of calling the APIs")
+        print("--resume continues the latest (or the given) interrupted run")
         return
     
-    output_file = f"experiment_results_{int(time.time())}.json"
-    all_results = {}
+    prefix = "experiment_results_replay_" if replay else "experiment_results_"
+    if resume:
+        base = run_base(resume[0].split('=', 1)[1]) if '=' in resume[0] else latest_run(prefix)
+        if base is None or not os.path.exists(ledger_path(base)):
+            print(f"No run to resume ({prefix}<timestamp>{LEDGER_SUFFIX} not found)")
+            return
+    else:
+        base = f"{prefix}{int(time.time())}"
+    output_file = base + '.json'
+    # One appended line per sample; the nested JSON file is built from the
+    # log at the end (or on demand with python -m experiment.result_log)
+    log_file = base + '.jsonl'
+    result_log = ResultLog(log_file)
+    ledger = WorkLedger(ledger_path(base))
+    cache = ResultCache() if USE_RESULT_CACHE else None
+    responses = ResponseStore() if replay or RECORD_RESPONSES else None
+    if replay:
+        print(f"Replaying recorded responses from: {responses.path}")
+    
+    units = [(game, model, rep) for game in GAMES for model in models for rep in range(REPETITIONS)]
+    ledger.add(units)
+    # Only the last logged result can have missed its finish()
+    ledger.finish_logged(last_record(log_file))
+    interrupted = ledger.interrupted()
+    todo = ledger.remaining(units)
+    # The last unit of each game/model in this run, to print its summary
+    last_unit = {(game, model): rep for game, model, rep in todo}
+    # Results of units finished before a resume, for the summaries
+    remaining = set(todo)
+    all_results = compact(record for record in read_log(log_file)
+                          if (record['game'], record['model'], record['rep']) not in remaining)
     
-    print(f"Results will be saved incrementally to: {output_file}")
+    print(f"Results will be logged incrementally to: {log_file}")
+    if resume:
+        print(f"Resuming: {len(units) - len(todo)} of {len(units)} samples already done")
     print(f"Starting experiment with {len(GAMES)} games, {REPETITIONS} repetitions each\n")
     
-    save_incremental(all_results, output_file)
+    # Generation runs ahead of evaluation on a bounded queue; results
+    # still arrive here in (game, model, rep) order
+    def generate(unit):
+        game, model, rep = unit
+        ledger.start(unit)
+        return generate_sample(game, model, rep, responses, replay, interrupted.get(unit))
     
-    for game in GAMES:
-        print(f"\n{'='*60}")
-        print(f"Game: {game}")
-        print(f"{'='*60}")
-        all_results[game] = {}
-        
-        for model in models:
+    def evaluate(unit, code):
+        game, model, rep = unit
+        if code is None or isinstance(code, StageError):
+            return code
+        return evaluate_sample(code, game, rep, cache)
+    
+    started = set()
+    
+    def on_result(unit, result):
+        game, model, rep = unit
+        if (game, model) not in started:
+            if not any(g == game for g, _ in started):
+                print(f"\n{'='*60}")
+                print(f"Game: {game}")
+                print(f"{'='*60}")
             print(f"\nModel: {model}")
-            all_results[game][model] = []
-            
-            for rep in range(REPETITIONS):
-                result = run_experiment(game, model, rep)
-                if result:
-                    all_results[game][model].append(result)
-                else:
-                    all_results[game][model].append({
-                        'code': None,
-                        'results': None,
-                        'summary': {'syntax_passed': False, 'runtime_passed': False, 'semantic_passed': False, 'overall_passed': False}
-                    })
-                
-                save_incremental(all_results, output_file)
-                time.sleep(1)
-            
-            passed_counts = {'syntax': 0, 'runtime': 0, 'semantic': 0, 'overall': 0}
-            for r in all_results[game][model]:
-                if r and r.get('summary'):
-                    s = r['summary']
-                    if s.get('syntax_passed'):
-                        passed_counts['syntax'] += 1
-                    if s.get('runtime_passed'):
-                        passed_counts['runtime'] += 1
-                    if s.get('semantic_passed'):
-                        passed_counts['semantic'] += 1
-                    if s.get('overall_passed'):
-                        passed_counts['overall'] += 1
-            
-            print(f"\n  Results for {model}:")
-            print(f"    Syntax: {passed_counts['syntax']}/{REPETITIONS}")
-            print(f"    Runtime: {passed_counts['runtime']}/{REPETITIONS}")
-            print(f"    Semantic: {passed_counts['semantic']}/{REPETITIONS}")
-            print(f"    Overall: {passed_counts['overall']}/{REPETITIONS}")
-            
-            save_incremental(all_results, output_file)
+            started.add((game, model))
+            all_results.setdefault(game, {}).setdefault(model, [])
+        if isinstance(result, StageError):
+            print(f"  Rep {rep+1}/{REPETITIONS}: {result.stage} failed: {result.error}", flush=True)
+        if result and not isinstance(result, StageError):
+            all_results[game][model].append(result)
+        else:
+            all_results[game][model].append(failed_result())
+        
+        # Logged before the ledger marks it done: a resume finishes it from
+        # the log's last record
+        result_log.append(game, model, rep, all_results[game][model][-1])
+        ledger.finish(unit)
+        if rep == last_unit[(game, model)]:
+            print_model_summary(all_results[game][model], model)
+    
+    pipeline = Pipeline(generate, evaluate, on_result, generators=PIPELINE_GENERATORS,
+                        evaluators=PIPELINE_EVALUATORS, queue_size=PIPELINE_QUEUE_SIZE)
+    try:
+        pipeline.run(todo)
+    finally:
+        result_log.close()
+    materialize(log_file, output_file)
+    print()
+    print(format_metrics(pipeline.metrics()))
+    latency = providers.format_latency_report(providers.latency_report())
+    if latency:
+        print(latency)
     
     print(f"\n\nAll results saved to {output_file}")
     
@@ -0,0 +1,3 @@
+"""
+Asynchronous LLM provider layer used by the experiment scripts.
+"""
@@ -0,0 +1,79 @@
+"""Incremental fenced-code scanner that stops a streamed completion once its code is in."""
+
+# Stop once the first python block closes (the extractors use nothing after
+# it); abort prose with no fence or code-like line within NO_CODE_CHARS, and
+# anything past MAX_RESPONSE_CHARS
+MAX_RESPONSE_CHARS = 40000
+NO_CODE_CHARS = 1500
+FENCE = '```'
+CODE_HINTS = ('import ', 'from ', 'def ', 'class ', 'while ', 'pygame.', '#')
+
+class CodeScanner:
+    def __init__(self, max_chars=MAX_RESPONSE_CHARS, no_code_chars=NO_CODE_CHARS):
+        self.max_chars = max_chars
+        self.no_code_chars = no_code_chars
+        self.reset()
+
+    def reset(self):
+        """Start over, e.g. for a retried request."""
+        self.pieces = []
+        self.length = 0
+        # Text not yet scanned for fences; only this is searched, so each
+        # character is scanned about once
+        self.unscanned = ''
+        self.block = None
+        self.fences = 0
+        self.looks_like_code = None
+        self.complete = False
+        self.abort_reason = None
+
+    @property
+    def text(self):
+        return ''.join(self.pieces)
+
+    @property
+    def stopped(self):
+        return self.complete or self.abort_reason is not None
+
+    def feed(self, piece):
+        """Add streamed text; returns True while the stream should go on."""
+        if self.stopped:
+            return False
+        self.pieces.append(piece)
+        self.length += len(piece)
+        self.unscanned += piece
+        self._scan_fences()
+        if self.complete:
+            return False
+        if self.length > self.max_chars:
+            self.abort_reason = 'length budget'
+        elif not self.fences and self.length >= self.no_code_chars:
+            if self.looks_like_code is None:
+                self.looks_like_code = any(line.lstrip().startswith(CODE_HINTS)
+                                           for line in self.text.splitlines())
+            if not self.looks_like_code:
+                self.abort_reason = 'no code'
+        return not self.stopped
+
+    def _scan_fences(self):
+        while True:
+            position = self.unscanned.find(FENCE)
+            if position == -1:
+                # Keep enough to see a fence split across pieces
+                self.unscanned = self.unscanned[-(len(FENCE) - 1):]
+                return
+            if self.block is None:
+                newline = self.unscanned.find('\n', position)
+                if newline == -1:
+                    # Wait for the whole info string
+                    self.unscanned = self.unscanned[position:]
+                    return
+                self.block = self.unscanned[position + len(FENCE):newline].strip()
+                self.fences += 1
+                self.unscanned = self.unscanned[newline + 1:]
+            else:
+                if self.block.startswith('python'):
+                    self.complete = True
+                    return
+                self.block = None
+                self.unscanned = self.unscanned[position + len(FENCE):]
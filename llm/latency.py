@@ -0,0 +1,47 @@
+"""Fixed-bucket latency histograms for provider requests."""
+
+import bisect
+import threading
+
+# Upper bounds in seconds, roughly logarithmic; recording is O(1) in fixed memory
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 300.0)
+
+class LatencyHistogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th quantile, or the maximum if it overflows."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank and count:
+                    return self.buckets[index] if index < len(self.buckets) else self.max
+            return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_s': round(self.total / self.count, 3) if self.count else None,
+            'p50_s': self.percentile(0.5),
+            'p90_s': self.percentile(0.9),
+            'p99_s': self.percentile(0.99),
+            'max_s': round(self.max, 3),
+            'buckets': {f'<={bound}': count for bound, count in zip(self.buckets, self.counts)},
+        }
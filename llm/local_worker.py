@@ -0,0 +1,227 @@
+"""Long-lived worker process that loads a local model once and serves batched requests."""
+
+import itertools
+import json
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+# JSON lines: {"id", "prompt", "temperature"} on stdin, {"id", "text"} or
+# {"id", "error"} on stdout; the model's own prints go to stderr
+MAX_BATCH = 8
+BATCH_WAIT = 0.02
+READ_SIZE = 65536
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class LocalWorkerError(Exception):
+    """A request the worker could not answer; crashed is True if the worker died."""
+
+    def __init__(self, message, crashed=False):
+        super().__init__(message)
+        self.crashed = crashed
+
+class LineReader:
+    """Newline-delimited messages from a file descriptor, read in batches."""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.buffer = b''
+        self.eof = False
+
+    def _take(self, limit):
+        lines = []
+        while len(lines) < limit and b'\n' in self.buffer:
+            line, self.buffer = self.buffer.split(b'\n', 1)
+            if line.strip():
+                lines.append(line)
+        return lines
+
+    def _fill(self):
+        chunk = os.read(self.fd, READ_SIZE)
+        if not chunk:
+            self.eof = True
+        self.buffer += chunk
+
+    def read_batch(self, limit=MAX_BATCH, wait=BATCH_WAIT):
+        """Up to limit lines arriving within wait seconds of the first, or None at EOF."""
+        lines = self._take(limit)
+        while not lines:
+            if self.eof:
+                return None
+            self._fill()
+            lines = self._take(limit)
+        deadline = time.monotonic() + wait
+        while len(lines) < limit and not self.eof:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                break
+            self._fill()
+            lines += self._take(limit - len(lines))
+        return lines
+
+def answer_batch(module, model_path, requests):
+    """[(id, text or None, error or None)] for a batch of requests."""
+    prompts = [request['prompt'] for request in requests]
+    temperatures = [request.get('temperature', 0.0) for request in requests]
+    if len(requests) > 1 and hasattr(module, 'generate_batch'):
+        try:
+            texts = module.generate_batch(prompts, model_path, temperatures)
+            return [(request['id'], str(text), None) for request, text in zip(requests, texts)]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            return [(request['id'], None, error) for request in requests]
+    answers = []
+    for request, prompt, temperature in zip(requests, prompts, temperatures):
+        try:
+            answers.append((request['id'], str(module.generate(prompt, model_path, temperature)), None))
+        except Exception as e:
+            answers.append((request['id'], None, f"{type(e).__name__}: {e}"))
+    return answers
+
+def serve(model_path):
+    # The protocol owns the real stdout; model code that prints is
+    # redirected to stderr
+    out = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    def send(message):
+        out.write(json.dumps(message) + '\n')
+        out.flush()
+
+    sys.path.insert(0, os.getcwd())
+    try:
+        import local_llm
+        if hasattr(local_llm, 'load'):
+            local_llm.load(model_path)
+    except BaseException as e:
+        send({'fatal': f"Could not load local_llm: {type(e).__name__}: {e}"})
+        return 1
+
+    reader = LineReader(sys.stdin.fileno())
+    while True:
+        lines = reader.read_batch()
+        if lines is None:
+            return 0
+        requests = []
+        for line in lines:
+            try:
+                requests.append(json.loads(line))
+            except ValueError:
+                send({'id': None, 'error': 'Malformed request'})
+        for request_id, text, error in answer_batch(local_llm, model_path, requests):
+            send({'id': request_id, 'text': text} if error is None else {'id': request_id, 'error': error})
+
+class _Session:
+    """One worker process and the requests it still owes answers to."""
+
+    def __init__(self, process):
+        self.process = process
+        self.pending = {}
+
+def _resolve(future, text=None, error=None):
+    try:
+        if error is None:
+            future.set_result(text)
+        else:
+            future.set_exception(error)
+    except InvalidStateError:
+        # The caller gave up on it (timeout or cancel)
+        pass
+
+class LocalWorker:
+    def __init__(self, model_path, cwd=None):
+        self.model_path = model_path
+        self.cwd = cwd
+        self.starts = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._session = None
+
+    def _start(self):
+        env = dict(os.environ)
+        cwd = self.cwd or os.getcwd()
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, cwd, env.get('PYTHONPATH')]))
+        process = subprocess.Popen([sys.executable, '-m', 'llm.local_worker', self.model_path],
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=cwd, env=env)
+        session = _Session(process)
+        threading.Thread(target=self._read, args=(session,), name='local-worker-reader', daemon=True).start()
+        self.starts += 1
+        return session
+
+    def _read(self, session):
+        fatal = None
+        for line in session.process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if 'fatal' in message:
+                fatal = message['fatal']
+                continue
+            with self._lock:
+                future = session.pending.pop(message.get('id'), None)
+            if future is not None:
+                if 'error' in message:
+                    _resolve(future, error=LocalWorkerError(message['error']))
+                else:
+                    _resolve(future, message.get('text'))
+        session.process.wait()
+        with self._lock:
+            if self._session is session:
+                self._session = None
+            pending, session.pending = session.pending, {}
+        if fatal is not None:
+            error = LocalWorkerError(fatal)
+        else:
+            error = LocalWorkerError(f"Local worker exited with code {session.process.returncode}", crashed=True)
+        for future in pending.values():
+            _resolve(future, error=error)
+
+    def submit(self, prompt, temperature):
+        """Send one request; returns a concurrent.futures.Future for its text."""
+        future = Future()
+        with self._lock:
+            if self._session is None or self._session.process.poll() is not None:
+                self._session = self._start()
+            session = self._session
+            request_id = next(self._ids)
+            session.pending[request_id] = future
+            message = json.dumps({'id': request_id, 'prompt': prompt, 'temperature': temperature})
+            try:
+                session.process.stdin.write((message + '\n').encode('utf-8'))
+                session.process.stdin.flush()
+            except (BrokenPipeError, OSError):
+                # The reader fails this request once it sees the exit
+                pass
+        return future
+
+    def restart(self):
+        """Kill the worker; pending requests fail and the next submit starts a fresh one."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.process.kill()
+
+    def close(self):
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.process.stdin.close()
+            try:
+                session.process.wait(5)
+            except subprocess.TimeoutExpired:
+                session.process.kill()
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python -m llm.local_worker <model path>", file=sys.stderr)
+        return 2
+    return serve(sys.argv[1])
+
+if __name__ == '__main__':
+    sys.exit(main())
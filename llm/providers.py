@@ -0,0 +1,409 @@
+"""Shared async provider clients with per-provider concurrency, rate limits and retries."""
+
+import asyncio
+import importlib
+import os
+import random
+import threading
+import time
+from .code_scanner import CodeScanner
+from .latency import LatencyHistogram
+from .local_worker import LocalWorker, LocalWorkerError
+from .rate_limit import TokenBucket
+
+PROVIDER_SETTINGS = {
+    'openai': {'concurrency': 8, 'rate': 3.0, 'burst': 5},
+    'gemini': {'concurrency': 4, 'rate': 1.0, 'burst': 2},
+    'anthropic': {'concurrency': 4, 'rate': 1.0, 'burst': 2},
+    # Enough requests in flight for the worker to batch them
+    'local': {'concurrency': 8, 'rate': 100.0, 'burst': 8},
+}
+MAX_RETRIES = 5
+RETRY_STATUSES = (429, 500, 502, 503, 504, 529)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+REQUEST_TIMEOUT = 300
+
+class ProviderError(Exception):
+    pass
+
+class UnknownProvider(ProviderError):
+    pass
+
+def retry_delay(attempt, retry_after=None):
+    """Seconds before retry number attempt: the server's Retry-After, else jittered backoff."""
+    if retry_after is not None:
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+class Provider:
+    name = None
+
+    def __init__(self, model=None, concurrency=None, rate=None, burst=None, timeout=REQUEST_TIMEOUT):
+        settings = PROVIDER_SETTINGS[self.name]
+        self.model = model or self.default_model
+        self.concurrency = concurrency or settings['concurrency']
+        self.bucket = TokenBucket(rate or settings['rate'], burst or settings['burst'])
+        self.timeout = timeout
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0, 'stopped_early': 0}
+        # 'request': each attempt on the wire; 'generate': a whole call,
+        # including waits for a slot, a token and retries
+        self.latency = {'request': LatencyHistogram(), 'generate': LatencyHistogram()}
+        self._semaphore = None
+        self._loop = None
+
+    def _limits(self):
+        # asyncio primitives belong to one loop; rebuild them if this
+        # provider is used from another one
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self.bucket.rebind()
+            self._loop_changed()
+        return self._semaphore
+
+    def _loop_changed(self):
+        pass
+
+    def _failure(self, error):
+        """(status, retry_after, message) for a failed attempt's exception, or None."""
+        if isinstance(error, (OSError, asyncio.TimeoutError)):
+            return None, None, f"{type(error).__name__}: {error}"
+        return None
+
+    async def _attempt(self, prompt, temperature):
+        """One request; returns (text, None) or (None, (status, retry_after, message))."""
+        raise NotImplementedError
+
+    async def _stream_attempt(self, prompt, temperature, scanner):
+        """One streamed request feeding scanner; same return as _attempt."""
+        text, failure = await self._attempt(prompt, temperature)
+        if failure is None:
+            scanner.feed(text)
+        return text, failure
+
+    async def _feed(self, pieces, scanner):
+        """Feed an async iterable of text pieces to scanner until it stops."""
+        async for text in pieces:
+            if text and not scanner.feed(text):
+                self.stats['stopped_early'] += 1
+                break
+        return scanner.text, None
+
+    async def _run(self, attempt):
+        started = time.monotonic()
+        async with self._limits():
+            for retry in range(MAX_RETRIES + 1):
+                await self.bucket.acquire()
+                self.stats['requests'] += 1
+                sent = time.monotonic()
+                try:
+                    text, failure = await attempt()
+                except Exception as e:
+                    failure = self._failure(e)
+                    if failure is None:
+                        raise
+                    text = None
+                self.latency['request'].record(time.monotonic() - sent)
+                if failure is None:
+                    self.latency['generate'].record(time.monotonic() - started)
+                    return text
+                status, retry_after, message = failure
+                retryable = status is None or status in RETRY_STATUSES
+                if not retryable or retry == MAX_RETRIES:
+                    self.stats['failures'] += 1
+                    raise ProviderError(f"{self.name}: {message}")
+                self.stats['retries'] += 1
+                delay = retry_delay(retry, retry_after)
+                if status == 429:
+                    self.stats['rate_limited'] += 1
+                    self.bucket.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+
+    async def generate(self, prompt, temperature):
+        return await self._run(lambda: self._attempt(prompt, temperature))
+
+    async def generate_streaming(self, prompt, temperature, scanner=None):
+        """Stream the completion into a CodeScanner until it stops; returns the scanner."""
+        scanner = scanner or CodeScanner()
+
+        def attempt():
+            # A retry starts the completion over
+            scanner.reset()
+            return self._stream_attempt(prompt, temperature, scanner)
+
+        await self._run(attempt)
+        return scanner
+
+class SDKProvider(Provider):
+    """A provider reached through its vendor's async SDK client."""
+    api_key_env = None
+    base_url_env = None
+
+    def __init__(self, model=None, api_key=None, base_url=None, **limits):
+        super().__init__(model, **limits)
+        # None lets the SDK fall back to its own environment variables
+        self.api_key = api_key or os.getenv(self.api_key_env) or None
+        self.base_url = base_url or os.getenv(self.base_url_env) or None
+        self.client = None
+
+    def _loop_changed(self):
+        # The client's connection pool belongs to the loop that opened it
+        self.client = self.make_client()
+
+    def make_client(self):
+        raise NotImplementedError
+
+    async def create(self, prompt, temperature, stream):
+        """The SDK response, or its stream when stream is True."""
+        raise NotImplementedError
+
+    def parse_response(self, response):
+        raise NotImplementedError
+
+    def parse_stream_event(self, event):
+        """The text in one streamed event, or None."""
+        raise NotImplementedError
+
+    async def close_stream(self, stream):
+        await stream.close()
+
+    async def _attempt(self, prompt, temperature):
+        response = await self.create(prompt, temperature, stream=False)
+        try:
+            return self.parse_response(response), None
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            return None, (200, None, f"Unexpected response: {str(e)[:100]}")
+
+    async def _stream_attempt(self, prompt, temperature, scanner):
+        stream = await self.create(prompt, temperature, stream=True)
+        try:
+            texts = (self.parse_stream_event(event) async for event in stream)
+            return await self._feed(texts, scanner)
+        finally:
+            # Closing the response cancels the rest of the generation
+            await self.close_stream(stream)
+
+class ClientProvider(SDKProvider):
+    """OpenAI and Anthropic: their SDKs share client options and error classes."""
+    sdk = None
+    client_class = None
+
+    def _sdk(self):
+        return importlib.import_module(self.sdk)
+
+    def make_client(self):
+        client_class = getattr(self._sdk(), self.client_class)
+        # Retries back off in _run instead, behind the shared token bucket
+        return client_class(api_key=self.api_key, base_url=self.base_url,
+                            timeout=self.timeout, max_retries=0)
+
+    def _failure(self, error):
+        sdk = self._sdk()
+        if isinstance(error, sdk.APIStatusError):
+            return (error.status_code, error.response.headers.get('retry-after'),
+                    f"HTTP {error.status_code}: {str(error.message)[:200]}")
+        if isinstance(error, sdk.APIConnectionError):
+            # Includes timeouts
+            return None, None, f"{type(error).__name__}: {error}"
+        return super()._failure(error)
+
+class OpenAIProvider(ClientProvider):
+    name = 'openai'
+    default_model = 'gpt-4o-mini'
+    api_key_env = 'OPENAI_API_KEY'
+    base_url_env = 'OPENAI_BASE_URL'
+    sdk = 'openai'
+    client_class = 'AsyncOpenAI'
+
+    async def create(self, prompt, temperature, stream):
+        return await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{'role': 'user', 'content': prompt}],
+            temperature=temperature,
+            stream=stream
+        )
+
+    def parse_response(self, response):
+        return response.choices[0].message.content
+
+    def parse_stream_event(self, event):
+        return event.choices[0].delta.content if event.choices else None
+
+class AnthropicProvider(ClientProvider):
+    name = 'anthropic'
+    default_model = 'claude-3-sonnet-20240229'
+    api_key_env = 'ANTHROPIC_API_KEY'
+    base_url_env = 'ANTHROPIC_BASE_URL'
+    sdk = 'anthropic'
+    client_class = 'AsyncAnthropic'
+    max_tokens = 4096
+
+    async def create(self, prompt, temperature, stream):
+        return await self.client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=temperature,
+            messages=[{'role': 'user', 'content': prompt}],
+            stream=stream
+        )
+
+    def parse_response(self, response):
+        return response.content[0].text
+
+    def parse_stream_event(self, event):
+        if event.type == 'content_block_delta':
+            return getattr(event.delta, 'text', None)
+        return None
+
+class GeminiProvider(SDKProvider):
+    name = 'gemini'
+    default_model = 'gemini-2.0-flash'
+    api_key_env = 'GEMINI_API_KEY'
+    base_url_env = 'GEMINI_BASE_URL'
+
+    def make_client(self):
+        import google.generativeai as genai
+        options = {'api_endpoint': self.base_url} if self.base_url else None
+        genai.configure(api_key=self.api_key, client_options=options)
+        return genai.GenerativeModel(self.model)
+
+    async def create(self, prompt, temperature, stream):
+        return await self.client.generate_content_async(
+            prompt,
+            generation_config={'temperature': temperature},
+            request_options={'timeout': self.timeout},
+            stream=stream
+        )
+
+    def parse_response(self, response):
+        return response.text
+
+    def parse_stream_event(self, event):
+        try:
+            return event.text
+        except ValueError:
+            # A chunk with no text part, e.g. only the finish reason
+            return None
+
+    async def close_stream(self, stream):
+        # The SDK has no close; dropping the response cancels the call
+        pass
+
+    def _failure(self, error):
+        from google.api_core import exceptions
+        if isinstance(error, exceptions.GoogleAPICallError):
+            status = error.code if isinstance(error.code, int) else None
+            return status, None, f"{type(error).__name__}: {str(error)[:200]}"
+        if isinstance(error, exceptions.RetryError):
+            return None, None, f"{type(error).__name__}: {error}"
+        return super()._failure(error)
+
+class LocalProvider(Provider):
+    """local_<model path>: local_llm.generate in a long-lived llm.local_worker process."""
+    name = 'local'
+    default_model = None
+
+    def __init__(self, model=None, cwd=None, **limits):
+        super().__init__(model, **limits)
+        self.worker = LocalWorker(self.model, cwd=cwd)
+
+    async def _attempt(self, prompt, temperature):
+        future = asyncio.wrap_future(self.worker.submit(prompt, temperature))
+        try:
+            return await asyncio.wait_for(future, self.timeout), None
+        except asyncio.TimeoutError:
+            # A hung generation would block every request behind it
+            self.worker.restart()
+            raise
+        except LocalWorkerError as e:
+            if e.crashed:
+                return None, (None, None, str(e))
+            # A broken model or script will not fix itself on retry
+            return None, (400, None, str(e)[-200:])
+
+PROVIDER_CLASSES = {
+    'openai': OpenAIProvider,
+    'anthropic': AnthropicProvider,
+    'gemini': GeminiProvider,
+}
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+def get_provider(model_name):
+    """The shared provider for an experiment model name."""
+    with _providers_lock:
+        if model_name not in _providers:
+            if model_name.startswith('local_'):
+                _providers[model_name] = LocalProvider(model_name[len('local_'):])
+            elif model_name in PROVIDER_CLASSES:
+                _providers[model_name] = PROVIDER_CLASSES[model_name]()
+            else:
+                raise UnknownProvider(f"Unknown model: {model_name}")
+        return _providers[model_name]
+
+def latency_report():
+    """{model name: latency summaries and retry stats} for the providers used so far."""
+    with _providers_lock:
+        current = dict(_providers)
+    report = {}
+    for model_name, provider in current.items():
+        entry = {stage: histogram.summary() for stage, histogram in provider.latency.items()}
+        entry['stats'] = dict(provider.stats)
+        report[model_name] = entry
+    return report
+
+def format_latency_report(report):
+    """A few lines per provider for the end-of-run log."""
+    lines = []
+    for model_name, entry in report.items():
+        request, generate = entry['request'], entry['generate']
+        if not request['count']:
+            continue
+        lines.append(f"{model_name}: {generate['count']} completions, {entry['stats']['retries']} retries")
+        lines.append(f"  request latency p50 {request['p50_s']}s, p90 {request['p90_s']}s, "
+                     f"p99 {request['p99_s']}s, max {request['max_s']}s")
+        lines.append(f"  end-to-end p50 {generate['p50_s']}s, p90 {generate['p90_s']}s")
+    return '\n'.join(lines)
+
+def reset_providers():
+    """Forget the shared providers (e.g. after changing base URLs)."""
+    with _providers_lock:
+        for provider in _providers.values():
+            if isinstance(provider, LocalProvider):
+                provider.worker.close()
+        _providers.clear()
+
+async def generate(model_name, prompt, temperature):
+    return await get_provider(model_name).generate(prompt, temperature)
+
+async def generate_streaming(model_name, prompt, temperature, scanner=None):
+    return await get_provider(model_name).generate_streaming(prompt, temperature, scanner)
+
+_background = {}
+_background_lock = threading.Lock()
+
+def _background_loop():
+    with _background_lock:
+        if 'loop' not in _background:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='llm-loop', daemon=True)
+            thread.start()
+            _background['loop'] = loop
+        return _background['loop']
+
+def run_sync(coroutine):
+    """Run coroutine on the shared background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coroutine, _background_loop()).result()
+
+def generate_sync(model_name, prompt, temperature):
+    return run_sync(generate(model_name, prompt, temperature))
+
+def generate_streaming_sync(model_name, prompt, temperature, scanner=None):
+    return run_sync(generate_streaming(model_name, prompt, temperature, scanner))
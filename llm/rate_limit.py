@@ -0,0 +1,54 @@
+"""Token-bucket rate limiting for provider requests."""
+
+import asyncio
+import time
+
+class TokenBucket:
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self.updated = clock()
+        self.paused_until = 0.0
+        self._lock = None
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Take a token without waiting; returns the seconds until one is available, or 0."""
+        now = self.clock()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def rebind(self):
+        """Drop loop-bound state, so the bucket can be used from another event loop."""
+        self._lock = None
+
+    async def acquire(self):
+        # Created lazily so the bucket binds to the loop that uses it
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Waiters queue on the lock, so tokens go out in arrival order
+        async with self._lock:
+            while True:
+                wait = self.try_acquire()
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold every request for seconds (e.g. a 429's Retry-After) and empty the bucket."""
+        now = self.clock()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = max(now, self.paused_until)
@@ -2,6 +2,7 @@ import json
 import os
 import sys
 from testing.evaluator import evaluate_code, generate_summary
+from testing.result_cache import ResultCache
 from prompts.templates import get_prompt, GAME_PROMPTS
 
 GAMES = list(GAME_PROMPTS.keys())
@@ -18,8 +19,8 @@ def save_results(data, filename='results.json'):
     with open(filename, 'w') as f:
         json.dump(data, f, indent=2)
 
-def eval_game(game_name, code_str, iters=50):
-    results = evaluate_code(code_str, game_name, iters)
+def eval_game(game_name, code_str, iters=50, cache=None):
+    results = evaluate_code(code_str, game_name, iters, cache=cache)
     summary = generate_summary(results)
     return results, summary
 
@@ -30,6 +31,7 @@ def main():
         code_dir = None
     
     results_data = {}
+    cache = ResultCache()
     
     for game in GAMES:
         print(f"\nProcessing {game}...")
@@ -51,7 +53,7 @@ def main():
             if code is None:
                 continue
         
-        res, summ = eval_game(game, code, 10)
+        res, summ = eval_game(game, code, 10, cache)
         
         results_data[game] = {
             'syntax': summ['syntax_passed'],
@@ -7,7 +7,14 @@ import threading
 from functools import wraps
 
 sys.path.insert(0, os.path.dirname(__file__))
+from experiment.pipeline import Pipeline, StageError, format_metrics
+from experiment.responses import ResponseStore
+from experiment.ledger import LEDGER_SUFFIX, WorkLedger, latest_run, ledger_path, run_base
+from experiment.result_log import ResultLog, compact, last_record, materialize, read_log
+from llm import providers
 from testing.game_logic_checker import test_game_logic_headless
+from testing.logic_pool import LogicWorkerPool
+from testing.result_cache import ResultCache
 from prompts.templates import get_prompt
 
 # API key should be set via environment variable: export GEMINI_API_KEY="your-key-here"
@@ -17,6 +24,14 @@ os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 GAMES = ['tic_tac_toe', 'connect_four', 'snake_game', 'ball_bouncing', 'snakes_and_ladders']
 REPETITIONS = 10
 TEMPERATURE = 0.75
+LOGIC_TIMEOUT = 20
+LOGIC_CPU_SECONDS = 20
+LOGIC_MEMORY_MB = 2048
+PIPELINE_GENERATORS = 4
+PIPELINE_EVALUATORS = 1
+PIPELINE_QUEUE_SIZE = 4
+RECORD_RESPONSES = True
+STREAM_GENERATION = False
 
 def timeout_decorator(seconds):
     """Decorator to add timeout to function calls"""
@@ -47,16 +62,17 @@ def timeout_decorator(seconds):
 
 def call_gemini(prompt):
     try:
-        import google.generativeai as genai
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
+        if not os.getenv('GEMINI_API_KEY'):
             print(f"  ERROR: GEMINI_API_KEY environment variable not set", flush=True)
             return None
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        # API call with implicit timeout (genai library should handle this)
-        response = model.generate_content(prompt, generation_config={'temperature': TEMPERATURE})
-        return response.text
+        # Timeouts, rate limiting and retries are handled by the provider
+        if STREAM_GENERATION:
+            scanner = providers.generate_streaming_sync('gemini', prompt, TEMPERATURE)
+            if scanner.abort_reason:
+                print(f"  Gemini generation stopped early ({scanner.abort_reason})", flush=True)
+                return None
+            return scanner.text
+        return providers.generate_sync('gemini', prompt, TEMPERATURE)
     except Exception as e:
         print(f"  ERROR: Gemini API call failed: {str(e)}", flush=True)
         return None
@@ -116,10 +132,35 @@ def check_semantic_simple(code, game_name):
     
     return False, "Unknown game"
 
+def evaluate_sample(code, game, cache=None, pool=None):
+    syntax_ok, syntax_err = check_syntax(code)
+    semantic_ok, semantic_err = check_semantic_simple(code, game)
+
+    game_logic_ok = False
+    game_logic_err = None
+    if syntax_ok:
+        try:
+            game_logic_ok, game_logic_err = test_game_logic_headless(code, game, cache, pool)
+        except Exception as e:
+            game_logic_ok = False
+            game_logic_err = f"Game logic test error: {str(e)[:100]}"
+
+    return {
+        'syntax_passed': syntax_ok,
+        'semantic_passed': semantic_ok,
+        'game_logic_passed': game_logic_ok,
+        'code_length': len(code),
+        'syntax_error': syntax_err if not syntax_ok else None,
+        'semantic_error': semantic_err if not semantic_ok else None,
+        'game_logic_error': game_logic_err if not game_logic_ok else None
+    }
+
 def main():
+    replay = '--replay' in sys.argv[1:]
+    resume = [arg for arg in sys.argv[1:] if arg == '--resume' or arg.startswith('--resume=')]
     # Check API key before starting
     api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
+    if not api_key and not replay:
         print("="*70)
         print("ERROR: GEMINI_API_KEY environment variable not set")
         print("="*70)
@@ -128,126 +169,143 @@ def main():
         print("="*70)
         sys.exit(1)
     
-    results = {}
-    output_file = f"experiment_results_with_logic_{int(time.time())}.json"
+    prefix = "experiment_results_with_logic_replay_" if replay else "experiment_results_with_logic_"
+    if resume:
+        base = run_base(resume[0].split('=', 1)[1]) if '=' in resume[0] else latest_run(prefix)
+        if base is None or not os.path.exists(ledger_path(base)):
+            print(f"No run to resume ({prefix}<timestamp>{LEDGER_SUFFIX} not found)")
+            sys.exit(1)
+    else:
+        base = f"{prefix}{int(time.time())}"
+    output_file = base + '.json'
+    log_file = base + '.jsonl'
+    result_log = ResultLog(log_file)
+    ledger = WorkLedger(ledger_path(base))
+    units = [(game, 'gemini', rep) for game in GAMES for rep in range(REPETITIONS)]
+    ledger.add(units)
+    # Only the last logged result can have missed its finish()
+    ledger.finish_logged(last_record(log_file))
+    interrupted = ledger.interrupted()
+    todo = ledger.remaining(units)
+    last_rep = {game: rep for game, _, rep in todo}
+    # Results of units finished before a resume
+    remaining = set(todo)
+    results = compact(record for record in read_log(log_file)
+                      if (record['game'], record['model'], record['rep']) not in remaining)
+    cache = ResultCache()
+    responses = ResponseStore() if replay or RECORD_RESPONSES else None
+    # Logic tests run in killable worker processes; a hung sample is
+    # killed with its worker instead of leaving a thread spinning
+    pool = LogicWorkerPool(timeout=LOGIC_TIMEOUT, cpu_seconds=LOGIC_CPU_SECONDS,
+                           memory_mb=LOGIC_MEMORY_MB)
 
     print("="*70)
     print("FULL EXPERIMENT - Syntax, Semantic & Game Logic")
     print("="*70)
     print(f"Games: {len(GAMES)}")
     print(f"Repetitions: {REPETITIONS}")
-    print(f"Output: {output_file}")
+    print(f"Output: {output_file} (log: {log_file})")
+    if replay:
+        print(f"Replaying: {responses.path}")
+    if resume:
+        print(f"Resuming: {len(units) - len(todo)} of {len(units)} samples already done")
     print("="*70)
     print()
 
-    for game_idx, game in enumerate(GAMES, 1):
-        print(f"[{game_idx}/{len(GAMES)}] {game}")
-        print("-" * 70)
-        results[game] = {'gemini': []}
-        
+    # Generation runs ahead of the logic tests on a bounded queue;
+    # results still arrive in (game, rep) order
+    def generate(unit):
+        game, _, rep = unit
+        ledger.start(unit)
         prompt = get_prompt(game)
-        
-        for rep in range(REPETITIONS):
-            print(f"  Rep {rep+1}/{REPETITIONS}... ", end="", flush=True)
-            
-            print(" [API] ", end="", flush=True)
-            response = call_gemini(prompt)
+        model = providers.get_provider('gemini').model
+        if replay:
+            response = responses.lookup('gemini', model, prompt, TEMPERATURE, rep)
             if response is None:
-                print("API FAILED")
-                results[game]['gemini'].append({
-                    'syntax_passed': False,
-                    'semantic_passed': False,
-                    'game_logic_passed': False,
-                    'error': 'API call failed'
-                })
-                with open(output_file, 'w') as f:
-                    json.dump(results, f, indent=2)
-                continue
-            
-            print(" [Extract] ", end="", flush=True)
-            code = extract_code(response)
-            if len(code) < 100:
-                print("CODE TOO SHORT")
-                results[game]['gemini'].append({
-                    'syntax_passed': False,
-                    'semantic_passed': False,
-                    'game_logic_passed': False,
-                    'error': 'Code too short'
-                })
-                with open(output_file, 'w') as f:
-                    json.dump(results, f, indent=2)
-                continue
-            
-            print(" [Syntax] ", end="", flush=True)
-            syntax_ok, syntax_err = check_syntax(code)
-            print(" [Semantic] ", end="", flush=True)
-            semantic_ok, semantic_err = check_semantic_simple(code, game)
-            
-            game_logic_ok = False
-            game_logic_err = None
-            if syntax_ok:
-                print(" [Logic] ", end="", flush=True)
-                try:
-                    # Add timeout to game logic test (20 seconds) using threading with kill mechanism
-                    result = [None]
-                    exception = [None]
-                    completed = [False]
-                    
-                    def test_wrapper():
-                        try:
-                            result[0] = test_game_logic_headless(code, game)
-                            completed[0] = True
-                        except Exception as e:
-                            exception[0] = e
-                            completed[0] = True
-                    
-                    thread = threading.Thread(target=test_wrapper)
-                    thread.daemon = True
-                    thread.start()
-                    thread.join(timeout=20)  # Reduced to 20 seconds
-                    
-                    if not completed[0] and thread.is_alive():
-                        # Force timeout - thread is still running
-                        game_logic_ok = False
-                        game_logic_err = "Game logic test timed out (20s)"
-                        print(" [TIMEOUT] ", end="", flush=True)
-                    elif exception[0]:
-                        game_logic_ok = False
-                        game_logic_err = f"Game logic test error: {str(exception[0])[:100]}"
-                    elif result[0] is not None:
-                        game_logic_ok, game_logic_err = result[0]
-                    else:
-                        game_logic_ok = False
-                        game_logic_err = "Game logic test returned no result"
-                except Exception as e:
-                    game_logic_ok = False
-                    game_logic_err = f"Game logic test error: {str(e)[:100]}"
-            
-            syn_str = "✓" if syntax_ok else "✗"
-            sem_str = "✓" if semantic_ok else "✗"
-            logic_str = "✓" if game_logic_ok else "✗"
-            print(f"Syntax:{syn_str} Semantic:{sem_str} Logic:{logic_str}")
-            
-            results[game]['gemini'].append({
-                'syntax_passed': syntax_ok,
-                'semantic_passed': semantic_ok,
-                'game_logic_passed': game_logic_ok,
-                'code_length': len(code),
-                'syntax_error': syntax_err if not syntax_ok else None,
-                'semantic_error': semantic_err if not semantic_ok else None,
-                'game_logic_error': game_logic_err if not game_logic_ok else None
-            })
-            
-            with open(output_file, 'w') as f:
-                json.dump(results, f, indent=2)
-            
-            time.sleep(2)
-        
-        syn_count = sum(1 for r in results[game]['gemini'] if r.get('syntax_passed', False))
-        sem_count = sum(1 for r in results[game]['gemini'] if r.get('semantic_passed', False))
-        logic_count = sum(1 for r in results[game]['gemini'] if r.get('game_logic_passed', False))
-        print(f"  Summary: Syntax {syn_count}/{REPETITIONS}, Semantic {sem_count}/{REPETITIONS}, Logic {logic_count}/{REPETITIONS}\n")
+                return None, 'No recorded response'
+        else:
+            response = None
+            if unit in interrupted and responses is not None:
+                # Recorded before the previous run stopped; no need to pay again
+                response = responses.lookup('gemini', model, prompt, TEMPERATURE, rep,
+                                            since=interrupted[unit])
+            if response is None:
+                response = call_gemini(prompt)
+                if response is None:
+                    return None, 'API call failed'
+                if responses is not None:
+                    responses.append('gemini', model, prompt, TEMPERATURE, rep, response)
+        code = extract_code(response)
+        if len(code) < 100:
+            return None, 'Code too short'
+        return code, None
+
+    def evaluate(unit, generated):
+        game, _, rep = unit
+        if isinstance(generated, StageError):
+            generated = (None, generated.error)
+        code, error = generated
+        if code is None:
+            return {
+                'syntax_passed': False,
+                'semantic_passed': False,
+                'game_logic_passed': False,
+                'error': error
+            }
+        return evaluate_sample(code, game, cache, pool)
+
+    started = set()
 
+    def on_result(unit, record):
+        game, _, rep = unit
+        if game not in started:
+            game_idx = GAMES.index(game) + 1
+            print(f"[{game_idx}/{len(GAMES)}] {game}")
+            print("-" * 70)
+            started.add(game)
+            results.setdefault(game, {}).setdefault('gemini', [])
+        if isinstance(record, StageError):
+            record = {
+                'syntax_passed': False,
+                'semantic_passed': False,
+                'game_logic_passed': False,
+                'error': record.error
+            }
+        print(f"  Rep {rep+1}/{REPETITIONS}... ", end="")
+        if 'error' in record:
+            print(record['error'].upper())
+        else:
+            syn_str = "✓" if record['syntax_passed'] else "✗"
+            sem_str = "✓" if record['semantic_passed'] else "✗"
+            logic_str = "✓" if record['game_logic_passed'] else "✗"
+            timeout_str = " [TIMEOUT]" if 'timed out' in (record['game_logic_error'] or '') else ""
+            print(f"Syntax:{syn_str} Semantic:{sem_str} Logic:{logic_str}{timeout_str}")
+        results[game]['gemini'].append(record)
+        # Logged before the ledger marks it done: a resume finishes it from
+        # the log's last record
+        result_log.append(game, 'gemini', rep, record)
+        ledger.finish(unit)
+
+        if rep == last_rep[game]:
+            syn_count = sum(1 for r in results[game]['gemini'] if r.get('syntax_passed', False))
+            sem_count = sum(1 for r in results[game]['gemini'] if r.get('semantic_passed', False))
+            logic_count = sum(1 for r in results[game]['gemini'] if r.get('game_logic_passed', False))
+            print(f"  Summary: Syntax {syn_count}/{REPETITIONS}, Semantic {sem_count}/{REPETITIONS}, Logic {logic_count}/{REPETITIONS}\n", flush=True)
+
+    pipeline = Pipeline(generate, evaluate, on_result, generators=PIPELINE_GENERATORS,
+                        evaluators=PIPELINE_EVALUATORS, queue_size=PIPELINE_QUEUE_SIZE)
+    try:
+        pipeline.run(todo)
+    finally:
+        result_log.close()
+        pool.close()
+    materialize(log_file, output_file)
+    print(format_metrics(pipeline.metrics()))
+    latency = providers.format_latency_report(providers.latency_report())
+    if latency:
+        print(latency)
+    print()
+    
     print("="*70)
     print("EXPERIMENT COMPLETE")
     print("="*70)
@@ -255,11 +313,13 @@ def main():
 
     matrix = {}
     for game in GAMES:
+        # A game with nothing left to do on a resume may have no records
+        records = results.get(game, {}).get('gemini', [])
         matrix[game] = {}
         matrix[game]['gemini'] = {
-            'syntax': sum(1 for r in results[game]['gemini'] if r.get('syntax_passed', False)),
-            'semantic': sum(1 for r in results[game]['gemini'] if r.get('semantic_passed', False)),
-            'game_logic': sum(1 for r in results[game]['gemini'] if r.get('game_logic_passed', False))
+            'syntax': sum(1 for r in records if r.get('syntax_passed', False)),
+            'semantic': sum(1 for r in records if r.get('semantic_passed', False)),
+            'game_logic': sum(1 for r in records if r.get('game_logic_passed', False))
         }
 
     with open("results_matrix.json", 'w') as f:
@@ -0,0 +1,63 @@
+"""One parsed and compiled artifact per generated program, shared by the evaluator stages."""
+
+import ast
+import base64
+import marshal
+
+from .result_cache import code_hash
+
+GENERATED_FILENAME = '<generated>'
+
+class CodeArtifact:
+    def __init__(self, source, filename=GENERATED_FILENAME):
+        self.source = source
+        self.filename = filename
+        self.hash = code_hash(source)
+        self.tree = None
+        self.code = None
+        self.syntax_error = None
+        self.compile_error = None
+        self._bytecode = None
+
+        try:
+            self.tree = ast.parse(source, filename=filename)
+        except SyntaxError as e:
+            self.syntax_error = str(e)
+            return
+        except Exception as e:
+            self.syntax_error = f"Parse error: {str(e)}"
+            return
+
+        try:
+            self.code = compile(self.tree, filename, 'exec')
+        except SyntaxError as e:
+            # e.g. 'return' outside function is only caught by the compiler
+            self.compile_error = str(e)
+        except Exception as e:
+            self.compile_error = f"Compile error: {str(e)}"
+
+    @property
+    def ok(self):
+        return self.code is not None
+
+    @property
+    def bytecode(self):
+        """Marshalled code object; only loadable by this interpreter version."""
+        if self._bytecode is None and self.code is not None:
+            self._bytecode = marshal.dumps(self.code)
+        return self._bytecode
+
+    def bytecode_b64(self):
+        bytecode = self.bytecode
+        if bytecode is None:
+            return None
+        return base64.b64encode(bytecode).decode('ascii')
+
+def build_artifact(code_string, filename=GENERATED_FILENAME):
+    return CodeArtifact(code_string, filename)
+
+def as_artifact(code):
+    """Accept either source text or an existing CodeArtifact."""
+    if isinstance(code, CodeArtifact):
+        return code
+    return CodeArtifact(code)
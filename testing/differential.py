@@ -0,0 +1,295 @@
+"""Lockstep differential testing of a candidate against the reference game in games/."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from . import harness
+from .artifact import as_artifact
+
+CHECKER_VERSION = 1
+DEFAULT_FRAMES = 300
+REFERENCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games')
+REFERENCE_FILES = {
+    'tic_tac_toe': 'tic_tac_toe.py',
+    'connect_four': 'connect_four.py',
+    'snake_game': 'snake_game.py',
+    'ball_bouncing': 'ball_bouncing.py',
+    'snakes_and_ladders': 'snakes_and_ladders.py',
+}
+
+EMPTY_MARKS = (None, 0, '', ' ', '-', '.')
+GAME_OVER_NAMES = ['game_over', 'gameover', 'game_ended', 'is_game_over', 'game_won', 'won']
+WINNER_NAMES = ['winner']
+SCORE_NAMES = ['score']
+BODY_NAMES = ['body', 'segments', 'snake_body', 'snake_list', 'snake_segments', 'snake', 'positions']
+POSITION_NAMES = ['player_pos', 'player_position', 'position', 'current_position', 'pos']
+DICE_NAMES = ['dice_value', 'dice', 'dice_roll', 'roll', 'last_roll', 'die', 'die_value']
+
+def _leaf(key):
+    return key.rsplit('.', 1)[-1].lower()
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _find(snapshot, names, accept):
+    """Value of the first key whose last name is in names and that accept() takes."""
+    for name in names:
+        for key, value in snapshot.items():
+            if _leaf(key) == name and accept(value):
+                return value
+    return None
+
+def _game_over(snapshot):
+    flag = _find(snapshot, GAME_OVER_NAMES, lambda v: isinstance(v, bool))
+    if flag is not None:
+        return flag
+    # A winner variable that is still None means nobody has won yet
+    if any(_leaf(key) in WINNER_NAMES for key in snapshot):
+        return bool(_find(snapshot, WINNER_NAMES, lambda v: v is not None))
+    return None
+
+def _grid(value, rows, cols):
+    """value as a list of rows if it is a rows x cols (or flat) grid of scalars."""
+    if not isinstance(value, list):
+        return None
+    if len(value) == rows * cols and not any(isinstance(cell, list) for cell in value):
+        return [value[r * cols:(r + 1) * cols] for r in range(rows)]
+    if len(value) == rows and all(isinstance(row, list) and len(row) == cols and
+                                  not any(isinstance(cell, list) for cell in row) for row in value):
+        return value
+    return None
+
+def _find_grid(snapshot, rows, cols):
+    keys = sorted(snapshot, key=lambda key: 'board' not in _leaf(key))
+    for key in keys:
+        grid = _grid(snapshot[key], rows, cols)
+        if grid is not None:
+            return grid
+    return None
+
+def _canonical_marks(grid, memory):
+    """Empty cells become 0 and marks 1, 2, ... in order of first appearance."""
+    marks = memory.setdefault('marks', {})
+    canonical = []
+    for row in grid:
+        out = []
+        for cell in row:
+            if cell in EMPTY_MARKS:
+                out.append(0)
+                continue
+            key = json.dumps(cell)
+            if key not in marks:
+                marks[key] = len(marks) + 1
+            out.append(marks[key])
+        canonical.append(out)
+    return canonical
+
+def _observe_tic_tac_toe(snapshot, memory):
+    grid = _find_grid(snapshot, 3, 3)
+    return {
+        'board': None if grid is None else _canonical_marks(grid, memory),
+        'game_over': _game_over(snapshot),
+    }
+
+def _observe_connect_four(snapshot, memory):
+    grid = _find_grid(snapshot, 6, 7)
+    board = None
+    if grid is not None:
+        board = _canonical_marks(grid, memory)
+        if 'flip' not in memory and any(any(row) for row in board):
+            # The first piece lands on the bottom row; the reference keeps
+            # that as row 0
+            memory['flip'] = sum(map(bool, board[-1])) > sum(map(bool, board[0]))
+        if memory.get('flip'):
+            board = board[::-1]
+    return {'board': board, 'game_over': _game_over(snapshot)}
+
+def _is_body(value):
+    return (isinstance(value, list) and len(value) > 0 and
+            all(isinstance(cell, list) and len(cell) == 2 and all(map(_is_number, cell)) for cell in value))
+
+def _observe_snake(snapshot, memory):
+    body = _find(snapshot, BODY_NAMES, _is_body)
+    head = None
+    if body is not None:
+        if 'scale' not in memory:
+            # Segment spacing is the cell size for pixel coordinates
+            spacing = max(abs(body[0][0] - body[1][0]), abs(body[0][1] - body[1][1])) if len(body) > 1 else 1
+            memory['scale'] = spacing or 1
+        head = [round(body[0][0] / memory['scale']), round(body[0][1] / memory['scale'])]
+    return {
+        'head': head,
+        'length': None if body is None else len(body),
+        'score': _find(snapshot, SCORE_NAMES, _is_number),
+    }
+
+def _ball_position(snapshot):
+    for x_key, y_key in (('ball_x', 'ball_y'), ('ball.x', 'ball.y'), ('ball_pos_x', 'ball_pos_y')):
+        x, y = snapshot.get(x_key), snapshot.get(y_key)
+        if _is_number(x) and _is_number(y):
+            return x, y
+    for key in ('ball_pos', 'ball_position', 'ball.pos', 'ball.position', 'ball_center'):
+        value = snapshot.get(key)
+        if isinstance(value, list) and len(value) == 2 and all(map(_is_number, value)):
+            return value
+    for key in ('ball', 'ball_rect', 'ball.rect'):
+        value = snapshot.get(key)
+        if isinstance(value, list) and len(value) == 4 and all(map(_is_number, value)):
+            return value[0] + value[2] / 2, value[1] + value[3] / 2
+    return None
+
+def _observe_ball(snapshot, memory):
+    position = _ball_position(snapshot)
+    return {'ball': None if position is None else [round(position[0]), round(position[1])]}
+
+def _observe_snakes_and_ladders(snapshot, memory):
+    return {
+        'position': _find(snapshot, POSITION_NAMES, lambda v: isinstance(v, int) and not isinstance(v, bool)),
+        'dice': _find(snapshot, DICE_NAMES, lambda v: isinstance(v, int) and not isinstance(v, bool)),
+        'game_over': _game_over(snapshot),
+    }
+
+OBSERVERS = {
+    'tic_tac_toe': _observe_tic_tac_toe,
+    'connect_four': _observe_connect_four,
+    'snake_game': _observe_snake,
+    'ball_bouncing': _observe_ball,
+    'snakes_and_ladders': _observe_snakes_and_ladders,
+}
+
+def observe(game_name, snapshots):
+    """Observed fields for each probe snapshot of one run."""
+    observer = OBSERVERS[game_name]
+    memory = {}
+    return [observer(snapshot, memory) for snapshot in snapshots]
+
+def compare(reference, candidate):
+    """First divergence between two lists of observations, and the fields both expose."""
+    fields = set()
+    for frame, (expected, actual) in enumerate(zip(reference, candidate)):
+        for field, value in expected.items():
+            if value is None or actual.get(field) is None:
+                continue
+            fields.add(field)
+            if actual[field] != value:
+                return {'frame': frame, 'field': field, 'reference': value,
+                        'candidate': actual[field]}, fields
+    return None, fields
+
+def _read_probe(path):
+    snapshots = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    snapshots.append(json.loads(line))
+                except ValueError:
+                    # A line cut short when the process was killed
+                    break
+    except OSError:
+        pass
+    return snapshots
+
+def _start(path, options, bytecode_path=None):
+    env = dict(os.environ, PYTHONUNBUFFERED='1', SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    env[harness.OPTIONS_ENV] = json.dumps(options)
+    command = [sys.executable, '-u', harness.__file__, path]
+    if bytecode_path:
+        command.append(bytecode_path)
+    return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
+
+def _finish(process, timeout):
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        stdout, stderr = process.communicate()
+        return 'timeout', None
+    stdout, report = harness.parse_report(stdout)
+    if process.returncode != 0:
+        error = stderr.strip() or stdout.strip()
+        return 'error', error.splitlines()[-1][:200] if error else f"exit status {process.returncode}"
+    return (report or {}).get('status', 'exited'), None
+
+_reference_runs = {}
+
+def run_differential(code, game_name, frames=DEFAULT_FRAMES, seed=0, timeout=30):
+    """Run the reference game and code side by side on the same seeded input; returns a report."""
+    if game_name not in REFERENCE_FILES:
+        raise ValueError(f"Unknown game: {game_name}")
+    artifact = as_artifact(code)
+    options = {'frame_budget': frames, 'input': {'game': game_name, 'seed': seed}, 'random_seed': seed}
+    workdir = tempfile.mkdtemp(prefix='differential_')
+    candidate_path = os.path.join(workdir, 'candidate.py')
+    bytecode_path = None
+    with open(candidate_path, 'w') as f:
+        f.write(artifact.source)
+    if artifact.bytecode is not None:
+        bytecode_path = candidate_path + 'c'
+        with open(bytecode_path, 'wb') as f:
+            f.write(artifact.bytecode)
+    probes = {name: os.path.join(workdir, f'{name}.jsonl') for name in ('reference', 'candidate')}
+
+    key = (game_name, frames, seed)
+    try:
+        # Both programs run at once, so one comparison costs one iteration;
+        # the reference is deterministic, so later comparisons reuse its run
+        reference = None
+        if key not in _reference_runs:
+            reference = _start(os.path.join(REFERENCE_DIR, REFERENCE_FILES[game_name]),
+                               dict(options, probe={'path': probes['reference']}))
+        candidate = _start(candidate_path, dict(options, probe={'path': probes['candidate']}), bytecode_path)
+        if reference is not None:
+            status, _ = _finish(reference, timeout)
+            run = (status, observe(game_name, _read_probe(probes['reference'])))
+            if status != 'timeout':
+                _reference_runs[key] = run
+        else:
+            run = _reference_runs[key]
+        reference_status, reference_obs = run
+        candidate_status, candidate_error = _finish(candidate, timeout)
+        candidate_obs = observe(game_name, _read_probe(probes['candidate']))
+    finally:
+        for path in list(probes.values()) + [candidate_path, bytecode_path]:
+            try:
+                if path:
+                    os.unlink(path)
+            except OSError:
+                pass
+        try:
+            os.rmdir(workdir)
+        except OSError:
+            pass
+
+    divergence, fields = compare(reference_obs, candidate_obs)
+    compared = min(len(reference_obs), len(candidate_obs))
+    if divergence is not None:
+        compared = divergence['frame']
+    report = {
+        'passed': False,
+        'frames': compared,
+        'fields': sorted(fields),
+        'divergence': divergence,
+        'reference_status': reference_status,
+        'candidate_status': candidate_status,
+    }
+    if divergence is None and candidate_status == 'error' and len(candidate_obs) < len(reference_obs):
+        report['divergence'] = {'frame': len(candidate_obs), 'field': 'status',
+                                'reference': reference_status, 'candidate': candidate_error}
+        report['error'] = f"Candidate crashed at frame {len(candidate_obs)}: {candidate_error}"
+    elif divergence is None and not fields:
+        report['error'] = "No observable state in common with the reference"
+    report['passed'] = report['divergence'] is None and not report.get('error')
+    return report
+
+def summarize_differential(report):
+    """(passed, error message) for a run_differential report."""
+    if report['passed']:
+        return True, None
+    if report.get('error'):
+        return False, report['error']
+    divergence = report['divergence']
+    return False, (f"Diverged from the reference at frame {divergence['frame']} on {divergence['field']}: "
+                   f"expected {divergence['reference']}, got {divergence['candidate']}")
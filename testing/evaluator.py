@@ -1,30 +1,112 @@
 from .syntax_checker import validate_syntax
-from .runtime_checker import check_runtime_errors
+from .runtime_checker import run_runtime_check, summarize_runtime_check
 from .semantic_checker import check_semantic_correctness
+from .static_checker import check_static
+from .differential import run_differential, summarize_differential, DEFAULT_FRAMES
+from . import syntax_checker, runtime_checker, semantic_checker, differential
+from .artifact import build_artifact
 
-def evaluate_code(code_string, game_name, runtime_iterations=50):
+def _cached_stage(cache, artifact, game_name, stage, version, params, compute):
+    if cache is None:
+        return compute()
+    value = cache.get(artifact, game_name, stage, version, params)
+    if value is None:
+        value = compute()
+        cache.put(artifact, game_name, stage, version, value, params)
+    return value
+
+def evaluate_code(code_string, game_name, runtime_iterations=50, runtime_mode='subprocess', runtime_workers=1,
+                  runtime_timeout=None, runtime_early_stop=False, runtime_confidence=None, runtime_frame_budget=None,
+                  runtime_inject_input=False, static_check=False, differential_check=False,
+                  differential_frames=DEFAULT_FRAMES, cache=None):
     results = {
         'syntax': {'passed': False, 'error': None},
+        'static': {'passed': False, 'error': None, 'rule': None},
         'runtime': {'passed': False, 'error': None, 'errors': []},
         'semantic': {'passed': False, 'error': None}
     }
     
-    syntax_ok, _, error_msg = validate_syntax(code_string)
+    # Parse and compile once; every stage shares the artifact
+    artifact = build_artifact(code_string)
+    
+    def syntax_stage():
+        syntax_ok, _, error_msg = validate_syntax(artifact)
+        return [syntax_ok, error_msg]
+    
+    syntax_ok, error_msg = _cached_stage(cache, artifact, game_name, 'syntax',
+                                         syntax_checker.CHECKER_VERSION, None, syntax_stage)
     results['syntax']['passed'] = syntax_ok
     results['syntax']['error'] = error_msg
     
     if not syntax_ok:
         return results
     
-    runtime_ok, runtime_error, runtime_errors = check_runtime_errors(code_string, runtime_iterations)
-    results['runtime']['passed'] = runtime_ok
-    results['runtime']['error'] = runtime_error
-    results['runtime']['errors'] = runtime_errors
+    # Reject certain-fail programs from the AST before running anything
+    if static_check:
+        static_ok, rule, static_error = check_static(artifact)
+    else:
+        static_ok, rule, static_error = True, None, None
+    results['static'] = {'passed': static_ok, 'error': static_error, 'rule': rule}
+    
+    if not static_ok:
+        skipped = f"Skipped: static check '{rule}' failed"
+        results['runtime'] = {'passed': False, 'error': skipped, 'errors': [], 'skipped': True}
+        results['semantic'] = {'passed': False, 'error': skipped, 'skipped': True}
+        return results
+    
+    def runtime_stage():
+        runtime = run_runtime_check(artifact, runtime_iterations, timeout=runtime_timeout,
+                                    mode=runtime_mode, workers=runtime_workers,
+                                    early_stop=runtime_early_stop, confidence=runtime_confidence,
+                                    frame_budget=runtime_frame_budget,
+                                    input_game=game_name if runtime_inject_input else None)
+        runtime_ok, runtime_error, runtime_errors = summarize_runtime_check(runtime)
+        return {
+            'passed': runtime_ok,
+            'error': runtime_error,
+            'errors': runtime_errors,
+            'iterations_run': runtime['iterations_run'],
+            'frames': runtime['frames']
+        }
+    
+    runtime_params = {
+        'iterations': runtime_iterations,
+        'timeout': runtime_timeout,
+        'mode': runtime_mode,
+        'early_stop': runtime_early_stop,
+        'confidence': runtime_confidence,
+        'frame_budget': runtime_frame_budget,
+        'inject_input': runtime_inject_input
+    }
+    results['runtime'] = _cached_stage(cache, artifact, game_name, 'runtime',
+                                       runtime_checker.CHECKER_VERSION, runtime_params, runtime_stage)
     
-    semantic_ok, semantic_error = check_semantic_correctness(code_string, game_name)
+    def semantic_stage():
+        semantic_ok, semantic_error = check_semantic_correctness(artifact, game_name)
+        return [semantic_ok, semantic_error]
+    
+    semantic_ok, semantic_error = _cached_stage(cache, artifact, game_name, 'semantic',
+                                                semantic_checker.CHECKER_VERSION, None, semantic_stage)
     results['semantic']['passed'] = semantic_ok
     results['semantic']['error'] = semantic_error
     
+    # Lockstep comparison with the reference game; reported, not scored
+    if differential_check:
+        def differential_stage():
+            report = run_differential(artifact, game_name, frames=differential_frames)
+            passed, error = summarize_differential(report)
+            return {
+                'passed': passed,
+                'error': error,
+                'frames': report['frames'],
+                'fields': report['fields'],
+                'divergence': report['divergence']
+            }
+        
+        results['differential'] = _cached_stage(cache, artifact, game_name, 'differential',
+                                                differential.CHECKER_VERSION, {'frames': differential_frames},
+                                                differential_stage)
+    
     return results
 
 def generate_summary(results):
@@ -0,0 +1,266 @@
+"""Fork server that runs runtime iterations in children of a pre-warmed process."""
+
+import atexit
+import base64
+import json
+import marshal
+import os
+import select
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    from . import harness
+except ImportError:
+    # Running as the server script
+    import harness
+
+PRELOAD_MODULES = ['pygame', 'numpy', 'random', 'math']
+MAX_OUTPUT = 65536
+POLL_INTERVAL = 0.005
+
+def is_supported():
+    return hasattr(os, 'fork')
+
+def _preload():
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    for name in PRELOAD_MODULES:
+        try:
+            __import__(name)
+        except Exception:
+            pass
+
+def _read_capture(f):
+    f.seek(0)
+    return f.read(MAX_OUTPUT).decode('utf-8', errors='replace')
+
+def _start_request(request, proto_fd):
+    out_f = tempfile.TemporaryFile()
+    err_f = tempfile.TemporaryFile()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            os.close(proto_fd)
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.dup2(out_f.fileno(), 1)
+            os.dup2(err_f.fileno(), 2)
+            code = None
+            if request.get('bytecode'):
+                code = marshal.loads(base64.b64decode(request['bytecode']))
+            status = harness.run_code(request['code'], request.get('filename', '<generated>'),
+                                      request.get('harness'), code)
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(status & 0xff)
+
+    deadline = time.monotonic() + request.get('timeout', 2)
+    return pid, {'id': request.get('id'), 'deadline': deadline, 'out': out_f, 'err': err_f}
+
+def _finish_request(job, status, timed_out):
+    if os.WIFEXITED(status):
+        returncode = os.WEXITSTATUS(status)
+    else:
+        returncode = -os.WTERMSIG(status)
+    response = {
+        'id': job['id'],
+        'returncode': returncode,
+        'timed_out': timed_out,
+        'stdout': _read_capture(job['out']),
+        'stderr': _read_capture(job['err']),
+    }
+    job['out'].close()
+    job['err'].close()
+    return response
+
+def _reap(running):
+    finished = []
+    now = time.monotonic()
+    for pid, job in list(running.items()):
+        done_pid, status = os.waitpid(pid, os.WNOHANG)
+        timed_out = False
+        if not done_pid:
+            if now < job['deadline']:
+                continue
+            timed_out = True
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            _, status = os.waitpid(pid, 0)
+        del running[pid]
+        finished.append(_finish_request(job, status, timed_out))
+    return finished
+
+def serve():
+    proto_fd = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    proto = os.fdopen(proto_fd, 'w', buffering=1)
+
+    _preload()
+    proto.write(json.dumps({'ready': True}) + '\n')
+
+    # Requests are multiplexed: every request forks immediately and its
+    # response is written when the child exits or hits its deadline.
+    running = {}
+    pending = b''
+    eof = False
+    while not eof or running:
+        wait = POLL_INTERVAL if running else None
+        readable = []
+        if not eof:
+            readable, _, _ = select.select([0], [], [], wait)
+        elif wait:
+            time.sleep(wait)
+        if readable:
+            data = os.read(0, 65536)
+            if not data:
+                eof = True
+            pending += data
+            while b'\n' in pending:
+                line, pending = pending.split(b'\n', 1)
+                if not line.strip():
+                    continue
+                request = {}
+                try:
+                    request = json.loads(line)
+                    pid, job = _start_request(request, proto_fd)
+                    running[pid] = job
+                except Exception as e:
+                    response = {'id': request.get('id'), 'error': f"Fork server error: {str(e)[:200]}"}
+                    proto.write(json.dumps(response) + '\n')
+        for response in _reap(running):
+            proto.write(json.dumps(response) + '\n')
+
+class ForkServer:
+    """Thread-safe client for a fork server process."""
+
+    def __init__(self, env=None):
+        self.env = env
+        self.proc = None
+        self.lock = threading.Lock()
+        self.waiting = {}
+        self.next_id = 0
+
+    def start(self):
+        env = dict(os.environ if self.env is None else self.env, PYTHONUNBUFFERED='1')
+        proc = subprocess.Popen(
+            [sys.executable, '-u', os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            env=env
+        )
+        ready = proc.stdout.readline()
+        if not ready:
+            proc.kill()
+            proc.wait()
+            raise RuntimeError("Fork server failed to start")
+        self.proc = proc
+        reader = threading.Thread(target=self._read_responses, args=(proc,))
+        reader.daemon = True
+        reader.start()
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def _read_responses(self, proc):
+        for line in proc.stdout:
+            response = json.loads(line)
+            with self.lock:
+                slot = self.waiting.pop(response.get('id'), None)
+            if slot is not None:
+                slot[1] = response
+                slot[0].set()
+        # Server is gone: release everyone still waiting on it
+        with self.lock:
+            stranded = [slot for slot in self.waiting.values() if slot[2] is proc]
+            for slot in stranded:
+                slot[1] = {'error': "Fork server exited unexpectedly"}
+                slot[0].set()
+            self.waiting = {k: v for k, v in self.waiting.items() if v[2] is not proc}
+
+    def _request(self, request):
+        with self.lock:
+            if not self.alive():
+                self.start()
+            self.next_id += 1
+            request['id'] = self.next_id
+            slot = [threading.Event(), None, self.proc]
+            self.waiting[request['id']] = slot
+            try:
+                self.proc.stdin.write(json.dumps(request) + '\n')
+                self.proc.stdin.flush()
+            except OSError:
+                del self.waiting[request['id']]
+                raise
+        slot[0].wait()
+        return slot[1]
+
+    def run(self, code_string, timeout=2, harness_options=None, bytecode=None, filename=None):
+        """Run code_string once in a forked child; returns its returncode, output and timed_out."""
+        request = {'code': code_string, 'timeout': timeout, 'harness': harness_options}
+        if bytecode is not None:
+            request['bytecode'] = bytecode
+            request['filename'] = filename
+        try:
+            response = self._request(request)
+        except OSError:
+            # One restart covers a server killed between calls
+            self.close()
+            response = self._request(request)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def close(self):
+        with self.lock:
+            proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+            proc.wait()
+
+_server = None
+_server_pid = None
+
+def get_server():
+    """Return the process-wide fork server, starting it on first use."""
+    global _server, _server_pid
+    if _server is None or _server_pid != os.getpid():
+        _server = ForkServer()
+        _server_pid = os.getpid()
+    return _server
+
+def shutdown():
+    global _server
+    if _server is not None and _server_pid == os.getpid():
+        _server.close()
+    _server = None
+
+atexit.register(shutdown)
+
+if __name__ == '__main__':
+    serve()
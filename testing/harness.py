@@ -0,0 +1,443 @@
+"""Harness that runs a generated program as __main__ for one runtime iteration."""
+
+import json
+import linecache
+import marshal
+import os
+import random
+import sys
+import time
+import traceback
+import types
+
+try:
+    from . import input_scripts
+except ImportError:
+    # Running as a script or inside the fork server
+    import input_scripts
+
+# Starts the last stdout line of a harnessed run, a JSON report
+REPORT_PREFIX = '__HARNESS_REPORT__ '
+# JSON options for script runs: frame_budget, poll_budget, input, probe,
+# progress and random_seed
+OPTIONS_ENV = 'LLM_HARNESS_OPTIONS'
+DEFAULT_FRAME_MS = 16
+POLLS_PER_FRAME = 10
+PROBE_MAX_NAMES = 200
+PROBE_MAX_ITEMS = 400
+PROBE_MAX_STR = 40
+
+class HarnessState:
+    def __init__(self, frame_budget=None, poll_budget=None):
+        self.frame_budget = frame_budget
+        # Some games only flip when an event arrives; the poll budget ends
+        # those once they have idled through the equivalent number of frames.
+        if poll_budget is None and frame_budget:
+            poll_budget = frame_budget * POLLS_PER_FRAME
+        self.poll_budget = poll_budget
+        self.frames = 0
+        self.polls = 0
+        self.now_ms = 0
+        self.timers = {}
+        self.reported = False
+        self.inject = None
+        self.events = 0
+        self.inject_frame = -1
+        self.inject_poll = 0
+        self.probe = None
+        self.filename = None
+        self.progress_fd = None
+
+    def open_progress(self, path):
+        self.progress_fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+        self.write_progress()
+
+    def write_progress(self):
+        # Fixed width at offset 0, so a reader never sees a mix of counts
+        if self.progress_fd is not None:
+            os.pwrite(self.progress_fd, b'%12d\n' % self.frames, 0)
+
+    def advance(self, ms):
+        self.now_ms += max(0, int(ms))
+
+    def report(self, status):
+        return {
+            'status': status,
+            'frames': self.frames,
+            'polls': self.polls,
+            'virtual_ms': self.now_ms,
+            'events': self.events
+        }
+
+def write_report(state, status):
+    if state is None or state.reported:
+        return
+    state.reported = True
+    if state.probe is not None:
+        state.probe.close()
+    sys.stdout.write(REPORT_PREFIX + json.dumps(state.report(status)) + '\n')
+
+def finish(state, status):
+    """End the run with exit status 0; unlike an exception, generated code cannot catch it."""
+    write_report(state, status)
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(0)
+
+def parse_report(stdout):
+    """Split harness output into (program stdout, report dict or None)."""
+    idx = stdout.rfind(REPORT_PREFIX)
+    if idx == -1:
+        return stdout, None
+    line_end = stdout.find('\n', idx)
+    line = stdout[idx + len(REPORT_PREFIX):] if line_end == -1 else stdout[idx + len(REPORT_PREFIX):line_end]
+    try:
+        report = json.loads(line)
+    except ValueError:
+        return stdout, None
+    return stdout[:idx], report
+
+def _install_time_hooks(state):
+    real_sleep = time.sleep
+    start = time.time()
+    start_monotonic = time.monotonic()
+    start_perf = time.perf_counter()
+
+    def sleep(seconds):
+        state.advance(seconds * 1000)
+        real_sleep(0)
+
+    time.sleep = sleep
+    time.time = lambda: start + state.now_ms / 1000.0
+    time.monotonic = lambda: start_monotonic + state.now_ms / 1000.0
+    time.perf_counter = lambda: start_perf + state.now_ms / 1000.0
+
+def _install_pygame_clock(state, pygame):
+    class VirtualClock:
+        def __init__(self):
+            self.last_ms = state.now_ms
+            self.frame_ms = 0
+            self.fps = 0.0
+
+        def tick(self, framerate=0):
+            target = int(1000 / framerate) if framerate else 0
+            elapsed = state.now_ms - self.last_ms
+            if elapsed < max(target, 1):
+                state.advance(max(target, 1) - elapsed)
+            self.frame_ms = state.now_ms - self.last_ms
+            self.last_ms = state.now_ms
+            self.fps = 1000.0 / self.frame_ms if self.frame_ms else 0.0
+            return self.frame_ms
+
+        tick_busy_loop = tick
+
+        def get_time(self):
+            return self.frame_ms
+
+        def get_rawtime(self):
+            return self.frame_ms
+
+        def get_fps(self):
+            return self.fps
+
+    def delay(milliseconds):
+        state.advance(milliseconds)
+        return int(milliseconds)
+
+    def set_timer(event, millis, loops=0):
+        event_type = getattr(event, 'type', event)
+        if millis <= 0:
+            state.timers.pop(event_type, None)
+            return
+        state.timers[event_type] = {
+            'event': event,
+            'interval': int(millis),
+            'next_ms': state.now_ms + int(millis),
+            'loops': loops
+        }
+
+    pygame.time.Clock = VirtualClock
+    pygame.time.delay = delay
+    pygame.time.wait = delay
+    pygame.time.get_ticks = lambda: state.now_ms
+    pygame.time.set_timer = set_timer
+
+def _post_due_timers(state, pygame):
+    for event_type, timer in list(state.timers.items()):
+        while timer['next_ms'] <= state.now_ms:
+            event = timer['event']
+            if not isinstance(event, pygame.event.EventType):
+                event = pygame.event.Event(event_type)
+            try:
+                pygame.event.post(event)
+            except Exception:
+                pass
+            timer['next_ms'] += timer['interval']
+            if timer['loops']:
+                timer['loops'] -= 1
+                if timer['loops'] == 0:
+                    del state.timers[event_type]
+                    break
+
+def _install_pygame_frames(state, pygame):
+    real_flip = pygame.display.flip
+    real_update = pygame.display.update
+    real_get = pygame.event.get
+    real_poll = pygame.event.poll
+
+    def count_frame():
+        state.frames += 1
+        state.write_progress()
+        if state.probe is not None:
+            state.probe.snapshot()
+        if state.frame_budget and state.frames >= state.frame_budget:
+            finish(state, 'frame_budget')
+
+    def count_poll():
+        state.polls += 1
+        if state.poll_budget and state.polls >= state.poll_budget:
+            finish(state, 'poll_budget')
+        _post_due_timers(state, pygame)
+        # One input batch per frame; games that only redraw on input get a
+        # batch per POLLS_PER_FRAME polls instead
+        if state.inject is not None and (state.frames != state.inject_frame or
+                                         state.polls - state.inject_poll >= POLLS_PER_FRAME):
+            state.inject_frame = state.frames
+            state.inject_poll = state.polls
+            state.inject()
+
+    def flip():
+        real_flip()
+        count_frame()
+
+    def update(*args, **kwargs):
+        real_update(*args, **kwargs)
+        count_frame()
+
+    def get(*args, **kwargs):
+        count_poll()
+        return real_get(*args, **kwargs)
+
+    def poll():
+        count_poll()
+        return real_poll()
+
+    def wait(timeout=0):
+        # The dummy driver never produces events, so a blocking wait would
+        # hang; advance virtual time by a frame instead.
+        count_poll()
+        event = real_poll()
+        if event.type == pygame.NOEVENT:
+            state.advance(DEFAULT_FRAME_MS)
+        return event
+
+    pygame.display.flip = flip
+    pygame.display.update = update
+    pygame.event.get = get
+    pygame.event.poll = poll
+    pygame.event.wait = wait
+
+class _PressedKeys:
+    """Stand-in for the sequence returned by pygame.key.get_pressed()."""
+
+    def __init__(self, held):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+    def __len__(self):
+        return 512
+
+    def __iter__(self):
+        return (k in self.held for k in range(512))
+
+def _install_input(state, pygame, input_options):
+    stream = input_scripts.event_stream(input_options['game'], input_options.get('seed', 0))
+    held_keys = set()
+    mouse = {'pos': (0, 0), 'buttons': (False, False, False)}
+
+    def make_event(type_name, attrs):
+        attrs = dict(attrs)
+        if isinstance(attrs.get('key'), str):
+            attrs['key'] = getattr(pygame, attrs['key'])
+        return pygame.event.Event(getattr(pygame, type_name), attrs)
+
+    def inject():
+        for type_name, attrs in next(stream):
+            event = make_event(type_name, attrs)
+            if event.type == pygame.KEYDOWN:
+                held_keys.add(event.key)
+            elif event.type == pygame.KEYUP:
+                held_keys.discard(event.key)
+            if 'pos' in attrs:
+                mouse['pos'] = attrs['pos']
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mouse['buttons'] = (True, False, False)
+            elif event.type == pygame.MOUSEBUTTONUP:
+                mouse['buttons'] = (False, False, False)
+            try:
+                pygame.event.post(event)
+                state.events += 1
+            except Exception:
+                pass
+
+    state.inject = inject
+    pygame.mouse.get_pos = lambda: mouse['pos']
+    pygame.mouse.get_pressed = lambda num_buttons=3: mouse['buttons'] + (False,) * (num_buttons - 3)
+    pygame.key.get_pressed = lambda: _PressedKeys(held_keys)
+
+_SKIP = object()
+
+def _probe_value(value, depth=3):
+    """A JSON-able copy of value, or _SKIP if it is not plain observable state."""
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, str):
+        return value if len(value) <= PROBE_MAX_STR else _SKIP
+    kind = type(value).__name__
+    if kind in ('Vector2', 'Vector3', 'Rect', 'FRect', 'Color'):
+        return [_probe_value(v) for v in value]
+    if hasattr(value, 'shape') and hasattr(value, 'tolist'):
+        # NumPy arrays and scalars
+        if getattr(value, 'size', 0) > PROBE_MAX_ITEMS:
+            return _SKIP
+        return _probe_value(value.tolist(), depth)
+    if isinstance(value, (list, tuple)) or kind == 'deque':
+        if depth == 0 or len(value) > PROBE_MAX_ITEMS:
+            return _SKIP
+        items = [_probe_value(v, depth - 1) for v in value]
+        return _SKIP if any(item is _SKIP for item in items) else items
+    return _SKIP
+
+class _Probe:
+    def __init__(self, state, path):
+        self.state = state
+        self.out = open(path, 'w', buffering=1)
+
+    def _is_program_object(self, value):
+        """An instance of a class the program itself defines."""
+        cls = type(value)
+        main = sys.modules.get('__main__')
+        return (cls.__module__ == '__main__' and hasattr(value, '__dict__') and
+                getattr(main, cls.__name__, None) is cls)
+
+    def _collect(self, snapshot, prefix, namespace, depth=2):
+        for name, value in list(namespace.items()):
+            if name.startswith('_') or len(snapshot) >= PROBE_MAX_NAMES:
+                continue
+            if depth and self._is_program_object(value):
+                self._collect(snapshot, f'{prefix}{name}.', vars(value), depth - 1)
+                continue
+            encoded = _probe_value(value)
+            if encoded is not _SKIP:
+                snapshot[prefix + name] = encoded
+
+    def snapshot(self):
+        try:
+            snapshot = {}
+            main = sys.modules.get('__main__')
+            if main is not None:
+                self._collect(snapshot, '', vars(main))
+            # Locals of the program's functions, innermost last so they win
+            frames = []
+            frame = sys._getframe(1)
+            while frame is not None:
+                if frame.f_code.co_filename == self.state.filename and frame.f_code.co_name != '<module>':
+                    frames.append(frame)
+                frame = frame.f_back
+            for frame in reversed(frames):
+                self._collect(snapshot, '', frame.f_locals)
+            del frames, frame
+            self.out.write(json.dumps(snapshot) + '\n')
+        except Exception:
+            pass
+
+    def close(self):
+        try:
+            self.out.close()
+        except Exception:
+            pass
+
+def install(options):
+    """Install the hooks options ask for; returns the HarnessState, or None if there are none."""
+    frame_budget = options.get('frame_budget')
+    input_options = options.get('input')
+    probe_options = options.get('probe')
+    if options.get('random_seed') is not None:
+        random.seed(options['random_seed'])
+    if not frame_budget and not input_options and not probe_options:
+        return None
+    state = HarnessState(frame_budget, options.get('poll_budget'))
+    if options.get('progress'):
+        state.open_progress(options['progress'])
+    if probe_options:
+        state.probe = _Probe(state, probe_options['path'])
+    _install_time_hooks(state)
+    try:
+        import pygame
+    except Exception:
+        return state
+    _install_pygame_clock(state, pygame)
+    _install_pygame_frames(state, pygame)
+    if input_options:
+        _install_input(state, pygame, input_options)
+    return state
+
+def run_code(code_string, filename, options=None, code=None):
+    """Run code_string (or its compiled code) as __main__ and return its exit status."""
+    state = install(options or {})
+    if state is not None:
+        state.filename = filename
+    linecache.cache[filename] = (len(code_string), None, code_string.splitlines(True), filename)
+    main = types.ModuleType('__main__')
+    main.__file__ = filename
+    main.__builtins__ = __builtins__
+    sys.modules['__main__'] = main
+    sys.argv = [filename]
+    try:
+        if code is None:
+            code = compile(code_string, filename, 'exec')
+        exec(code, main.__dict__)
+        status = 0
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except BaseException:
+        etype, value, tb = sys.exc_info()
+        # Drop this frame so the traceback starts in the generated code
+        traceback.print_exception(etype, value, tb.tb_next)
+        status = 1
+    write_report(state, 'exited' if status == 0 else 'error')
+    return status
+
+def main():
+    path = sys.argv[1]
+    options = json.loads(os.environ.get(OPTIONS_ENV) or '{}')
+    with open(path) as f:
+        code_string = f.read()
+    code = None
+    filename = path
+    if len(sys.argv) > 2:
+        # Marshalled code object from the parent's CodeArtifact
+        with open(sys.argv[2], 'rb') as f:
+            code = marshal.load(f)
+        filename = code.co_filename
+    # Run the program from its own directory, as `python program.py` would
+    sys.path[0] = os.path.dirname(os.path.abspath(path))
+    status = run_code(code_string, filename, options, code)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sys.exit(status)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Per-game scripted and seeded random input streams for harnessed runtime iterations."""
+
+import random
+
+EVENT_PROBABILITY = 0.5
+
+def _click(pos):
+    return [
+        ('MOUSEMOTION', {'pos': pos, 'rel': (0, 0), 'buttons': (0, 0, 0)}),
+        ('MOUSEBUTTONDOWN', {'pos': pos, 'button': 1}),
+        ('MOUSEBUTTONUP', {'pos': pos, 'button': 1}),
+    ]
+
+def _key(name):
+    return [
+        ('KEYDOWN', {'key': name, 'mod': 0, 'unicode': '', 'scancode': 0}),
+        ('KEYUP', {'key': name, 'mod': 0, 'unicode': '', 'scancode': 0}),
+    ]
+
+def _tic_tac_toe_cell(row, col):
+    return (col * 200 + 100, row * 200 + 100)
+
+def _tic_tac_toe(rng):
+    # Player 1 wins along the top row, then restart
+    for row, col in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]:
+        yield _click(_tic_tac_toe_cell(row, col))
+    yield _key('K_r')
+    while True:
+        if rng.random() < 0.1:
+            yield _key('K_r')
+        else:
+            yield _click(_tic_tac_toe_cell(rng.randrange(3), rng.randrange(3)))
+
+def _connect_four_column(col, rng):
+    return (col * 100 + 50, rng.randrange(0, 700))
+
+def _connect_four(rng):
+    # Player 1 stacks column 0 while player 2 plays column 1
+    for col in [0, 1, 0, 1, 0, 1, 0]:
+        yield _click(_connect_four_column(col, rng))
+    while True:
+        yield _click(_connect_four_column(rng.randrange(7), rng))
+
+def _snake_game(rng):
+    for name in ['K_DOWN', 'K_LEFT', 'K_UP', 'K_RIGHT']:
+        yield _key(name)
+    while True:
+        yield _key(rng.choice(['K_UP', 'K_DOWN', 'K_LEFT', 'K_RIGHT']))
+
+def _snakes_and_ladders(rng):
+    for _ in range(5):
+        yield _key('K_SPACE')
+    yield _key('K_r')
+    while True:
+        yield _key('K_r' if rng.random() < 0.05 else 'K_SPACE')
+
+def _ball_bouncing(rng):
+    yield _key('K_r')
+    while True:
+        yield _key(rng.choice(['K_r', 'K_SPACE', 'K_UP', 'K_DOWN']))
+
+GAME_INPUTS = {
+    'tic_tac_toe': _tic_tac_toe,
+    'connect_four': _connect_four,
+    'snake_game': _snake_game,
+    'snakes_and_ladders': _snakes_and_ladders,
+    'ball_bouncing': _ball_bouncing,
+}
+
+def event_stream(game_name, seed=0, probability=EVENT_PROBABILITY):
+    """Yield per-frame batches of (type_name, attrs) events for game_name."""
+    rng = random.Random(seed)
+    actions = GAME_INPUTS.get(game_name)
+    if actions is None:
+        raise ValueError(f"Unknown game: {game_name}")
+    for batch in actions(rng):
+        yield batch
+        # Idle frames let the game react before the next input
+        while rng.random() > probability:
+            yield []
@@ -0,0 +1,174 @@
+"""Killable, reusable worker processes for headless game-logic tests."""
+
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+try:
+    import resource
+except ImportError:
+    # Windows: no rlimits, the wall-clock timeout still applies
+    resource = None
+
+DEFAULT_TIMEOUT = 20
+DEFAULT_CPU_SECONDS = 20
+DEFAULT_MEMORY_MB = 2048
+DEFAULT_MAX_TASKS = 100
+
+def _context():
+    # A fresh forkserver/spawn child does not inherit the parent's threads
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+def _limit_memory(memory_mb):
+    if resource is None or not memory_mb:
+        return
+    limit = memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+def _limit_cpu(cpu_seconds):
+    """Allow cpu_seconds more CPU time; RLIMIT_CPU counts the whole process lifetime."""
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+def _worker_main(conn, cpu_seconds, memory_mb):
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    from .game_logic_checker import _run_game_logic_test
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        code_string, game_name = task
+        _limit_cpu(cpu_seconds)
+        try:
+            # No exec thread here: the parent kills the whole worker on a hang
+            result = _run_game_logic_test(code_string, game_name, exec_timeout=None)
+        except BaseException as e:
+            result = (False, f"Test error: {str(e)[:200]}")
+        conn.send(tuple(result))
+
+class _Worker:
+    def __init__(self, ctx, cpu_seconds, memory_mb):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main,
+                                   args=(child_conn, cpu_seconds, memory_mb))
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class LogicWorkerPool:
+    """Up to workers concurrent logic tests, each in its own process; thread-safe."""
+
+    def __init__(self, workers=1, timeout=DEFAULT_TIMEOUT, cpu_seconds=DEFAULT_CPU_SECONDS,
+                 memory_mb=DEFAULT_MEMORY_MB, max_tasks=DEFAULT_MAX_TASKS):
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_tasks = max_tasks
+        self.ctx = _context()
+        self.lock = threading.Lock()
+        self.live = set()
+        self.idle = queue.LifoQueue()
+        # Workers start lazily; None marks a slot without a process yet
+        for _ in range(workers):
+            self.idle.put(None)
+
+    def _spawn(self):
+        worker = _Worker(self.ctx, self.cpu_seconds, self.memory_mb)
+        with self.lock:
+            self.live.add(worker)
+        return worker
+
+    def _retire(self, worker, kill=True):
+        with self.lock:
+            self.live.discard(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+
+    def run(self, code_string, game_name):
+        """Run one headless logic test; returns (passed, error)."""
+        worker = self.idle.get()
+        slot = None
+        try:
+            if worker is None:
+                worker = self._spawn()
+            worker.conn.send((code_string, game_name))
+            worker.tasks += 1
+            if not worker.conn.poll(self.timeout):
+                self._retire(worker)
+                worker = None
+                return False, f"Game logic test timed out ({self.timeout}s)"
+            try:
+                result = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(timeout=1)
+                exitcode = worker.process.exitcode
+                self._retire(worker)
+                worker = None
+                if resource is not None and exitcode == -signal.SIGXCPU:
+                    return False, f"Game logic test exceeded CPU limit ({self.cpu_seconds}s)"
+                return False, f"Game logic worker died (exit code {exitcode})"
+            if self.max_tasks and worker.tasks >= self.max_tasks:
+                self._retire(worker, kill=False)
+                worker = None
+            else:
+                slot = worker
+            return result
+        finally:
+            if slot is None and worker is not None:
+                # Interrupted mid-task: the worker's state is unknown
+                self._retire(worker)
+            self.idle.put(slot)
+
+    def close(self):
+        with self.lock:
+            workers, self.live = list(self.live), set()
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1 @@
+"""Reference engines that the game-logic checker compares generated functions against."""
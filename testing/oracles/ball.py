@@ -0,0 +1,220 @@
+"""Trajectory oracle for the bouncing ball, one reference per wall-bounce rule."""
+
+import random
+import numpy as np
+
+WIDTH = 800
+HEIGHT = 600
+RADIUS = 20
+FRAMES = 1500
+START_STATES = 8
+TOLERANCE = 1.0
+# On touching a wall: clamp reverses and snaps to the wall
+# (games/ball_bouncing.py), reflect mirrors the overshoot back inside,
+# reverse only reverses (so may overshoot by one frame), and predict
+# reverses before a move that would cross the wall
+BOUNCE_RULES = ('clamp', 'reflect', 'reverse', 'predict')
+
+WIDTH_NAMES = ['WINDOW_WIDTH', 'SCREEN_WIDTH', 'WIDTH', 'width']
+HEIGHT_NAMES = ['WINDOW_HEIGHT', 'SCREEN_HEIGHT', 'HEIGHT', 'height']
+RADIUS_NAMES = ['ball_radius', 'BALL_RADIUS', 'radius', 'RADIUS']
+UPDATE_NAMES = ['update_ball', 'move_ball', 'update', 'move']
+POSITION_PAIRS = [('x', 'y'), ('pos_x', 'pos_y'), ('position_x', 'position_y')]
+VELOCITY_PAIRS = [('velocity_x', 'velocity_y'), ('vx', 'vy'), ('dx', 'dy'), ('speed_x', 'speed_y'),
+                  ('vel_x', 'vel_y'), ('x_velocity', 'y_velocity'), ('x_speed', 'y_speed')]
+POSITION_VECTORS = ['pos', 'position']
+VELOCITY_VECTORS = ['velocity', 'vel', 'speed']
+
+def _bounce_axis(pos, vel, low, high, rule):
+    """One frame along one axis for arrays of positions and velocities."""
+    if rule == 'predict':
+        crossing = (pos + vel < low) | (pos + vel > high)
+        vel = np.where(crossing, -vel, vel)
+        return pos + vel, vel
+    pos = pos + vel
+    if rule == 'reflect':
+        below, above = pos < low, pos > high
+        pos = np.where(below, 2 * low - pos, np.where(above, 2 * high - pos, pos))
+        return pos, np.where(below | above, -vel, vel)
+    hit_low, hit_high = pos <= low, pos >= high
+    vel = np.where(hit_low | hit_high, -vel, vel)
+    if rule == 'clamp':
+        pos = np.where(hit_low, low, np.where(hit_high, high, pos))
+    return pos, vel
+
+def reference_trajectories(starts, frames=FRAMES, rule='clamp', width=WIDTH, height=HEIGHT,
+                           radius=RADIUS):
+    """(S, frames, 2) ball centres for an (S, 4) array of (x, y, vx, vy) starts."""
+    starts = np.asarray(starts, dtype=float)
+    x, y, vx, vy = (starts[:, i].copy() for i in range(4))
+    path = np.empty((len(starts), frames, 2))
+    for frame in range(frames):
+        x, vx = _bounce_axis(x, vx, radius, width - radius, rule)
+        y, vy = _bounce_axis(y, vy, radius, height - radius, rule)
+        path[:, frame, 0] = x
+        path[:, frame, 1] = y
+    return path
+
+def start_states(count=START_STATES, seed=0, width=WIDTH, height=HEIGHT, radius=RADIUS,
+                 default=None):
+    """The game's own start state first, then seeded random in-bounds states."""
+    rng = random.Random(seed)
+    states = [list(default)] if default is not None else []
+    while len(states) < count:
+        states.append([
+            rng.randint(radius, width - radius),
+            rng.randint(radius, height - radius),
+            rng.choice([-1, 1]) * rng.randint(2, 9),
+            rng.choice([-1, 1]) * rng.randint(2, 9),
+        ])
+    return np.array(states, dtype=float)
+
+def _first_number(obj, names, default):
+    for name in names:
+        value = getattr(obj, name, None)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+    return default
+
+class BallAdapter:
+    """Reads and writes (x, y, vx, vy) and steps the candidate's update function."""
+
+    def __init__(self, module):
+        self.module = module
+        self.width = _first_number(module, WIDTH_NAMES, WIDTH)
+        self.height = _first_number(module, HEIGHT_NAMES, HEIGHT)
+        self.target = None
+        update = next((name for name in UPDATE_NAMES if callable(getattr(module, name, None))), None)
+        ball = getattr(module, 'ball', None)
+        if update is not None and self._resolve_fields(module, 'ball_'):
+            self.target = module
+            self.step = getattr(module, update)
+        elif update is not None and ball is not None and self._resolve_fields(ball, ''):
+            # A module-level update_ball() moving a global ball object
+            self.target = ball
+            self.step = getattr(module, update)
+        elif isinstance(getattr(module, 'Ball', None), type):
+            ball = module.Ball()
+            update = next((name for name in UPDATE_NAMES if callable(getattr(ball, name, None))), None)
+            if update is not None and self._resolve_fields(ball, ''):
+                self.target = ball
+                self.step = getattr(ball, update)
+        if self.target is None:
+            raise ValueError("Missing ball physics (update_ball or ball variables)")
+        self.radius = _first_number(self.target, RADIUS_NAMES,
+                                    _first_number(module, RADIUS_NAMES, RADIUS))
+
+    def _resolve_fields(self, obj, prefix):
+        def has_number(name):
+            value = getattr(obj, name, None)
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+        def has_vector(name):
+            try:
+                return len(getattr(obj, name)) == 2
+            except Exception:
+                return False
+
+        self.position = next((('pair', prefix + a, prefix + b) for a, b in POSITION_PAIRS
+                              if has_number(prefix + a) and has_number(prefix + b)), None)
+        if self.position is None:
+            self.position = next((('vector', prefix + name) for name in POSITION_VECTORS
+                                  if has_vector(prefix + name)), None)
+        self.velocity = next((('pair', prefix + a, prefix + b) for a, b in VELOCITY_PAIRS
+                              if has_number(prefix + a) and has_number(prefix + b)), None)
+        if self.velocity is None:
+            self.velocity = next((('vector', prefix + name) for name in VELOCITY_VECTORS
+                                  if has_vector(prefix + name)), None)
+        return self.position is not None and self.velocity is not None
+
+    def _get(self, field):
+        if field[0] == 'pair':
+            return float(getattr(self.target, field[1])), float(getattr(self.target, field[2]))
+        value = getattr(self.target, field[1])
+        return float(value[0]), float(value[1])
+
+    def _set(self, field, a, b):
+        if field[0] == 'pair':
+            setattr(self.target, field[1], a)
+            setattr(self.target, field[2], b)
+            return
+        current = getattr(self.target, field[1])
+        if isinstance(current, tuple):
+            setattr(self.target, field[1], (a, b))
+        elif isinstance(current, list):
+            setattr(self.target, field[1], [a, b])
+        else:
+            # pygame.Vector2 or similar
+            setattr(self.target, field[1], type(current)(a, b))
+
+    def state(self):
+        return self._get(self.position) + self._get(self.velocity)
+
+    def set_state(self, x, y, vx, vy):
+        as_int = lambda v: int(v) if float(v).is_integer() else v
+        self._set(self.position, as_int(x), as_int(y))
+        self._set(self.velocity, as_int(vx), as_int(vy))
+
+    def run(self, start, frames):
+        """Candidate positions after each of frames updates from start."""
+        self.set_state(*start)
+        path = np.empty((frames, 2))
+        for frame in range(frames):
+            self.step()
+            path[frame] = self.state()[:2]
+        return path
+
+def _first_divergence(actual, expected):
+    off = np.abs(actual - expected).max(axis=-1) > TOLERANCE
+    return int(off.argmax()) if off.any() else None
+
+def _first_out_of_bounds(path, width, height, radius, slack=(0.0, 0.0)):
+    x, y = path[:, 0], path[:, 1]
+    slack_x, slack_y = slack[0] + TOLERANCE, slack[1] + TOLERANCE
+    out = ((x < radius - slack_x) | (x > width - radius + slack_x) |
+           (y < radius - slack_y) | (y > height - radius + slack_y))
+    return int(out.argmax()) if out.any() else None
+
+def check_module(module, frames=FRAMES, states=START_STATES, seed=0):
+    """Step the candidate from several start states and report where it leaves the rule."""
+    try:
+        adapter = BallAdapter(module)
+        default = adapter.state()
+    except Exception as e:
+        return {'error': str(e)[:200]}
+    dims = (adapter.width, adapter.height, adapter.radius)
+    starts = start_states(states, seed, *dims, default=default)
+    report = {'rule': None, 'states': len(starts), 'frames': frames,
+              'divergence': None, 'out_of_bounds': None}
+
+    try:
+        paths = [adapter.run(start, frames) for start in starts]
+    except Exception as e:
+        report['error'] = f"update error: {str(e)[:100]}"
+        return report
+
+    # The rule is the one the candidate follows longest, summed over starts
+    references = {rule: reference_trajectories(starts, frames, rule, *dims) for rule in BOUNCE_RULES}
+    def agreement(rule):
+        agreed = 0
+        for path, expected in zip(paths, references[rule]):
+            frame = _first_divergence(path, expected)
+            agreed += frames if frame is None else frame
+        return agreed
+    rule = max(BOUNCE_RULES, key=agreement)
+    report['rule'] = rule
+
+    for index, path in enumerate(paths):
+        expected = references[rule][index]
+        frame = _first_divergence(path, expected)
+        if frame is not None and report['divergence'] is None:
+            report['divergence'] = {'state': index, 'start': starts[index].tolist(), 'frame': frame,
+                                    'expected': expected[frame].tolist(), 'actual': path[frame].tolist()}
+        # Rules that do not reposition the ball leave it up to one frame's
+        # move past the wall
+        slack = np.abs(starts[index][2:]) if rule == 'reverse' else (0.0, 0.0)
+        frame = _first_out_of_bounds(path, *dims, slack=slack)
+        if frame is not None and report['out_of_bounds'] is None:
+            report['out_of_bounds'] = {'state': index, 'start': starts[index].tolist(), 'frame': frame,
+                                       'position': path[frame].tolist()}
+    return report
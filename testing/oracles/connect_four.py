@@ -0,0 +1,178 @@
+"""Connect Four corpus of reachable positions and a bitboard win oracle."""
+
+import os
+import numpy as np
+
+# Boards are int8 (ROWS, COLS) arrays with row 0 at the bottom; in a bitboard
+# cell (row, col) is bit col * COLUMN_BITS + row, and the spare bit per column
+# keeps the shifts from wrapping
+ROWS = 6
+COLS = 7
+COLUMN_BITS = ROWS + 1
+DIRECTIONS = (1, COLUMN_BITS, COLUMN_BITS - 1, COLUMN_BITS + 1)
+CORPUS_VERSION = 1
+CORPUS_SIZE = 100000
+CORPUS_SEED = 0
+CORPUS_DIR = os.path.join('.eval_cache', 'oracles')
+CHECK_POSITIONS = 5000
+
+BIT_WEIGHTS = np.array([[1 << (c * COLUMN_BITS + r) for c in range(COLS)] for r in range(ROWS)],
+                       dtype=np.uint64)
+
+def has_four(bitboards):
+    """Vectorized four-in-a-row test over an array of uint64 bitboards."""
+    bitboards = np.asarray(bitboards, dtype=np.uint64)
+    found = np.zeros(bitboards.shape, dtype=bool)
+    for s in DIRECTIONS:
+        shift = np.uint64(s)
+        m = bitboards & (bitboards >> shift)
+        found |= (m & (m >> np.uint64(2 * s))) != 0
+    return found
+
+def bitboards(boards, piece):
+    """uint64 bitboard of piece for each board in an (N, ROWS, COLS) array."""
+    return ((np.asarray(boards) == piece) * BIT_WEIGHTS).sum(axis=(-2, -1), dtype=np.uint64)
+
+def winners(boards):
+    """(N, 2) bool array: whether piece 1 / piece 2 has four in a row."""
+    return np.stack([has_four(bitboards(boards, 1)), has_four(bitboards(boards, 2))], axis=-1)
+
+def heights(boards):
+    """(N, COLS) number of pieces in each column."""
+    return (np.asarray(boards) != 0).sum(axis=-2)
+
+def generate_positions(count, seed=CORPUS_SEED):
+    """(count, ROWS, COLS) int8 boards reached by random legal play."""
+    rng = np.random.default_rng(seed)
+    boards = np.zeros((count, ROWS, COLS), dtype=np.int8)
+    height = np.zeros((count, COLS), dtype=np.int64)
+    bits = np.zeros((count, 2), dtype=np.uint64)
+    target = rng.integers(0, ROWS * COLS + 1, size=count)
+    active = target > 0
+    index = np.arange(count)
+
+    for ply in range(ROWS * COLS):
+        games = index[active & (target > ply)]
+        if games.size == 0:
+            break
+        # A random legal column: random scores with full columns masked out
+        scores = rng.random((games.size, COLS))
+        scores[height[games] >= ROWS] = -1.0
+        cols = scores.argmax(axis=1)
+        rows = height[games, cols]
+        player = ply % 2
+        boards[games, rows, cols] = player + 1
+        height[games, cols] += 1
+        bits[games, player] |= np.left_shift(np.uint64(1), (cols * COLUMN_BITS + rows).astype(np.uint64))
+        # Play stops at the first win
+        active[games[has_four(bits[games, player])]] = False
+    return boards
+
+def corpus_path(count=CORPUS_SIZE, seed=CORPUS_SEED, directory=CORPUS_DIR):
+    return os.path.join(directory, f'connect_four_v{CORPUS_VERSION}_{count}_{seed}.npy')
+
+_corpora = {}
+
+def load_corpus(count=CORPUS_SIZE, seed=CORPUS_SEED, directory=CORPUS_DIR):
+    """Memory-mapped corpus of count positions, generated on first use."""
+    path = corpus_path(count, seed, directory)
+    if path not in _corpora:
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp.npy'
+            np.save(tmp_path, generate_positions(count, seed))
+            # Another process may have written it meanwhile; both are identical
+            os.replace(tmp_path, path)
+        _corpora[path] = np.load(path, mmap_mode='r')
+    return _corpora[path]
+
+def _board_adapter(module):
+    """Turn corpus boards into the module's own board type and row order."""
+    as_type = lambda board: np.array(board, dtype=int)
+    flipped = False
+    create_board = getattr(module, 'create_board', None)
+    if create_board is not None:
+        try:
+            template = create_board()
+            if isinstance(template, np.ndarray):
+                dtype = template.dtype
+                as_type = lambda board: np.array(board, dtype=dtype)
+            elif isinstance(template, list):
+                as_type = lambda board: np.array(board, dtype=int).tolist()
+            get_next_open_row = getattr(module, 'get_next_open_row', None)
+            if get_next_open_row is not None and get_next_open_row(template, 0) == ROWS - 1:
+                flipped = True
+        except Exception:
+            pass
+    if flipped:
+        return lambda board: as_type(board[::-1]), True
+    return as_type, False
+
+def _record_mismatch(report, name, index, board, expected, actual):
+    """Count a mismatch, keeping the one with the fewest pieces."""
+    report['mismatches'][name] = report['mismatches'].get(name, 0) + 1
+    pieces = int(np.count_nonzero(board))
+    current = report['counterexamples'].get(name)
+    if current is None or pieces < current['pieces']:
+        report['counterexamples'][name] = {
+            'index': int(index),
+            'pieces': pieces,
+            'board': format_board(board),
+            'expected': expected,
+            'actual': actual
+        }
+
+def format_board(board):
+    """Rows top to bottom, '.' for empty."""
+    return ' / '.join(''.join('.12'[int(v)] for v in row) for row in np.asarray(board)[::-1])
+
+def check_module(module, positions=CHECK_POSITIONS, corpus=None):
+    """Diff winning_move and the board helpers against the oracle on the corpus."""
+    if corpus is None:
+        corpus = load_corpus()
+    boards = np.asarray(corpus[:positions])
+    truth = winners(boards)
+    column_heights = heights(boards)
+    convert, flipped = _board_adapter(module)
+    report = {'checked': len(boards), 'mismatches': {}, 'counterexamples': {}}
+
+    winning_move = module.winning_move
+    get_next_open_row = getattr(module, 'get_next_open_row', None)
+    is_valid_location = getattr(module, 'is_valid_location', None)
+    errors = 0
+    first_error = None
+    for i, board in enumerate(boards):
+        for piece in (1, 2):
+            expected = bool(truth[i, piece - 1])
+            try:
+                actual = bool(winning_move(convert(board), piece))
+            except Exception as e:
+                actual = f"error: {str(e)[:60]}"
+                errors += 1
+                first_error = first_error or str(e)[:100]
+            if actual != expected:
+                _record_mismatch(report, f'winning_move(board, {piece})', i, board, expected, actual)
+        col = i % COLS
+        height = int(column_heights[i, col])
+        if is_valid_location is not None:
+            expected = height < ROWS
+            try:
+                actual = bool(is_valid_location(convert(board), col))
+            except Exception as e:
+                actual = f"error: {str(e)[:60]}"
+            if actual != expected:
+                _record_mismatch(report, 'is_valid_location', i, board, expected, actual)
+        if get_next_open_row is not None and height < ROWS:
+            expected = ROWS - 1 - height if flipped else height
+            try:
+                actual = get_next_open_row(convert(board), col)
+                actual = int(actual) if actual is not None else None
+            except Exception as e:
+                actual = f"error: {str(e)[:60]}"
+            if actual != expected:
+                _record_mismatch(report, 'get_next_open_row', i, board, expected, actual)
+        if errors == 2 * (i + 1) and i >= 10:
+            # winning_move fails on every call; no point going on
+            report['error'] = f"winning_move error: {first_error}"
+            break
+    return report
@@ -0,0 +1,223 @@
+"""Lockstep oracle that runs a generated Snake next to the one in games/snake_game.py."""
+
+import random
+from collections import deque
+
+GRID_WIDTH = 30
+GRID_HEIGHT = 30
+DEFAULT_CELL_SIZE = 20
+STEPS = 3000
+TURN_PROBABILITY = 0.3
+GROW_PROBABILITY = 0.2
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+DIRECTION_NAMES = {(0, -1): 'up', (0, 1): 'down', (-1, 0): 'left', (1, 0): 'right'}
+
+BODY_ATTRS = ['body', 'segments', 'positions', 'snake_body', 'blocks', 'coords']
+MOVE_METHODS = ['move_snake', 'move', 'update']
+GROW_METHODS = ['add_block', 'grow', 'grow_snake', 'add_segment', 'eat']
+GROW_FLAGS = ['new_block', 'grow', 'growing', 'should_grow']
+COLLISION_METHODS = ['check_collision', 'check_collisions', 'collides', 'is_collision',
+                     'check_fail', 'is_dead']
+CELL_SIZE_NAMES = ['CELL_SIZE', 'BLOCK_SIZE', 'GRID_SIZE', 'SNAKE_BLOCK', 'SNAKE_SIZE']
+
+# Keeps an occupancy count per cell next to the body, so a move and a
+# collision test are O(1) whatever the length
+class ReferenceSnake:
+    def __init__(self, body, direction, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        self.body = deque()
+        self.occupancy = bytearray(width * height)
+        self.direction = direction
+        self.new_block = False
+        for cell in body:
+            self.body.append(cell)
+            self._occupy(cell, 1)
+
+    def _in_bounds(self, cell):
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def _occupy(self, cell, delta):
+        if self._in_bounds(cell):
+            self.occupancy[cell[1] * self.width + cell[0]] += delta
+
+    def move_snake(self):
+        head = self.body[0]
+        new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
+        self.body.appendleft(new_head)
+        self._occupy(new_head, 1)
+        if self.new_block:
+            self.new_block = False
+        else:
+            self._occupy(self.body.pop(), -1)
+
+    def add_block(self):
+        self.new_block = True
+
+    def check_collision(self):
+        head = self.body[0]
+        if not self._in_bounds(head):
+            return 'wall'
+        if self.occupancy[head[1] * self.width + head[0]] > 1:
+            return 'self'
+        return None
+
+def _first_attr(obj, names, callable_only=False):
+    for name in names:
+        value = getattr(obj, name, None)
+        if value is not None and (not callable_only or callable(value)):
+            return name
+    return None
+
+def _xy(value):
+    if hasattr(value, 'x') and hasattr(value, 'y'):
+        return value.x, value.y
+    return value[0], value[1]
+
+class SnakeAdapter:
+    """How to read and drive one generated Snake class, resolved from a fresh instance."""
+
+    def __init__(self, module, snake_class, seed=0):
+        random.seed(seed)
+        snake = snake_class()
+        self.snake_class = snake_class
+        self.body_attr = _first_attr(snake, BODY_ATTRS)
+        if self.body_attr is None:
+            raise ValueError("Snake has no body/segments list")
+        self.move_method = _first_attr(snake, MOVE_METHODS, callable_only=True)
+        if self.move_method is None:
+            raise ValueError("Snake class missing move functionality")
+        self.grow_method = _first_attr(snake, GROW_METHODS, callable_only=True)
+        self.grow_flag = None
+        if self.grow_method is None:
+            self.grow_flag = next((name for name in GROW_FLAGS
+                                   if isinstance(getattr(snake, name, None), bool)), None)
+        self.collision_method = _first_attr(snake, COLLISION_METHODS, callable_only=True)
+
+        self.width = getattr(module, 'CELL_NUMBER_X', GRID_WIDTH)
+        self.height = getattr(module, 'CELL_NUMBER_Y', GRID_HEIGHT)
+        cell_size = next((getattr(module, name) for name in CELL_SIZE_NAMES
+                          if isinstance(getattr(module, name, None), (int, float))), DEFAULT_CELL_SIZE)
+        # Pixel coordinates if the start body lies outside the cell grid
+        cells = [_xy(block) for block in getattr(snake, self.body_attr)]
+        self.scale = cell_size if any(x >= self.width or y >= self.height for x, y in cells) else 1
+
+        direction = getattr(snake, 'direction', None)
+        if direction is None:
+            raise ValueError("Snake has no direction")
+        self.direction_style = None
+        self.direction_scale = 1
+        if isinstance(direction, str):
+            self.direction_style = 'upper' if direction.isupper() else 'lower'
+        else:
+            dx, dy = _xy(direction)
+            self.direction_type = type(direction)
+            self.direction_scale = (abs(dx) + abs(dy)) or 1
+
+    def new_snake(self):
+        return self.snake_class()
+
+    def body(self, snake):
+        cells = []
+        for block in getattr(snake, self.body_attr):
+            x, y = _xy(block)
+            cells.append((round(x / self.scale), round(y / self.scale)))
+        return cells
+
+    def direction(self, snake):
+        direction = getattr(snake, 'direction', None)
+        if isinstance(direction, str):
+            return next(d for d, name in DIRECTION_NAMES.items() if name == direction.lower())
+        dx, dy = _xy(direction)
+        return (round(dx / self.direction_scale), round(dy / self.direction_scale))
+
+    def set_direction(self, snake, direction):
+        if self.direction_style is not None:
+            name = DIRECTION_NAMES[direction]
+            snake.direction = name.upper() if self.direction_style == 'upper' else name
+            return
+        dx, dy = direction[0] * self.direction_scale, direction[1] * self.direction_scale
+        if self.direction_type in (tuple, list):
+            snake.direction = self.direction_type((dx, dy))
+        else:
+            snake.direction = self.direction_type(dx, dy)
+
+    @property
+    def can_grow(self):
+        return self.grow_method is not None or self.grow_flag is not None
+
+    def grow(self, snake):
+        if self.grow_method is not None:
+            getattr(snake, self.grow_method)()
+        elif self.grow_flag is not None:
+            setattr(snake, self.grow_flag, True)
+
+    def move(self, snake):
+        getattr(snake, self.move_method)()
+
+    def collided(self, snake):
+        if self.collision_method is None:
+            return None
+        return bool(getattr(snake, self.collision_method)())
+
+def _reference_for(adapter, snake):
+    return ReferenceSnake(adapter.body(snake), adapter.direction(snake), adapter.width, adapter.height)
+
+def simulate(module, steps=STEPS, seed=0):
+    """Run module.Snake and the reference in lockstep for steps moves; returns a report."""
+    try:
+        adapter = SnakeAdapter(module, module.Snake, seed)
+        random.seed(seed)
+        snake = adapter.new_snake()
+        reference = _reference_for(adapter, snake)
+    except Exception as e:
+        return {'error': f"Snake instantiation error: {str(e)[:100]}"}
+
+    rng = random.Random(seed)
+    report = {'steps': 0, 'games': 1, 'collisions': {'wall': 0, 'self': 0}, 'divergence': None}
+    for step in range(steps):
+        action = []
+        try:
+            if rng.random() < TURN_PROBABILITY:
+                # Only perpendicular turns: reversing is not a legal move
+                current = reference.direction
+                turns = [d for d in DIRECTIONS if d[0] * current[0] + d[1] * current[1] == 0]
+                direction = rng.choice(turns)
+                adapter.set_direction(snake, direction)
+                reference.direction = direction
+                action.append(f"turn {DIRECTION_NAMES[direction]}")
+            # Growth may live outside Snake (e.g. in a Game class); only
+            # script it when the Snake exposes a way to grow
+            if rng.random() < GROW_PROBABILITY and adapter.can_grow:
+                adapter.grow(snake)
+                reference.add_block()
+                action.append("grow")
+            adapter.move(snake)
+            reference.move_snake()
+            actual_body = adapter.body(snake)
+            actual_collision = adapter.collided(snake)
+        except Exception as e:
+            report['divergence'] = {'step': step, 'action': action,
+                                    'error': f"{type(e).__name__}: {str(e)[:100]}"}
+            break
+        expected_body = list(reference.body)
+        expected_collision = reference.check_collision()
+        report['steps'] = step + 1
+
+        if actual_body != expected_body:
+            report['divergence'] = {'step': step, 'action': action,
+                                    'expected_body': expected_body[:6], 'actual_body': actual_body[:6],
+                                    'expected_length': len(expected_body), 'actual_length': len(actual_body)}
+            break
+        if actual_collision is not None and actual_collision != bool(expected_collision):
+            report['divergence'] = {'step': step, 'action': action, 'head': expected_body[0],
+                                    'expected_collision': expected_collision or False,
+                                    'actual_collision': actual_collision}
+            break
+        if expected_collision:
+            report['collisions'][expected_collision] += 1
+            report['games'] += 1
+            snake = adapter.new_snake()
+            reference = _reference_for(adapter, snake)
+    return report
@@ -0,0 +1,220 @@
+"""Absorbing Markov-chain oracle for the snakes and ladders board in the prompt."""
+
+import inspect
+import numpy as np
+
+SQUARES = 100
+DIE = 6
+LADDERS = {3: 22, 5: 8, 11: 26, 20: 29, 17: 4}
+SNAKES = {27: 1, 21: 9, 19: 7, 25: 13, 15: 6}
+# A roll past 100 is ignored (games/snakes_and_ladders.py), walks back by
+# the excess, or stops on 100
+OVERSHOOT_RULES = ('stay', 'bounce', 'cap')
+GAMES = 1000
+MAX_TURNS = 1000
+SEED = 0
+MAX_TURNS_Z = 5.0
+MAX_LANDING_TV = 0.05
+
+POSITION_NAMES = ['player_pos', 'player_position', 'position', 'current_position', 'pos']
+MOVE_NAMES = ['move_player', 'move', 'move_token', 'update_position', 'make_move', 'take_turn']
+CLASS_NAMES = ['Game', 'SnakesAndLadders', 'SnakesLadders', 'Player', 'Board']
+GAME_OVER_NAMES = ['game_over', 'won', 'winner', 'game_won']
+
+def next_square(square, roll, rule='stay'):
+    target = square + roll
+    if target > SQUARES:
+        if rule == 'stay':
+            return square
+        target = SQUARES if rule == 'cap' else 2 * SQUARES - target
+    target = LADDERS.get(target, target)
+    return SNAKES.get(target, target)
+
+def next_table(rule='stay'):
+    """table[square, roll] is the square after the move; square 100 stays put."""
+    table = np.zeros((SQUARES + 1, DIE + 1), dtype=np.int64)
+    for square in range(SQUARES):
+        for roll in range(1, DIE + 1):
+            table[square, roll] = next_square(square, roll, rule)
+    table[SQUARES, :] = SQUARES
+    return table
+
+def transition_matrix(rule='stay'):
+    table = next_table(rule)
+    P = np.zeros((SQUARES + 1, SQUARES + 1))
+    for square in range(SQUARES + 1):
+        for roll in range(1, DIE + 1):
+            P[square, table[square, roll]] += 1.0 / DIE
+    return P
+
+def fundamental_matrix(rule='stay'):
+    Q = transition_matrix(rule)[:SQUARES, :SQUARES]
+    return np.linalg.inv(np.eye(SQUARES) - Q)
+
+def expected_turns(start=1, rule='stay'):
+    """(mean, variance) of the number of rolls from start to square 100."""
+    N = fundamental_matrix(rule)
+    t = N.sum(axis=1)
+    variance = (2 * N - np.eye(SQUARES)) @ t - t * t
+    return float(t[start]), float(variance[start])
+
+def expected_landings(start=1, rule='stay'):
+    """Expected turns ending on each square 0-99 per game, from the fundamental matrix."""
+    return fundamental_matrix(rule)[start]
+
+def simulate_reference(start, rolls, rule='stay'):
+    """Play every row of a (games, turns) roll array at once; returns the squares."""
+    table = next_table(rule)
+    squares = np.empty(rolls.shape, dtype=np.int64)
+    square = np.full(rolls.shape[0], start, dtype=np.int64)
+    for turn in range(rolls.shape[1]):
+        square = table[square, rolls[:, turn]]
+        squares[:, turn] = square
+    return squares
+
+def _int_attr(obj, names):
+    for name in names:
+        value = getattr(obj, name, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return name
+    return None
+
+def _arity(function):
+    try:
+        return len([p for p in inspect.signature(function).parameters.values()
+                    if p.default is p.empty and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)])
+    except (TypeError, ValueError):
+        return None
+
+class MoveAdapter:
+    """Calls the candidate's move with a given square and roll, whatever its signature."""
+
+    def __init__(self, module):
+        self.module = module
+        self.pure = None
+        self.target = None
+        for name in MOVE_NAMES:
+            function = getattr(module, name, None)
+            if not callable(function) or isinstance(function, type):
+                continue
+            arity = _arity(function)
+            position = _int_attr(module, POSITION_NAMES)
+            if arity == 2:
+                self.pure = function
+                self.start = getattr(module, position) if position else 1
+                self.description = f"{name}(square, roll)"
+                return
+            if arity == 1 and position is not None:
+                self._bind(module, position, function, name)
+                return
+        for class_name in CLASS_NAMES:
+            cls = getattr(module, class_name, None)
+            if not isinstance(cls, type):
+                continue
+            try:
+                obj = cls()
+            except Exception:
+                continue
+            position = _int_attr(obj, POSITION_NAMES)
+            method = next((name for name in MOVE_NAMES if callable(getattr(obj, name, None))), None)
+            if position is not None and method is not None and _arity(getattr(obj, method)) == 1:
+                self._bind(obj, position, getattr(obj, method), f"{class_name}.{method}")
+                return
+        raise ValueError("Missing move function taking a die roll")
+
+    def _bind(self, target, position, function, name):
+        self.target = target
+        self.position = position
+        self.function = function
+        self.start = getattr(target, position)
+        self.game_over = next((flag for flag in GAME_OVER_NAMES
+                               if isinstance(getattr(target, flag, None), bool)), None)
+        self.description = f"{name}(roll) on {position}"
+
+    def move(self, square, roll):
+        if self.pure is not None:
+            return int(self.pure(square, roll))
+        setattr(self.target, self.position, square)
+        if self.game_over is not None:
+            setattr(self.target, self.game_over, False)
+        result = self.function(roll)
+        # Some return the new square instead of (or as well as) storing it
+        if isinstance(result, int) and not isinstance(result, bool) and \
+                getattr(self.target, self.position) == square and result != square:
+            return result
+        return int(getattr(self.target, self.position))
+
+def _candidate_table(adapter, start):
+    """The candidate's table of next squares, every (square, roll) from start up."""
+    table = np.zeros((SQUARES + 1, DIE + 1), dtype=np.int64)
+    table[SQUARES, :] = SQUARES
+    for square in range(start, SQUARES):
+        for roll in range(1, DIE + 1):
+            table[square, roll] = adapter.move(square, roll)
+    return table
+
+def check_module(module, games=GAMES, seed=SEED):
+    """Diff the candidate's moves and seeded games against the chain; returns a report."""
+    try:
+        adapter = MoveAdapter(module)
+        start = adapter.start
+        if start not in (0, 1):
+            return {'error': f"Player starts on square {start}, expected 1"}
+        table = _candidate_table(adapter, start)
+    except Exception as e:
+        return {'error': f"move error: {str(e)[:100]}"}
+
+    squares = range(start, SQUARES)
+    def mismatches(rule):
+        expected = next_table(rule)
+        return int((table[start:SQUARES, 1:] != expected[start:SQUARES, 1:]).sum())
+    rule = min(OVERSHOOT_RULES, key=mismatches)
+    expected_table = next_table(rule)
+    report = {'adapter': adapter.description, 'rule': rule, 'start': start,
+              'transition_mismatches': mismatches(rule), 'counterexample': None}
+    for square in squares:
+        for roll in range(1, DIE + 1):
+            if table[square, roll] != expected_table[square, roll]:
+                report['counterexample'] = {'square': square, 'roll': roll,
+                                            'expected': int(expected_table[square, roll]),
+                                            'actual': int(table[square, roll])}
+                break
+        if report['counterexample'] is not None:
+            break
+
+    # Seeded games through the candidate, replayed on the chain with the
+    # same dice
+    rng = np.random.default_rng(seed)
+    rolls = rng.integers(1, DIE + 1, size=(games, MAX_TURNS), dtype=np.int64)
+    reference = simulate_reference(start, rolls, rule)
+    turns = np.zeros(games, dtype=np.int64)
+    landings = np.zeros(SQUARES + 1)
+    divergence = None
+    try:
+        for game in range(games):
+            square = start
+            landings[square] += 1
+            for turn in range(MAX_TURNS):
+                square = adapter.move(square, int(rolls[game, turn]))
+                if divergence is None and square != reference[game, turn]:
+                    divergence = {'game': game, 'turn': turn, 'roll': int(rolls[game, turn]),
+                                  'expected': int(reference[game, turn]), 'actual': square}
+                if square >= SQUARES or not 0 <= square:
+                    break
+                landings[square] += 1
+            turns[game] = turn + 1
+    except Exception as e:
+        report['error'] = f"move error: {str(e)[:100]}"
+        return report
+
+    mean, variance = expected_turns(start, rule)
+    expected = expected_landings(start, rule)
+    report.update({
+        'games': games,
+        'divergence': divergence,
+        'expected_turns': mean,
+        'mean_turns': float(turns.mean()),
+        'turns_z': float((turns.mean() - mean) / np.sqrt(variance / games)),
+        'landing_tv': float(0.5 * np.abs(landings[:SQUARES] / landings.sum() - expected / expected.sum()).sum()),
+    })
+    return report
@@ -0,0 +1,176 @@
+"""Exhaustive tic-tac-toe oracle over every reachable position as an 18-bit bitboard."""
+
+# Bits 0-8 hold player 1's marks and bits 9-17 player 2's; cell (row, col)
+# is bit row * 3 + col
+CELLS = 9
+FULL = (1 << CELLS) - 1
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+]
+WIN_TABLE = bytes(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << CELLS))
+
+# (player 1, player 2, empty) conventions seen in generated code
+MARK_STYLES = [
+    (1, 2, None), (1, 2, 0), ('X', 'O', None), ('X', 'O', ''), ('X', 'O', ' '),
+    ('x', 'o', None), ('x', 'o', ''), ('x', 'o', ' '), (1, -1, 0),
+]
+
+_positions = []
+
+def split(position):
+    return position & FULL, position >> CELLS
+
+def reachable_positions():
+    """Every legally reachable position, as 18-bit ints."""
+    if _positions:
+        return _positions
+    seen = set()
+    stack = [0]
+    while stack:
+        position = stack.pop()
+        if position in seen:
+            continue
+        seen.add(position)
+        p1, p2 = split(position)
+        if WIN_TABLE[p1] or WIN_TABLE[p2] or (p1 | p2) == FULL:
+            continue
+        # Player 1 moves whenever both players have the same number of marks
+        shift = 0 if bin(p1).count('1') == bin(p2).count('1') else CELLS
+        for cell in range(CELLS):
+            if not (p1 | p2) >> cell & 1:
+                stack.append(position | 1 << (cell + shift))
+    _positions.extend(sorted(seen))
+    return _positions
+
+def to_grid(position, marks, flat=False):
+    p1, p2 = split(position)
+    cells = [marks[0] if p1 >> i & 1 else marks[1] if p2 >> i & 1 else marks[2]
+             for i in range(CELLS)]
+    if flat:
+        return cells
+    return [cells[0:3], cells[3:6], cells[6:9]]
+
+def format_position(position):
+    rows = to_grid(position, ('X', 'O', '.'))
+    return ' / '.join(''.join(row) for row in rows)
+
+def _module_board_style(module):
+    """(flat, empty value) read off the module's own board, if it has one."""
+    board = getattr(module, 'board', None)
+    try:
+        if len(board) == CELLS and not hasattr(board[0], '__len__'):
+            return True, board[0]
+        if len(board) == 3:
+            return False, board[0][0]
+    except Exception:
+        pass
+    return False, None
+
+def _make_callers(module):
+    """Candidate ways of asking check_win whether a player has won."""
+    check_win = module.check_win
+
+    def with_board(position, player, marks, flat):
+        return bool(check_win(to_grid(position, marks, flat), marks[player]))
+
+    def with_module_board(position, player, marks, flat):
+        module.board = to_grid(position, marks, flat)
+        return bool(check_win(marks[player]))
+
+    def winner_of_board(position, player, marks, flat):
+        result = check_win(to_grid(position, marks, flat))
+        if result is True:
+            # Only says someone won; credit the player who owns a line
+            return bool(WIN_TABLE[split(position)[player]])
+        return result == marks[player]
+
+    callers = [('check_win(board, player)', with_board)]
+    if hasattr(module, 'board'):
+        callers.append(('check_win(player) on module board', with_module_board))
+    callers.append(('check_win(board)', winner_of_board))
+    return callers
+
+def parse_position(text):
+    """Inverse of format_position: 'XXX / OO. / ...' -> 18-bit position."""
+    cells = [c for c in text if c in 'XO.']
+    position = 0
+    for i, c in enumerate(cells):
+        if c == 'X':
+            position |= 1 << i
+        elif c == 'O':
+            position |= 1 << (i + CELLS)
+    return position
+
+# Calibration positions: a row, a column, a diagonal and a full board
+# without a line
+_PROBES = [parse_position(text) for text in
+           ['XXX / OO. / ...', 'OXX / OX. / O..', 'XOO / .X. / ..X', 'XOX / XOO / OXX']]
+
+def _count_probe_errors(caller, marks, flat):
+    errors = 0
+    for position in _PROBES:
+        for player in (0, 1):
+            expected = bool(WIN_TABLE[split(position)[player]])
+            if caller(position, player, marks, flat) != expected:
+                errors += 1
+    return errors
+
+def resolve_adapter(module):
+    """(description, call) for the check_win signature that fits best, or (None, error)."""
+    module_flat, module_empty = _module_board_style(module)
+    styles = sorted(MARK_STYLES, key=lambda marks: marks[2] != module_empty)
+    best = None
+    first_error = None
+    for name, caller in _make_callers(module):
+        for marks in styles:
+            try:
+                errors = _count_probe_errors(caller, marks, module_flat)
+            except Exception as e:
+                if first_error is None:
+                    first_error = e
+                continue
+            if best is None or errors < best[0]:
+                best = (errors, name, caller, marks)
+            if errors == 0:
+                break
+        if best is not None and best[0] == 0:
+            break
+    if best is None:
+        return None, f"check_win function error: {str(first_error)[:100]}"
+    _, name, caller, marks = best
+    return f"{name} with marks {marks[:2]}", lambda position, player: caller(position, player, marks, module_flat)
+
+def check_check_win(module):
+    """Compare module.check_win with the oracle on every reachable position."""
+    adapter, call = resolve_adapter(module)
+    if adapter is None:
+        return {'error': call}
+    mismatches = 0
+    checked = 0
+    counterexample = None
+    for position in reachable_positions():
+        for player in (0, 1):
+            expected = bool(WIN_TABLE[split(position)[player]])
+            try:
+                actual = call(position, player)
+            except Exception as e:
+                actual = f"error: {str(e)[:60]}"
+            checked += 1
+            if actual != expected:
+                mismatches += 1
+                key = (bin(position).count('1'), position, player)
+                if counterexample is None or key < counterexample[0]:
+                    counterexample = (key, position, player, expected, actual)
+    report = {'adapter': adapter, 'checked': checked, 'mismatches': mismatches,
+              'counterexample': None}
+    if counterexample is not None:
+        _, position, player, expected, actual = counterexample
+        report['counterexample'] = {
+            'board': format_position(position),
+            'player': 'XO'[player],
+            'expected': expected,
+            'actual': actual
+        }
+    return report
@@ -0,0 +1,78 @@
+"""Headless, pure-Python stand-in for the parts of pygame that generated games use."""
+
+import sys
+from contextlib import contextmanager
+
+from .constants import *
+from .rect import Rect, FRect
+from .math import Vector2
+from .surface import Surface, Color
+from . import constants, locals, rect, surface, math
+from . import display, event, time, font, draw, mouse, key, mixer, image, transform
+
+IS_SHIM = True
+SUBMODULES = ['constants', 'locals', 'rect', 'surface', 'math', 'display', 'event', 'time',
+              'font', 'draw', 'mouse', 'key', 'mixer', 'image', 'transform']
+
+class error(RuntimeError):
+    pass
+
+class _Version:
+    ver = '2.6.1'
+    vernum = (2, 6, 1)
+    SDL = (2, 28, 4)
+
+version = _Version()
+
+def init():
+    display.init()
+    font.init()
+    mixer.init()
+    return (6, 0)
+
+def quit():
+    display.quit()
+    font.quit()
+    mixer.quit()
+
+def get_init():
+    return display.get_init()
+
+def get_sdl_version(linked=True):
+    return _Version.SDL
+
+def get_error():
+    return ''
+
+def reset():
+    """Forget state left behind by the previous program."""
+    quit()
+    event._queue.clear()
+    time._now[0] = 0
+    mouse._state['pos'] = (0, 0)
+
+def install():
+    """Make `import pygame` resolve to the shim; returns the entries it replaced."""
+    package = sys.modules[__name__]
+    names = ['pygame'] + ['pygame.' + name for name in SUBMODULES]
+    saved = {name: sys.modules.get(name) for name in names}
+    sys.modules['pygame'] = package
+    for name in SUBMODULES:
+        sys.modules['pygame.' + name] = getattr(package, name)
+    return saved
+
+def uninstall(saved):
+    for name, module in saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+@contextmanager
+def installed():
+    reset()
+    saved = install()
+    try:
+        yield sys.modules[__name__]
+    finally:
+        uninstall(saved)
@@ -0,0 +1,98 @@
+"""pygame constants, with the values pygame 2 uses."""
+
+NOEVENT = 0
+QUIT = 256
+KEYDOWN = 768
+KEYUP = 769
+TEXTEDITING = 770
+TEXTINPUT = 771
+MOUSEMOTION = 1024
+MOUSEBUTTONDOWN = 1025
+MOUSEBUTTONUP = 1026
+MOUSEWHEEL = 1027
+JOYAXISMOTION = 1536
+JOYBUTTONDOWN = 1539
+JOYBUTTONUP = 1540
+ACTIVEEVENT = 32768
+VIDEORESIZE = 32769
+VIDEOEXPOSE = 32770
+WINDOWFOCUSGAINED = 32785
+WINDOWFOCUSLOST = 32786
+WINDOWCLOSE = 32787
+USEREVENT = 32866
+NUMEVENTS = 65535
+
+BUTTON_LEFT = 1
+BUTTON_MIDDLE = 2
+BUTTON_RIGHT = 3
+BUTTON_WHEELUP = 4
+BUTTON_WHEELDOWN = 5
+
+HWSURFACE = 1
+OPENGL = 2
+RESIZABLE = 16
+NOFRAME = 32
+SHOWN = 64
+HIDDEN = 128
+SCALED = 512
+RLEACCEL = 16384
+SRCALPHA = 65536
+DOUBLEBUF = 1073741824
+FULLSCREEN = -2147483648
+
+BLEND_ADD = 1
+BLEND_SUB = 2
+BLEND_MULT = 3
+BLEND_RGBA_MULT = 8
+
+KMOD_NONE = 0
+KMOD_LSHIFT = 1
+KMOD_RSHIFT = 2
+KMOD_SHIFT = 3
+KMOD_LCTRL = 64
+KMOD_RCTRL = 128
+KMOD_CTRL = 192
+KMOD_LALT = 256
+KMOD_RALT = 512
+KMOD_ALT = 768
+
+K_BACKSPACE = 8
+K_TAB = 9
+K_RETURN = 13
+K_ESCAPE = 27
+K_SPACE = 32
+K_PLUS = 43
+K_COMMA = 44
+K_MINUS = 45
+K_PERIOD = 46
+K_SLASH = 47
+K_EQUALS = 61
+K_DELETE = 127
+K_CAPSLOCK = 1073741881
+K_PAUSE = 1073741896
+K_INSERT = 1073741897
+K_HOME = 1073741898
+K_PAGEUP = 1073741899
+K_END = 1073741901
+K_PAGEDOWN = 1073741902
+K_RIGHT = 1073741903
+K_LEFT = 1073741904
+K_DOWN = 1073741905
+K_UP = 1073741906
+K_KP_ENTER = 1073741912
+K_LCTRL = 1073742048
+K_LSHIFT = 1073742049
+K_LALT = 1073742050
+K_RCTRL = 1073742052
+K_RSHIFT = 1073742053
+K_RALT = 1073742054
+
+for _i in range(10):
+    globals()[f'K_{_i}'] = 48 + _i
+    # K_KP1..K_KP9 follow each other, K_KP0 comes after them
+    globals()[f'K_KP{_i}'] = 1073741922 if _i == 0 else 1073741912 + _i
+for _i in range(26):
+    globals()[f'K_{chr(97 + _i)}'] = 97 + _i
+for _i in range(12):
+    globals()[f'K_F{_i + 1}'] = 1073741882 + _i
+del _i
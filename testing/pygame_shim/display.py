@@ -0,0 +1,52 @@
+"""pygame.display backed by an off-screen shim Surface."""
+
+from .surface import Surface
+
+DEFAULT_SIZE = (640, 480)
+
+_state = {'surface': None, 'caption': ('pygame window', 'pygame window'), 'init': False}
+
+def init():
+    _state['init'] = True
+
+def quit():
+    _state['init'] = False
+    _state['surface'] = None
+
+def get_init():
+    return _state['init']
+
+def set_mode(size=(0, 0), flags=0, depth=0, display=0, vsync=0):
+    _state['init'] = True
+    if not size or not size[0] or not size[1]:
+        size = DEFAULT_SIZE
+    _state['surface'] = Surface(size, flags)
+    return _state['surface']
+
+def get_surface():
+    return _state['surface']
+
+def flip():
+    pass
+
+def update(*args, **kwargs):
+    pass
+
+def set_caption(title, icontitle=None):
+    _state['caption'] = (title, icontitle or title)
+
+def get_caption():
+    return _state['caption']
+
+def set_icon(surface):
+    pass
+
+def toggle_fullscreen():
+    return 0
+
+def get_active():
+    return _state['surface'] is not None
+
+class Info:
+    def __init__(self):
+        self.current_w, self.current_h = DEFAULT_SIZE
@@ -0,0 +1,38 @@
+"""pygame.draw: nothing is drawn, each call returns its bounding Rect."""
+
+from .rect import Rect
+
+def _bounds(points, width=1):
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    pad = max(int(width), 1) // 2
+    return Rect(min(xs) - pad, min(ys) - pad, max(xs) - min(xs) + 1 + 2 * pad,
+                max(ys) - min(ys) + 1 + 2 * pad)
+
+def rect(surface, color, rect, width=0, *args, **kwargs):
+    return Rect(rect)
+
+def ellipse(surface, color, rect, width=0):
+    return Rect(rect)
+
+def arc(surface, color, rect, start_angle, stop_angle, width=1):
+    return Rect(rect)
+
+def circle(surface, color, center, radius, width=0, *args, **kwargs):
+    radius = int(radius)
+    return Rect(int(center[0]) - radius, int(center[1]) - radius, 2 * radius, 2 * radius)
+
+def line(surface, color, start_pos, end_pos, width=1):
+    return _bounds([start_pos, end_pos], width)
+
+def aaline(surface, color, start_pos, end_pos, blend=1):
+    return _bounds([start_pos, end_pos])
+
+def lines(surface, color, closed, points, width=1):
+    return _bounds(points, width)
+
+def aalines(surface, color, closed, points, blend=1):
+    return _bounds(points)
+
+def polygon(surface, color, points, width=0):
+    return _bounds(points)
@@ -0,0 +1,86 @@
+"""In-memory pygame.event queue; nothing arrives unless it is posted."""
+
+from collections import deque
+from .constants import NOEVENT, USEREVENT, NUMEVENTS
+
+_queue = deque()
+_next_custom = [USEREVENT + 1]
+
+class Event:
+    def __init__(self, type, dict=None, **attrs):
+        self.type = type
+        if dict:
+            self.__dict__.update(dict)
+        self.__dict__.update(attrs)
+
+    @property
+    def dict(self):
+        return {k: v for k, v in self.__dict__.items() if k != 'type'}
+
+    def __repr__(self):
+        return f"<Event({self.type} {self.dict})>"
+
+    def __eq__(self, other):
+        return isinstance(other, Event) and self.__dict__ == other.__dict__
+
+    def __bool__(self):
+        return self.type != NOEVENT
+
+EventType = Event
+
+def _matches(event, eventtype):
+    if eventtype is None:
+        return True
+    if isinstance(eventtype, (list, tuple, set)):
+        return event.type in eventtype
+    return event.type == eventtype
+
+def get(eventtype=None, pump=True, exclude=None):
+    events = [e for e in _queue if _matches(e, eventtype) and not (exclude and _matches(e, exclude))]
+    for event in events:
+        _queue.remove(event)
+    return events
+
+def poll():
+    return _queue.popleft() if _queue else Event(NOEVENT)
+
+def wait(timeout=0):
+    # Blocking would hang a headless check forever
+    return poll()
+
+def peek(eventtype=None, pump=True):
+    if eventtype is None:
+        return bool(_queue)
+    return any(_matches(e, eventtype) for e in _queue)
+
+def post(event):
+    _queue.append(event)
+    return True
+
+def clear(eventtype=None, pump=True):
+    for event in [e for e in _queue if _matches(e, eventtype)]:
+        _queue.remove(event)
+
+def pump():
+    pass
+
+def set_blocked(eventtype):
+    pass
+
+def set_allowed(eventtype):
+    pass
+
+def get_blocked(eventtype):
+    return False
+
+def set_grab(grab):
+    pass
+
+def custom_type():
+    if _next_custom[0] >= NUMEVENTS:
+        raise RuntimeError("pygame.event.custom_type made too many event types.")
+    _next_custom[0] += 1
+    return _next_custom[0] - 1
+
+def event_name(type):
+    return 'Unknown'
@@ -0,0 +1,62 @@
+"""pygame.font with metrics estimated from the point size."""
+
+from .surface import Surface
+
+_state = {'init': False}
+
+def init():
+    _state['init'] = True
+
+def quit():
+    _state['init'] = False
+
+def get_init():
+    return _state['init']
+
+def get_default_font():
+    return 'freesansbold.ttf'
+
+def get_fonts():
+    return []
+
+def match_font(name, bold=False, italic=False):
+    return None
+
+class Font:
+    def __init__(self, name=None, size=12):
+        self.point_size = int(size)
+        self.bold = False
+        self.italic = False
+        self.underline = False
+
+    def size(self, text):
+        return (len(str(text)) * self.point_size // 2, self.get_height())
+
+    def render(self, text, antialias=True, color=(0, 0, 0), background=None):
+        return Surface(self.size(text))
+
+    def get_height(self):
+        return self.point_size
+
+    get_linesize = get_height
+
+    def get_ascent(self):
+        return self.point_size * 3 // 4
+
+    def get_descent(self):
+        return -(self.point_size // 4)
+
+    def set_bold(self, value):
+        self.bold = bool(value)
+
+    def set_italic(self, value):
+        self.italic = bool(value)
+
+    def set_underline(self, value):
+        self.underline = bool(value)
+
+def SysFont(name, size, bold=False, italic=False):
+    font = Font(None, size)
+    font.bold = bold
+    font.italic = italic
+    return font
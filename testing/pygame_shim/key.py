@@ -0,0 +1,30 @@
+"""pygame.key: no key is ever held."""
+
+class ScancodeWrapper(tuple):
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return False
+        return super().__getitem__(key)
+
+def get_pressed():
+    return ScancodeWrapper((False,) * 512)
+
+def get_mods():
+    return 0
+
+def set_mods(mods):
+    pass
+
+def set_repeat(delay=0, interval=0):
+    pass
+
+def get_repeat():
+    return (0, 0)
+
+def get_focused():
+    return True
+
+def name(key, use_compat=True):
+    if 32 <= key < 127:
+        return chr(key)
+    return 'unknown key'
@@ -0,0 +1,5 @@
+"""pygame.locals: the constants plus Rect and Color, for star imports."""
+
+from .constants import *
+from .rect import Rect
+from .surface import Color
@@ -0,0 +1,205 @@
+"""Pure-Python pygame.math.Vector2."""
+
+import math as _math
+
+def _xy(value):
+    if isinstance(value, Vector2):
+        return value.x, value.y
+    return float(value[0]), float(value[1])
+
+class Vector2:
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x=0.0, y=None):
+        if y is None:
+            if isinstance(x, (int, float)):
+                self.x = self.y = float(x)
+            else:
+                self.x, self.y = _xy(x)
+        else:
+            self.x, self.y = float(x), float(y)
+
+    def __repr__(self):
+        return f"Vector2({self.x:g}, {self.y:g})"
+
+    def __iter__(self):
+        return iter((self.x, self.y))
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return (self.x, self.y)[index]
+
+    def __setitem__(self, index, value):
+        values = [self.x, self.y]
+        values[index] = float(value)
+        self.x, self.y = values
+
+    def __eq__(self, other):
+        try:
+            return (self.x, self.y) == _xy(other)
+        except (TypeError, IndexError, ValueError):
+            return NotImplemented
+
+    def __bool__(self):
+        return self.x != 0 or self.y != 0
+
+    def __add__(self, other):
+        ox, oy = _xy(other)
+        return Vector2(self.x + ox, self.y + oy)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        ox, oy = _xy(other)
+        return Vector2(self.x - ox, self.y - oy)
+
+    def __rsub__(self, other):
+        ox, oy = _xy(other)
+        return Vector2(ox - self.x, oy - self.y)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Vector2(self.x * other, self.y * other)
+        # Vector * vector is the dot product, as in pygame
+        return self.dot(other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return Vector2(self.x / scalar, self.y / scalar)
+
+    def __floordiv__(self, scalar):
+        return Vector2(self.x // scalar, self.y // scalar)
+
+    def __neg__(self):
+        return Vector2(-self.x, -self.y)
+
+    def __pos__(self):
+        return Vector2(self.x, self.y)
+
+    def __abs__(self):
+        return self.length()
+
+    def __iadd__(self, other):
+        ox, oy = _xy(other)
+        self.x += ox
+        self.y += oy
+        return self
+
+    def __isub__(self, other):
+        ox, oy = _xy(other)
+        self.x -= ox
+        self.y -= oy
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def __itruediv__(self, scalar):
+        self.x /= scalar
+        self.y /= scalar
+        return self
+
+    def copy(self):
+        return Vector2(self.x, self.y)
+
+    __copy__ = copy
+
+    @property
+    def xy(self):
+        return Vector2(self.x, self.y)
+
+    def update(self, x=0.0, y=None):
+        self.__init__(x, y)
+
+    def dot(self, other):
+        ox, oy = _xy(other)
+        return self.x * ox + self.y * oy
+
+    def cross(self, other):
+        ox, oy = _xy(other)
+        return self.x * oy - self.y * ox
+
+    def length(self):
+        return _math.hypot(self.x, self.y)
+
+    magnitude = length
+
+    def length_squared(self):
+        return self.x * self.x + self.y * self.y
+
+    magnitude_squared = length_squared
+
+    def is_normalized(self):
+        return abs(self.length_squared() - 1) < 1e-6
+
+    def normalize(self):
+        length = self.length()
+        if length == 0:
+            raise ValueError("Can't normalize Vector of length Zero")
+        return Vector2(self.x / length, self.y / length)
+
+    def normalize_ip(self):
+        self.x, self.y = self.normalize()
+
+    def scale_to_length(self, value):
+        length = self.length()
+        if length == 0:
+            raise ValueError("Cannot scale a vector with zero length")
+        self.x *= value / length
+        self.y *= value / length
+
+    def distance_to(self, other):
+        ox, oy = _xy(other)
+        return _math.hypot(self.x - ox, self.y - oy)
+
+    def distance_squared_to(self, other):
+        ox, oy = _xy(other)
+        return (self.x - ox) ** 2 + (self.y - oy) ** 2
+
+    def angle_to(self, other):
+        ox, oy = _xy(other)
+        return _math.degrees(_math.atan2(oy, ox) - _math.atan2(self.y, self.x))
+
+    def as_polar(self):
+        return self.length(), _math.degrees(_math.atan2(self.y, self.x))
+
+    def rotate(self, angle):
+        return self.rotate_rad(_math.radians(angle))
+
+    def rotate_rad(self, angle):
+        c, s = _math.cos(angle), _math.sin(angle)
+        return Vector2(self.x * c - self.y * s, self.x * s + self.y * c)
+
+    def rotate_ip(self, angle):
+        self.x, self.y = self.rotate(angle)
+
+    def reflect(self, normal):
+        n = Vector2(normal).normalize()
+        return self - n * (2 * self.dot(n))
+
+    def reflect_ip(self, normal):
+        self.x, self.y = self.reflect(normal)
+
+    def lerp(self, other, t):
+        ox, oy = _xy(other)
+        return Vector2(self.x + (ox - self.x) * t, self.y + (oy - self.y) * t)
+
+    def elementwise(self):
+        return _Elementwise(self)
+
+class _Elementwise:
+    def __init__(self, vector):
+        self.vector = vector
+
+    def __mul__(self, other):
+        ox, oy = _xy(other)
+        return Vector2(self.vector.x * ox, self.vector.y * oy)
+
+    def __truediv__(self, other):
+        ox, oy = _xy(other)
+        return Vector2(self.vector.x / ox, self.vector.y / oy)
@@ -0,0 +1,54 @@
+"""Silent pygame.mixer."""
+
+import types
+
+_state = {'init': False}
+
+def init(*args, **kwargs):
+    _state['init'] = True
+
+def pre_init(*args, **kwargs):
+    pass
+
+def quit():
+    _state['init'] = False
+
+def get_init():
+    return (44100, -16, 2) if _state['init'] else None
+
+def stop():
+    pass
+
+def set_num_channels(count):
+    pass
+
+class Sound:
+    def __init__(self, file=None, buffer=None, array=None):
+        self.volume = 1.0
+
+    def play(self, loops=0, maxtime=0, fade_ms=0):
+        return None
+
+    def stop(self):
+        pass
+
+    def fadeout(self, time):
+        pass
+
+    def set_volume(self, value):
+        self.volume = value
+
+    def get_volume(self):
+        return self.volume
+
+    def get_length(self):
+        return 0.0
+
+def _noop(*args, **kwargs):
+    pass
+
+music = types.SimpleNamespace(
+    load=_noop, play=_noop, stop=_noop, pause=_noop, unpause=_noop,
+    fadeout=_noop, set_volume=_noop, get_volume=lambda: 1.0,
+    get_busy=lambda: False, queue=_noop, rewind=_noop, unload=_noop
+)
@@ -0,0 +1,26 @@
+"""pygame.mouse: the pointer never moves and no button is held."""
+
+_state = {'pos': (0, 0), 'visible': True}
+
+def get_pos():
+    return _state['pos']
+
+def set_pos(*args):
+    _state['pos'] = tuple(args[0]) if len(args) == 1 else tuple(args)
+
+def get_pressed(num_buttons=3):
+    return (False,) * num_buttons
+
+def get_rel():
+    return (0, 0)
+
+def set_visible(value):
+    previous = _state['visible']
+    _state['visible'] = bool(value)
+    return previous
+
+def get_visible():
+    return _state['visible']
+
+def get_focused():
+    return True
@@ -0,0 +1,201 @@
+"""Pure-Python pygame.Rect."""
+
+def _rect_args(args):
+    if len(args) == 1:
+        arg = args[0]
+        if isinstance(arg, Rect):
+            return arg.x, arg.y, arg.w, arg.h
+        if hasattr(arg, 'rect'):
+            return _rect_args((arg.rect() if callable(arg.rect) else arg.rect,))
+        if len(arg) == 2:
+            return arg[0][0], arg[0][1], arg[1][0], arg[1][1]
+        return arg[0], arg[1], arg[2], arg[3]
+    if len(args) == 2:
+        return args[0][0], args[0][1], args[1][0], args[1][1]
+    if len(args) == 4:
+        return args
+    raise TypeError("Argument must be rect style object")
+
+def _point_args(args):
+    if len(args) == 1:
+        return args[0][0], args[0][1]
+    return args[0], args[1]
+
+def _int(value):
+    return int(value)
+
+class Rect:
+    __slots__ = ('x', 'y', 'w', 'h')
+
+    def __init__(self, *args):
+        x, y, w, h = _rect_args(args)
+        self.x, self.y, self.w, self.h = _int(x), _int(y), _int(w), _int(h)
+
+    def __repr__(self):
+        return f"<rect({self.x}, {self.y}, {self.w}, {self.h})>"
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.w, self.h))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.w, self.h)[index]
+
+    def __setitem__(self, index, value):
+        values = [self.x, self.y, self.w, self.h]
+        values[index] = value
+        self.x, self.y, self.w, self.h = (_int(v) for v in values)
+
+    def __eq__(self, other):
+        try:
+            return tuple(self) == tuple(_rect_args((other,)))
+        except (TypeError, IndexError):
+            return NotImplemented
+
+    def __bool__(self):
+        return self.w != 0 and self.h != 0
+
+    def __copy__(self):
+        return Rect(self.x, self.y, self.w, self.h)
+
+    copy = __copy__
+
+    width = property(lambda self: self.w, lambda self, v: setattr(self, 'w', _int(v)))
+    height = property(lambda self: self.h, lambda self, v: setattr(self, 'h', _int(v)))
+    left = property(lambda self: self.x, lambda self, v: setattr(self, 'x', _int(v)))
+    top = property(lambda self: self.y, lambda self, v: setattr(self, 'y', _int(v)))
+
+    @property
+    def right(self):
+        return self.x + self.w
+
+    @right.setter
+    def right(self, value):
+        self.x = _int(value) - self.w
+
+    @property
+    def bottom(self):
+        return self.y + self.h
+
+    @bottom.setter
+    def bottom(self, value):
+        self.y = _int(value) - self.h
+
+    @property
+    def centerx(self):
+        return self.x + self.w // 2
+
+    @centerx.setter
+    def centerx(self, value):
+        self.x = _int(value) - self.w // 2
+
+    @property
+    def centery(self):
+        return self.y + self.h // 2
+
+    @centery.setter
+    def centery(self, value):
+        self.y = _int(value) - self.h // 2
+
+    def _pair(get_x, get_y):
+        def getter(self):
+            return (getattr(self, get_x), getattr(self, get_y))
+
+        def setter(self, value):
+            setattr(self, get_x, value[0])
+            setattr(self, get_y, value[1])
+        return property(getter, setter)
+
+    center = _pair('centerx', 'centery')
+    topleft = _pair('left', 'top')
+    topright = _pair('right', 'top')
+    bottomleft = _pair('left', 'bottom')
+    bottomright = _pair('right', 'bottom')
+    midtop = _pair('centerx', 'top')
+    midbottom = _pair('centerx', 'bottom')
+    midleft = _pair('left', 'centery')
+    midright = _pair('right', 'centery')
+    size = _pair('w', 'h')
+    del _pair
+
+    def move(self, *args):
+        dx, dy = _point_args(args)
+        return Rect(self.x + dx, self.y + dy, self.w, self.h)
+
+    def move_ip(self, *args):
+        dx, dy = _point_args(args)
+        self.x += _int(dx)
+        self.y += _int(dy)
+
+    def inflate(self, *args):
+        dx, dy = _point_args(args)
+        return Rect(self.x - dx // 2, self.y - dy // 2, self.w + dx, self.h + dy)
+
+    def inflate_ip(self, *args):
+        self.x, self.y, self.w, self.h = self.inflate(*args)
+
+    def clamp(self, *args):
+        other = Rect(*args)
+        x = other.x + (other.w - self.w) // 2 if self.w >= other.w else \
+            min(max(self.x, other.x), other.right - self.w)
+        y = other.y + (other.h - self.h) // 2 if self.h >= other.h else \
+            min(max(self.y, other.y), other.bottom - self.h)
+        return Rect(x, y, self.w, self.h)
+
+    def clamp_ip(self, *args):
+        self.x, self.y, self.w, self.h = self.clamp(*args)
+
+    def clip(self, *args):
+        other = Rect(*args)
+        x = max(self.x, other.x)
+        y = max(self.y, other.y)
+        right = min(self.right, other.right)
+        bottom = min(self.bottom, other.bottom)
+        if right <= x or bottom <= y:
+            return Rect(self.x, self.y, 0, 0)
+        return Rect(x, y, right - x, bottom - y)
+
+    def union(self, *args):
+        other = Rect(*args)
+        x = min(self.x, other.x)
+        y = min(self.y, other.y)
+        return Rect(x, y, max(self.right, other.right) - x, max(self.bottom, other.bottom) - y)
+
+    def union_ip(self, *args):
+        self.x, self.y, self.w, self.h = self.union(*args)
+
+    def contains(self, *args):
+        other = Rect(*args)
+        return (self.x <= other.x and self.y <= other.y and
+                other.right <= self.right and other.bottom <= self.bottom)
+
+    def collidepoint(self, *args):
+        px, py = _point_args(args)
+        return self.x <= px < self.right and self.y <= py < self.bottom
+
+    def colliderect(self, *args):
+        other = Rect(*args)
+        return (self.x < other.right and other.x < self.right and
+                self.y < other.bottom and other.y < self.bottom and
+                bool(self) and bool(other))
+
+    def collidelist(self, rects):
+        for i, rect in enumerate(rects):
+            if self.colliderect(rect):
+                return i
+        return -1
+
+    def collidelistall(self, rects):
+        return [i for i, rect in enumerate(rects) if self.colliderect(rect)]
+
+    def normalize(self):
+        if self.w < 0:
+            self.x += self.w
+            self.w = -self.w
+        if self.h < 0:
+            self.y += self.h
+            self.h = -self.h
+
+FRect = Rect
@@ -0,0 +1,119 @@
+"""Pixel-free pygame.Surface and pygame.Color; rendering is a no-op."""
+
+from .rect import Rect
+
+class Surface:
+    def __init__(self, size=(0, 0), flags=0, depth=32, masks=None):
+        self.width = int(size[0])
+        self.height = int(size[1])
+        self.flags = flags
+        self.alpha = None
+        self.colorkey = None
+
+    def __repr__(self):
+        return f"<Surface({self.width}x{self.height}x32 SW)>"
+
+    def get_size(self):
+        return (self.width, self.height)
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_rect(self, **kwargs):
+        rect = Rect(0, 0, self.width, self.height)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def get_flags(self):
+        return self.flags
+
+    def fill(self, color, rect=None, special_flags=0):
+        return Rect(rect) if rect is not None else self.get_rect()
+
+    def blit(self, source, dest=(0, 0), area=None, special_flags=0):
+        width, height = source.get_size() if hasattr(source, 'get_size') else (0, 0)
+        return Rect(dest[0], dest[1], width, height)
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def convert(self, *args):
+        return self.copy()
+
+    convert_alpha = convert
+
+    def copy(self):
+        surface = Surface((self.width, self.height), self.flags)
+        surface.alpha = self.alpha
+        surface.colorkey = self.colorkey
+        return surface
+
+    def subsurface(self, *args):
+        rect = Rect(*args)
+        return Surface((rect.w, rect.h), self.flags)
+
+    def set_alpha(self, value, flags=0):
+        self.alpha = value
+
+    def get_alpha(self):
+        return self.alpha
+
+    def set_colorkey(self, color, flags=0):
+        self.colorkey = color
+
+    def get_colorkey(self):
+        return self.colorkey
+
+    def get_at(self, pos):
+        return Color(0, 0, 0, 255)
+
+    def set_at(self, pos, color):
+        pass
+
+    def scroll(self, dx=0, dy=0):
+        pass
+
+    def lock(self):
+        pass
+
+    def unlock(self):
+        pass
+
+THECOLORS = {
+    'black': (0, 0, 0, 255),
+    'white': (255, 255, 255, 255),
+    'red': (255, 0, 0, 255),
+    'green': (0, 255, 0, 255),
+    'blue': (0, 0, 255, 255),
+    'yellow': (255, 255, 0, 255),
+    'cyan': (0, 255, 255, 255),
+    'magenta': (255, 0, 255, 255),
+    'orange': (255, 165, 0, 255),
+    'purple': (160, 32, 240, 255),
+    'gray': (190, 190, 190, 255),
+    'grey': (190, 190, 190, 255),
+}
+
+class Color(tuple):
+    def __new__(cls, r=0, g=0, b=0, a=255):
+        if isinstance(r, str):
+            name = r.lower().replace(' ', '')
+            if name.startswith('#'):
+                digits = name[1:]
+                values = [int(digits[i:i + 2], 16) for i in range(0, len(digits), 2)]
+                return super().__new__(cls, (values + [255])[:4])
+            return super().__new__(cls, THECOLORS.get(name, (0, 0, 0, 255)))
+        if not isinstance(r, int):
+            values = list(r)
+            return super().__new__(cls, (values + [255])[:4])
+        return super().__new__(cls, (r, g, b, a))
+
+    r = property(lambda self: self[0])
+    g = property(lambda self: self[1])
+    b = property(lambda self: self[2])
+    a = property(lambda self: self[3])
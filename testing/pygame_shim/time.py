@@ -0,0 +1,37 @@
+"""pygame.time on a virtual clock: nothing sleeps, ticks advance a counter."""
+
+_now = [0]
+
+def _advance(ms):
+    _now[0] += max(0, int(ms))
+
+def get_ticks():
+    return _now[0]
+
+def delay(milliseconds):
+    _advance(milliseconds)
+    return int(milliseconds)
+
+wait = delay
+
+def set_timer(event, millis, loops=0):
+    pass
+
+class Clock:
+    def __init__(self):
+        self.frame_ms = 0
+
+    def tick(self, framerate=0):
+        self.frame_ms = int(1000 / framerate) if framerate else 0
+        _advance(self.frame_ms)
+        return self.frame_ms
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self.frame_ms
+
+    get_rawtime = get_time
+
+    def get_fps(self):
+        return 1000.0 / self.frame_ms if self.frame_ms else 0.0
@@ -0,0 +1,29 @@
+"""pygame.transform: only the resulting sizes are computed."""
+
+import math
+from .surface import Surface
+
+def scale(surface, size, dest_surface=None):
+    return Surface(size)
+
+smoothscale = scale
+
+def scale2x(surface, dest_surface=None):
+    return Surface((surface.get_width() * 2, surface.get_height() * 2))
+
+def scale_by(surface, factor, dest_surface=None):
+    fx, fy = (factor, factor) if isinstance(factor, (int, float)) else factor
+    return Surface((int(surface.get_width() * fx), int(surface.get_height() * fy)))
+
+def rotate(surface, angle):
+    radians = math.radians(angle)
+    c, s = abs(math.cos(radians)), abs(math.sin(radians))
+    width, height = surface.get_size()
+    return Surface((int(round(width * c + height * s)), int(round(width * s + height * c))))
+
+def rotozoom(surface, angle, scale):
+    rotated = rotate(surface, angle)
+    return Surface((int(rotated.get_width() * scale), int(rotated.get_height() * scale)))
+
+def flip(surface, flip_x, flip_y):
+    return surface.copy()
@@ -0,0 +1,124 @@
+"""Content-addressed SQLite cache of evaluation results."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+DEFAULT_CACHE_PATH = os.path.join('.eval_cache', 'results.sqlite3')
+DEFAULT_MAX_ENTRIES = 50000
+# Part of every key; bump when the key material changes
+KEY_VERSION = 2
+
+def normalize_code(code_string):
+    """Canonical form used for hashing: only the newline style is normalized."""
+    return code_string.replace('\r\n', '\n').replace('\r', '\n')
+
+def code_hash(code_string):
+    return hashlib.sha256(normalize_code(code_string).encode('utf-8')).hexdigest()
+
+def _digest(code):
+    if isinstance(code, str):
+        return code_hash(code)
+    # A CodeArtifact already carries its hash
+    return code.hash
+
+def cache_key(code_string, game_name, stage, version, params=None):
+    material = json.dumps([KEY_VERSION, _digest(code_string), game_name, stage, str(version),
+                           params or {}], sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or os.environ.get('LLM_EVAL_CACHE', DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, stage TEXT, version TEXT,"
+                " value TEXT, last_used REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)")
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the cache usable from
+        # worker threads and forked processes.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, code_string, game_name, stage, version, params=None):
+        """Return the cached value, or None on a miss."""
+        key = cache_key(code_string, game_name, stage, version, params)
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            return json.loads(row[0])
+        except sqlite3.Error:
+            return None
+
+    def put(self, code_string, game_name, stage, version, value, params=None):
+        key = cache_key(code_string, game_name, stage, version, params)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, stage, version, value, last_used)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, stage, str(version), json.dumps(value), time.time())
+                )
+                self._evict(conn)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn):
+        count = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def invalidate(self, stage=None):
+        """Drop every entry, or every entry of one stage. Returns the count."""
+        with self._connect() as conn:
+            if stage is None:
+                cur = conn.execute("DELETE FROM results")
+            else:
+                cur = conn.execute("DELETE FROM results WHERE stage = ?", (stage,))
+            return cur.rowcount
+
+    def prune(self, stage, current_version):
+        """Drop entries written by older versions of a stage's checker."""
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM results WHERE stage = ? AND version != ?",
+                               (stage, str(current_version)))
+            return cur.rowcount
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--clear':
+        stage = sys.argv[2] if len(sys.argv) > 2 else None
+        removed = ResultCache().invalidate(stage)
+        print(f"Removed {removed} cached results" + (f" for stage {stage}" if stage else ""))
+    else:
+        print("Usage: python -m testing.result_cache --clear [stage]")
+
+if __name__ == '__main__':
+    main()
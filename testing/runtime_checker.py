@@ -2,73 +2,267 @@ import subprocess
 import tempfile
 import os
 import time
+import math
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from . import fork_server
+from . import harness
+from .artifact import as_artifact
 
-def run_code_iterations(code_string, iterations=50, timeout=2):
+CHECKER_VERSION = 2
+RUNTIME_MODES = ('subprocess', 'forkserver')
+DEFAULT_TIMEOUT = 2
+# Wall-clock safety net for frame-budget runs; slow renderers need well
+# over 2s of real time for a 600-frame budget
+FRAME_BUDGET_TIMEOUT = 30
+RUNTIME_THRESHOLD = 0.9
+SPRT_MARGIN = 0.05
+
+def _iteration_outcome(iteration, returncode, stdout, stderr):
+    stdout, report = harness.parse_report(stdout)
+    frames = report['frames'] if report else None
+    if returncode == 0:
+        return True, None, frames
+    err_msg = stderr.strip()
+    if not err_msg:
+        err_msg = stdout.strip()
+    if err_msg and 'pygame' not in err_msg.lower():
+        return False, {
+            'iteration': iteration,
+            'error': err_msg[:200]
+        }, frames
+    return True, None, frames
+
+def _progress_file():
+    fd, path = tempfile.mkstemp(suffix='.frames')
+    os.close(fd)
+    return path
+
+def _read_progress(path):
+    """Frames a killed harness run had completed, or None."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read().strip()
+        return int(data) if data else None
+    except (OSError, ValueError):
+        return None
+
+def _unlink(path):
+    try:
+        if path:
+            os.unlink(path)
+    except OSError:
+        pass
+
+def _exception_outcome(iteration, exc):
+    err_str = str(exc)[:200]
+    if 'pygame' not in err_str.lower():
+        return False, {
+            'iteration': iteration,
+            'error': err_str
+        }, None
+    return True, None, None
+
+def _run_subprocess_iteration(artifact, iteration, timeout, harness_options=None):
+    fd, temp_file = tempfile.mkstemp(suffix='.py')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(artifact.source)
+    except:
+        os.close(fd)
+        return None
+    bytecode_file = None
+    progress_file = None
+
+    try:
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        if 'DISPLAY' not in env:
+            env['DISPLAY'] = ':99'
+
+        if harness_options:
+            # Frames only count if set_mode succeeds, so use the dummy driver
+            env['SDL_VIDEODRIVER'] = 'dummy'
+            env['SDL_AUDIODRIVER'] = 'dummy'
+            progress_file = _progress_file()
+            env[harness.OPTIONS_ENV] = json.dumps(dict(harness_options, progress=progress_file))
+            command = [sys.executable, '-u', harness.__file__, temp_file]
+            if artifact.bytecode is not None:
+                # Same interpreter, so the child can load our code object
+                bytecode_file = temp_file + 'c'
+                with open(bytecode_file, 'wb') as f:
+                    f.write(artifact.bytecode)
+                command.append(bytecode_file)
+        else:
+            command = ['python', '-u', temp_file]
+
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=env
+        )
+        return _iteration_outcome(iteration, result.returncode, result.stdout, result.stderr)
+    except subprocess.TimeoutExpired:
+        return True, None, _read_progress(progress_file) if progress_file else None
+    except Exception as e:
+        return _exception_outcome(iteration, e)
+    finally:
+        for path in (temp_file, bytecode_file, progress_file):
+            _unlink(path)
+
+def _run_forkserver_iteration(artifact, iteration, timeout, harness_options=None):
+    progress_file = None
+    if harness_options:
+        progress_file = _progress_file()
+        harness_options = dict(harness_options, progress=progress_file)
+    try:
+        result = fork_server.get_server().run(artifact.source, timeout, harness_options,
+                                              artifact.bytecode_b64(), artifact.filename)
+        if result['timed_out']:
+            return True, None, _read_progress(progress_file) if progress_file else None
+    except Exception as e:
+        return _exception_outcome(iteration, e)
+    finally:
+        _unlink(progress_file)
+    return _iteration_outcome(iteration, result['returncode'], result['stdout'], result['stderr'])
+
+def _iter_outcomes(run_one, iterations, workers, pause=0):
+    """Yield run_one(i) for i = 1..iterations in order, up to workers at once."""
+    if workers <= 1:
+        for i in range(iterations):
+            yield run_one(i + 1)
+            if pause:
+                time.sleep(pause)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    futures = [pool.submit(run_one, i + 1) for i in range(iterations)]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+def required_successes(iterations, threshold=RUNTIME_THRESHOLD):
+    """Smallest success count whose rate over iterations meets threshold."""
+    for needed in range(iterations + 1):
+        if needed / iterations >= threshold:
+            return needed
+    return iterations + 1
+
+def exact_decision(success_count, remaining, needed):
+    """True/False once the verdict is fixed whatever the remaining runs do."""
+    if success_count >= needed:
+        return True
+    if success_count + remaining < needed:
+        return False
+    return None
+
+def sprt_decision(success_count, failure_count, threshold=RUNTIME_THRESHOLD,
+                  confidence=0.95, margin=SPRT_MARGIN):
+    """Wald's SPRT of p >= threshold + margin against p <= threshold - margin."""
+    p0 = max(threshold - margin, 1e-6)
+    p1 = min(threshold + margin, 1 - 1e-6)
+    alpha = beta = 1 - confidence
+    llr = (success_count * math.log(p1 / p0) +
+           failure_count * math.log((1 - p1) / (1 - p0)))
+    if llr >= math.log((1 - beta) / alpha):
+        return True
+    if llr <= math.log(beta / (1 - alpha)):
+        return False
+    return None
+
+def run_runtime_check(code, iterations=50, timeout=None, mode='subprocess', workers=1,
+                      early_stop=False, confidence=None, threshold=RUNTIME_THRESHOLD,
+                      frame_budget=None, input_game=None):
+    """Run the runtime iterations of code and decide pass/fail against threshold."""
+    if mode not in RUNTIME_MODES:
+        raise ValueError(f"Unknown runtime mode: {mode}")
+    if mode == 'forkserver' and not fork_server.is_supported():
+        mode = 'subprocess'
+    if timeout is None:
+        timeout = FRAME_BUDGET_TIMEOUT if frame_budget else DEFAULT_TIMEOUT
+
+    def harness_options(iteration):
+        options = {}
+        if frame_budget:
+            options['frame_budget'] = frame_budget
+        if input_game:
+            options['input'] = {'game': input_game, 'seed': iteration}
+        return options or None
+
+    artifact = as_artifact(code)
+    if mode == 'forkserver':
+        run_one = lambda i: _run_forkserver_iteration(artifact, i, timeout, harness_options(i))
+        pause = 0
+    else:
+        run_one = lambda i: _run_subprocess_iteration(artifact, i, timeout, harness_options(i))
+        pause = 0 if frame_budget or input_game else 0.05
+
+    needed = required_successes(iterations, threshold)
     errors = []
+    frames = []
     success_count = 0
-    
-    for i in range(iterations):
-        fd, temp_file = tempfile.mkstemp(suffix='.py')
-        try:
-            with os.fdopen(fd, 'w') as f:
-                f.write(code_string)
-        except:
-            os.close(fd)
-            continue
-        
-        try:
-            env = dict(os.environ, PYTHONUNBUFFERED='1')
-            if 'DISPLAY' not in env:
-                env['DISPLAY'] = ':99'
-            
-            result = subprocess.run(
-                ['python', '-u', temp_file],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                env=env
-            )
-            
-            if result.returncode == 0:
+    failure_count = 0
+    iterations_run = 0
+    decision = None
+
+    for outcome in _iter_outcomes(run_one, iterations, workers, pause):
+        iterations_run += 1
+        if outcome is None:
+            frames.append(None)
+        else:
+            passed, error, frame_count = outcome
+            frames.append(frame_count)
+            if passed:
                 success_count += 1
             else:
-                err_msg = result.stderr.strip()
-                if not err_msg:
-                    err_msg = result.stdout.strip()
-                if err_msg and 'pygame' not in err_msg.lower():
-                    errors.append({
-                        'iteration': i + 1,
-                        'error': err_msg[:200]
-                    })
-                else:
-                    success_count += 1
-        except subprocess.TimeoutExpired:
-            success_count += 1
-        except Exception as e:
-            err_str = str(e)[:200]
-            if 'pygame' not in err_str.lower():
-                errors.append({
-                    'iteration': i + 1,
-                    'error': err_str
-                })
-            else:
-                success_count += 1
-        finally:
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
-        
-        time.sleep(0.05)
-    
-    success_rate = success_count / iterations
-    return success_rate, errors
-
-def check_runtime_errors(code_string, iterations=50):
-    success_rate, errors = run_code_iterations(code_string, iterations)
-    
-    if success_rate >= 0.9:
+                failure_count += 1
+                errors.append(error)
+
+        if early_stop:
+            decision = exact_decision(success_count, iterations - iterations_run, needed)
+        if decision is None and confidence is not None:
+            decision = sprt_decision(success_count, failure_count, threshold, confidence)
+        if decision is not None and iterations_run < iterations:
+            break
+
+    stopped_early = iterations_run < iterations
+    if stopped_early:
+        passed = decision
+        success_rate = success_count / iterations_run
+    else:
+        success_rate = success_count / iterations
+        passed = success_rate >= threshold
+
+    return {
+        'passed': passed,
+        'success_rate': success_rate,
+        'errors': errors,
+        'iterations_run': iterations_run,
+        'stopped_early': stopped_early,
+        'frames': frames
+    }
+
+def run_code_iterations(code, iterations=50, timeout=DEFAULT_TIMEOUT, mode='subprocess', workers=1):
+    result = run_runtime_check(code, iterations, timeout, mode, workers)
+    return result['success_rate'], result['errors']
+
+def summarize_runtime_check(result):
+    """Collapse a run_runtime_check() result into (passed, message, errors)."""
+    if result['passed']:
         return True, None, []
     else:
-        msg = f"Runtime errors in {len(errors)}/{iterations} iterations"
-        return False, msg, errors
+        msg = f"Runtime errors in {len(result['errors'])}/{result['iterations_run']} iterations"
+        return False, msg, result['errors']
+
+def check_runtime_errors(code, iterations=50, mode='subprocess', workers=1,
+                         early_stop=False, confidence=None, frame_budget=None, input_game=None):
+    result = run_runtime_check(code, iterations, mode=mode, workers=workers,
+                               early_stop=early_stop, confidence=confidence,
+                               frame_budget=frame_budget, input_game=input_game)
+    return summarize_runtime_check(result)
@@ -1,31 +1,33 @@
-import importlib.util
-import tempfile
-import os
+import copy
+import types
 import sys
+from .artifact import as_artifact
+from .game_logic_checker import strip_blocking_code
+from . import pygame_shim
 
-def load_code_as_module(code_string, module_name="test_module"):
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(code_string)
-        temp_file = f.name
+CHECKER_VERSION = 4
+
+def load_code_as_module(code, module_name="test_module"):
+    artifact = as_artifact(code)
+    if not artifact.ok:
+        return None
     
     try:
-        spec = importlib.util.spec_from_file_location(module_name, temp_file)
-        if spec is None or spec.loader is None:
-            return None
-        module = importlib.util.module_from_spec(spec)
+        module = types.ModuleType(module_name)
+        module.__file__ = artifact.filename
         sys.modules[module_name] = module
-        spec.loader.exec_module(module)
+        # Only the program's own logic is checked, so the headless shim
+        # stands in for pygame. The shim never posts QUIT, so module-level
+        # main loops are stripped first or they would spin forever
+        safe_tree = strip_blocking_code(copy.deepcopy(artifact.tree), module_level=True)
+        with pygame_shim.installed():
+            exec(compile(safe_tree, artifact.filename, 'exec'), module.__dict__)
         return module
     except Exception as e:
         return None
-    finally:
-        try:
-            os.unlink(temp_file)
-        except:
-            pass
 
-def check_game_logic_tic_tac_toe(code_string):
-    module = load_code_as_module(code_string, "ttt_test")
+def check_game_logic_tic_tac_toe(code):
+    module = load_code_as_module(code, "ttt_test")
     if module is None:
         return False, "Failed to load module"
     
@@ -42,8 +44,8 @@ def check_game_logic_tic_tac_toe(code_string):
     except Exception as e:
         return False, f"Logic error: {str(e)}"
 
-def check_game_logic_connect_four(code_string):
-    module = load_code_as_module(code_string, "c4_test")
+def check_game_logic_connect_four(code):
+    module = load_code_as_module(code, "c4_test")
     if module is None:
         return False, "Failed to load module"
     
@@ -63,8 +65,8 @@ def check_game_logic_connect_four(code_string):
     except Exception as e:
         return False, f"Logic error: {str(e)}"
 
-def check_game_logic_snake(code_string):
-    module = load_code_as_module(code_string, "snake_test")
+def check_game_logic_snake(code):
+    module = load_code_as_module(code, "snake_test")
     if module is None:
         return False, "Failed to load module"
     
@@ -75,8 +77,10 @@ def check_game_logic_snake(code_string):
     except Exception as e:
         return False, f"Logic error: {str(e)}"
 
-def check_game_logic_ball_bouncing(code_string):
-    module = load_code_as_module(code_string, "ball_test")
+def check_game_logic_ball_bouncing(code):
+    artifact = as_artifact(code)
+    code_string = artifact.source
+    module = load_code_as_module(artifact, "ball_test")
     if module is None:
         return False, "Failed to load module"
     
@@ -89,8 +93,10 @@ def check_game_logic_ball_bouncing(code_string):
     except Exception as e:
         return False, f"Logic error: {str(e)}"
 
-def check_game_logic_snakes_ladders(code_string):
-    module = load_code_as_module(code_string, "sl_test")
+def check_game_logic_snakes_ladders(code):
+    artifact = as_artifact(code)
+    code_string = artifact.source
+    module = load_code_as_module(artifact, "sl_test")
     if module is None:
         return False, "Failed to load module"
     
@@ -112,10 +118,10 @@ GAME_LOGIC_CHECKERS = {
     'snakes_and_ladders': check_game_logic_snakes_ladders
 }
 
-def check_semantic_correctness(code_string, game_name):
+def check_semantic_correctness(code, game_name):
     if game_name not in GAME_LOGIC_CHECKERS:
         return False, f"Unknown game: {game_name}"
     
     checker = GAME_LOGIC_CHECKERS[game_name]
-    return checker(code_string)
+    return checker(as_artifact(code))
 
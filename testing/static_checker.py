@@ -0,0 +1,153 @@
+"""AST pre-screen that rejects programs which cannot pass before any of them is run."""
+
+import ast
+import builtins
+from .artifact import as_artifact
+
+MODULE_NAMES = {
+    '__file__', '__name__', '__doc__', '__builtins__', '__spec__',
+    '__loader__', '__package__', '__annotations__', '__cached__', '__class__'
+}
+KNOWN_NAMES = set(dir(builtins)) | MODULE_NAMES
+
+EVENT_POLLS = {'get', 'poll', 'wait', 'pump'}
+EXIT_CALLS = {('sys', 'exit'), ('os', '_exit'), (None, 'exit'), (None, 'quit')}
+
+def _bound_names(tree):
+    """Every name bound anywhere in the module, and whether a star import hides some."""
+    names = set()
+    star_import = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == '*':
+                    star_import = True
+                else:
+                    names.add(alias.asname or alias.name.split('.')[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+    return names, star_import
+
+def _check_names(tree):
+    bound, star_import = _bound_names(tree)
+    if star_import:
+        return True, None, None
+    called = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            called.add(id(node.func))
+
+    undefined_name = None
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Name) or not isinstance(node.ctx, ast.Load):
+            continue
+        if node.id in bound or node.id in KNOWN_NAMES:
+            continue
+        if id(node) in called:
+            return False, 'undefined_function', \
+                f"Function '{node.id}' is called but never defined (line {node.lineno})"
+        if undefined_name is None:
+            undefined_name = node
+    if undefined_name is not None:
+        return False, 'undefined_name', \
+            f"Name '{undefined_name.id}' is never defined (line {undefined_name.lineno})"
+    return True, None, None
+
+def _call_target(call):
+    """('module', 'attr') for module.attr(...), (None, 'name') for name(...)."""
+    func = call.func
+    if isinstance(func, ast.Name):
+        return None, func.id
+    if isinstance(func, ast.Attribute):
+        if isinstance(func.value, ast.Name):
+            return func.value.id, func.attr
+        if isinstance(func.value, ast.Attribute):
+            return func.value.attr, func.attr
+    return None, None
+
+def _is_exit(stmt):
+    if isinstance(stmt, ast.Raise):
+        exc = stmt.exc
+        if isinstance(exc, ast.Call):
+            exc = exc.func
+        return isinstance(exc, ast.Name) and exc.id == 'SystemExit'
+    return (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call) and
+            _call_target(stmt.value) in EXIT_CALLS)
+
+def _is_main_guard(stmt):
+    return (isinstance(stmt, ast.If) and isinstance(stmt.test, ast.Compare) and
+            isinstance(stmt.test.left, ast.Name) and stmt.test.left.id == '__name__')
+
+def _top_level_statements(tree):
+    """Module statements in execution order, with a __main__ guard's body inlined."""
+    for stmt in tree.body:
+        if _is_main_guard(stmt):
+            yield from stmt.body
+        else:
+            yield stmt
+
+def _runs_something(stmt, defined):
+    """True if stmt could start the game: a loop, or a call to a module-defined name."""
+    if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return False
+    for node in ast.walk(stmt):
+        if isinstance(node, (ast.While, ast.For, ast.AsyncFor)):
+            return True
+        if isinstance(node, ast.Call):
+            module, name = _call_target(node)
+            if name in defined:
+                return True
+    return False
+
+def _check_top_level_exit(tree):
+    defined = {stmt.name for stmt in ast.walk(tree)
+               if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))}
+    for stmt in _top_level_statements(tree):
+        if _is_exit(stmt):
+            return False, 'top_level_exit', \
+                f"Module exits at line {stmt.lineno} before running the game"
+        if _runs_something(stmt, defined):
+            break
+    return True, None, None
+
+def _check_pygame_usage(tree):
+    has_display = False
+    has_events = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            module, name = _call_target(node)
+            if name == 'set_mode':
+                has_display = True
+            elif module == 'event' and name in EVENT_POLLS:
+                has_events = True
+        elif isinstance(node, ast.ImportFrom) and node.module == 'pygame.event':
+            # from pygame.event import get
+            if any(alias.name in EVENT_POLLS for alias in node.names):
+                has_events = True
+    if not has_display:
+        return False, 'no_display', "pygame.display.set_mode is never called"
+    if not has_events:
+        return False, 'no_event_loop', "pygame events are never polled"
+    return True, None, None
+
+STATIC_RULES = [_check_names, _check_top_level_exit, _check_pygame_usage]
+
+def check_static(code):
+    artifact = as_artifact(code)
+    if artifact.tree is None:
+        return False, 'syntax', artifact.syntax_error
+    for rule in STATIC_RULES:
+        ok, name, error = rule(artifact.tree)
+        if not ok:
+            return False, name, error
+    return True, None, None
@@ -1,46 +1,63 @@
-import ast
-import py_compile
-import tempfile
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .artifact import as_artifact
 
-def check_syntax(code_string):
-    try:
-        ast.parse(code_string)
-        return True, None
-    except SyntaxError as e:
-        return False, str(e)
-    except Exception as e:
-        return False, f"Parse error: {str(e)}"
-
-def check_compile(code_string):
-    try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code_string)
-            temp_file = f.name
-        
-        py_compile.compile(temp_file, doraise=True)
-        os.unlink(temp_file)
-        return True, None
-    except py_compile.PyCompileError as e:
-        if os.path.exists(temp_file):
-            os.unlink(temp_file)
-        return False, str(e)
-    except Exception as e:
-        if os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
-        return False, f"Compile error: {str(e)}"
-
-def validate_syntax(code_string):
-    syntax_ok, syntax_error = check_syntax(code_string)
+CHECKER_VERSION = 2
+BATCH_CHUNK_SIZE = 64
+
+def check_syntax(code):
+    artifact = as_artifact(code)
+    if artifact.syntax_error is not None:
+        return False, artifact.syntax_error
+    return True, None
+
+def check_compile(code):
+    artifact = as_artifact(code)
+    if artifact.syntax_error is not None:
+        return False, f"Compile error: {artifact.syntax_error}"
+    if artifact.compile_error is not None:
+        return False, artifact.compile_error
+    return True, None
+
+def validate_syntax(code):
+    artifact = as_artifact(code)
+    syntax_ok, syntax_error = check_syntax(artifact)
     if not syntax_ok:
         return False, "syntax", syntax_error
     
-    compile_ok, compile_error = check_compile(code_string)
+    compile_ok, compile_error = check_compile(artifact)
     if not compile_ok:
         return False, "compile", compile_error
     
     return True, None, None
 
+def _validate_chunk(codes):
+    return [validate_syntax(code) for code in codes]
+
+def _chunks(codes, size):
+    chunk = []
+    for code in codes:
+        chunk.append(code)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def validate_syntax_batch(codes, workers=None, chunksize=BATCH_CHUNK_SIZE):
+    """Yield validate_syntax() triples for codes in order, compiled across worker processes."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for code in codes:
+            yield validate_syntax(code)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(codes, chunksize):
+            pending.append(pool.submit(_validate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
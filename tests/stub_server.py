@@ -0,0 +1,211 @@
+"""Local stand-ins for the provider APIs, for tests of the llm package."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from llm import providers
+
+DEFAULT_COMPLETION = "Here you go:\n```python\nprint('hello')\n```\n"
+
+class StubServer:
+    """The OpenAI and Anthropic REST APIs, for the SDK-backed providers."""
+
+    def __init__(self, latency=0.0, rate_limited=(), retry_after=0.2, errors=None,
+                 completion=DEFAULT_COMPLETION, keep_alive=True, requests_per_connection=None,
+                 stream_chunk=16, stream_delay=0.0):
+        self.latency = latency
+        self.rate_limited = set(rate_limited)
+        self.retry_after = retry_after
+        self.errors = dict(errors or {})
+        self.completion = completion
+        self.keep_alive = keep_alive
+        self.requests_per_connection = requests_per_connection
+        self.connections = 0
+        self.stream_chunk = stream_chunk
+        self.stream_delay = stream_delay
+        self.stream_events = 0
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def body_for(self, path):
+        text = self.completion
+        if path.endswith('/chat/completions'):
+            return {'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': text}}]}
+        if path.endswith('/v1/messages'):
+            return {'id': 'msg', 'type': 'message', 'role': 'assistant', 'model': 'stub',
+                    'content': [{'type': 'text', 'text': text}]}
+        return None
+
+    def stream_events_for(self, path):
+        """(event name or None, data) pairs for a streamed completion."""
+        pieces = [self.completion[i:i + self.stream_chunk]
+                  for i in range(0, len(self.completion), self.stream_chunk)]
+        if path.endswith('/chat/completions'):
+            return ([(None, {'choices': [{'index': 0, 'delta': {'content': piece}}]}) for piece in pieces]
+                    + [(None, '[DONE]')])
+        # The Anthropic SDK dispatches on the event name
+        events = [{'type': 'message_start',
+                   'message': {'id': 'msg', 'type': 'message', 'role': 'assistant', 'content': [],
+                               'model': 'stub', 'usage': {'input_tokens': 1, 'output_tokens': 0}}},
+                  {'type': 'content_block_start', 'index': 0,
+                   'content_block': {'type': 'text', 'text': ''}}]
+        events += [{'type': 'content_block_delta', 'index': 0,
+                    'delta': {'type': 'text_delta', 'text': piece}} for piece in pieces]
+        events += [{'type': 'content_block_stop', 'index': 0}, {'type': 'message_stop'}]
+        return [(event['type'], event) for event in events]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle on, the
+            # body waits for a delayed ACK on kept-alive connections
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                self.served = 0
+                with stub.lock:
+                    stub.connections += 1
+
+            def send(self, status, payload, headers=()):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                if not stub.keep_alive:
+                    self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(body)
+                self.served += 1
+                if not stub.keep_alive or self.served == stub.requests_per_connection:
+                    self.close_connection = True
+
+            def send_stream(self, events):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                try:
+                    for name, event in events:
+                        data = event if isinstance(event, str) else json.dumps(event)
+                        payload = f'data: {data}\n\n'.encode()
+                        if name is not None:
+                            payload = f'event: {name}\n'.encode() + payload
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(payload), payload))
+                        self.wfile.flush()
+                        with stub.lock:
+                            stub.stream_events += 1
+                        time.sleep(stub.stream_delay)
+                    self.wfile.write(b'0\r\n\r\n')
+                    self.served += 1
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                with stub.lock:
+                    stub.requests.append({'time': time.monotonic(), 'path': self.path,
+                                          'headers': dict(self.headers), 'body': request})
+                    number = len(stub.requests)
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.latency)
+                    if number in stub.rate_limited:
+                        self.send(429, {'error': 'rate limited'}, [('Retry-After', str(stub.retry_after))])
+                        return
+                    if number in stub.errors:
+                        self.send(stub.errors[number], {'error': 'stub error'})
+                        return
+                    path = self.path.split('?')[0]
+                    if request.get('stream'):
+                        self.send_stream(stub.stream_events_for(path))
+                        return
+                    body = stub.body_for(path)
+                    if body is None:
+                        self.send(404, {'error': 'not found'})
+                    else:
+                        self.send(200, body)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+        return Handler
+
+class ScriptedProvider(providers.Provider):
+    """A provider without a network that fails as scripted, then answers completion."""
+    name = 'scripted'
+    default_model = 'scripted-model'
+    settings = {'concurrency': 4, 'rate': 100.0, 'burst': 10}
+
+    def __init__(self, completion=DEFAULT_COMPLETION, latency=0.0, failures=(), stream_chunk=16, **limits):
+        super().__init__(**limits)
+        self.completion = completion
+        self.latency_s = latency
+        self.failures = list(failures)
+        self.stream_chunk = stream_chunk
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.stream_events = 0
+
+    async def _attempt(self, prompt, temperature):
+        self.calls.append(time.monotonic())
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_s)
+        finally:
+            self.in_flight -= 1
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, BaseException):
+                raise failure
+            return None, failure
+        return self.completion, None
+
+    async def _stream_attempt(self, prompt, temperature, scanner):
+        text, failure = await self._attempt(prompt, temperature)
+        if failure is not None:
+            return None, failure
+
+        async def pieces():
+            for i in range(0, len(text), self.stream_chunk):
+                self.stream_events += 1
+                await asyncio.sleep(0)
+                yield text[i:i + self.stream_chunk]
+
+        return await self._feed(pieces(), scanner)
+
+def register_scripted(monkeypatch):
+    """Make get_provider('scripted') build a ScriptedProvider."""
+    monkeypatch.setitem(providers.PROVIDER_SETTINGS, 'scripted', ScriptedProvider.settings)
+    monkeypatch.setitem(providers.PROVIDER_CLASSES, 'scripted', ScriptedProvider)
@@ -0,0 +1,34 @@
+from testing.artifact import build_artifact, as_artifact
+from testing.runtime_checker import run_runtime_check
+from testing.syntax_checker import validate_syntax
+
+
+def test_artifact_compiles_once():
+    artifact = build_artifact("x = 1\n")
+    assert artifact.ok
+    assert artifact.tree is not None
+    assert as_artifact(artifact) is artifact
+    assert artifact.bytecode is not None
+
+
+def test_artifact_records_syntax_error():
+    artifact = build_artifact("def broken(:\n")
+    assert not artifact.ok
+    assert artifact.syntax_error
+    assert artifact.bytecode_b64() is None
+    ok, error, _ = validate_syntax(artifact)
+    assert not ok
+
+
+def test_artifact_records_compile_error():
+    artifact = build_artifact("return 1\n")
+    assert artifact.tree is not None
+    assert not artifact.ok
+    assert artifact.compile_error
+
+
+def test_bytecode_runs_in_forkserver():
+    artifact = build_artifact("raise ValueError('from bytecode')\n")
+    result = run_runtime_check(artifact, iterations=2, mode='forkserver')
+    assert not result['passed']
+    assert 'from bytecode' in result['errors'][0]['error']
@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+from testing import differential, harness
+
+def _reference(game_name):
+    with open(os.path.join('games', differential.REFERENCE_FILES[game_name])) as f:
+        return f.read()
+
+def test_probe_sees_locals_and_program_objects(tmp_path):
+    program = tmp_path / 'program.py'
+    program.write_text("""
+import pygame
+class Game:
+    def __init__(self):
+        self.score = 3
+        self.body = [pygame.Vector2(1, 2)]
+def run():
+    game = Game()
+    board = [[0] * 3 for _ in range(3)]
+    screen = pygame.display.set_mode((10, 10))
+    while True:
+        pygame.display.flip()
+run()
+""")
+    probe = tmp_path / 'probe.jsonl'
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    env[harness.OPTIONS_ENV] = json.dumps({'frame_budget': 3, 'probe': {'path': str(probe)}})
+    subprocess.run([sys.executable, harness.__file__, str(program)], env=env, capture_output=True, timeout=30)
+    snapshots = [json.loads(line) for line in probe.read_text().splitlines()]
+    assert len(snapshots) == 3
+    assert snapshots[0]['game.score'] == 3
+    assert snapshots[0]['game.body'] == [[1.0, 2.0]]
+    assert snapshots[0]['board'] == [[0, 0, 0]] * 3
+
+def test_observers_normalize_representation():
+    xo = differential.observe('tic_tac_toe', [{'board': ['X', '', '', '', 'O', '', '', '', ''], 'game_over': False}])
+    numbers = differential.observe('tic_tac_toe', [{'grid': [[1, 0, 0], [0, 2, 0], [0, 0, 0]], 'winner': None}])
+    assert xo == numbers
+    bottom = [[0] * 7 for _ in range(6)]
+    top = [[0] * 7 for _ in range(6)]
+    bottom[0][3] = 1
+    top[5][3] = 'R'
+    assert differential.observe('connect_four', [{'board': bottom}]) == \
+        differential.observe('connect_four', [{'board': top}])
+
+def test_reference_matches_itself():
+    report = differential.run_differential(_reference('tic_tac_toe'), 'tic_tac_toe', frames=100)
+    assert report['passed'] is True
+    assert report['frames'] == 100
+    assert report['fields'] == ['board', 'game_over']
+
+def test_first_divergence_reported():
+    code = _reference('tic_tac_toe').replace(
+        "board[row][0] == player and board[row][1] == player and board[row][2] == player", "False")
+    report = differential.run_differential(code, 'tic_tac_toe', frames=100)
+    assert report['passed'] is False
+    assert report['divergence']['field'] == 'game_over'
+    assert report['divergence']['reference'] is True and report['divergence']['candidate'] is False
+
+def test_candidate_crash_reported():
+    code = _reference('ball_bouncing').replace(
+        "        clock.tick(60)", "        clock.tick(60)\n        if pygame.time.get_ticks() > 500:\n            1 / 0")
+    passed, error = differential.summarize_differential(
+        differential.run_differential(code, 'ball_bouncing', frames=100))
+    assert passed is False
+    assert 'ZeroDivisionError' in error
@@ -25,3 +25,17 @@ def test_generate_summary():
     assert summary['semantic_passed'] is True
     assert summary['overall_passed'] is True
 
+
+def test_evaluate_static_failure_skips_runtime():
+    code = "import pygame\nscreen = pygame.display.set_mode((100, 100))\nwhile True:\n    pygame.event.get()\n    draw_board()\n"
+    results = evaluate_code(code, 'tic_tac_toe', runtime_iterations=5, static_check=True)
+    assert results['static']['passed'] is False
+    assert results['static']['rule'] == 'undefined_function'
+    assert results['runtime'].get('skipped') is True
+    assert results['semantic']['passed'] is False
+
+def test_evaluate_static_check_is_opt_in():
+    code = "print('test')"
+    results = evaluate_code(code, 'tic_tac_toe', runtime_iterations=2)
+    assert results['static']['passed'] is True
+    assert results['runtime'].get('skipped') is None
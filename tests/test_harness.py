@@ -0,0 +1,69 @@
+import pytest
+import time
+from testing.harness import parse_report
+from testing.runtime_checker import run_runtime_check
+
+GAME_LOOP = """
+import pygame, time
+pygame.init()
+screen = pygame.display.set_mode((100, 100))
+clock = pygame.time.Clock()
+while True:
+    for event in pygame.event.get():
+        pass
+    time.sleep(0.5)
+    pygame.display.flip()
+    clock.tick(60)
+"""
+
+def test_parse_report():
+    stdout, report = parse_report('hello\n__HARNESS_REPORT__ {"status": "frame_budget", "frames": 3}\n')
+    assert stdout == 'hello\n'
+    assert report['frames'] == 3
+    assert parse_report('plain output\n') == ('plain output\n', None)
+
+def test_frame_budget_ends_run_without_waiting():
+    for mode in ('forkserver', 'subprocess'):
+        start = time.time()
+        result = run_runtime_check(GAME_LOOP, iterations=2, timeout=10, mode=mode, frame_budget=20)
+        assert result['passed'] is True
+        assert result['frames'] == [20, 20]
+        assert time.time() - start < 10
+
+def test_frame_budget_reports_error_after_frames():
+    code = GAME_LOOP.replace("    clock.tick(60)", "    clock.tick(60)\n    if pygame.time.get_ticks() > 100:\n        x = 1 / 0")
+    result = run_runtime_check(code, iterations=1, mode='forkserver', frame_budget=50)
+    assert result['passed'] is False
+    assert 'ZeroDivisionError' in result['errors'][0]['error']
+    assert 0 < result['frames'][0] < 50
+
+def test_virtual_timers_fire():
+    code = """
+import pygame
+pygame.init()
+screen = pygame.display.set_mode((100, 100))
+TICK = pygame.USEREVENT
+pygame.time.set_timer(TICK, 100)
+fired = 0
+clock = pygame.time.Clock()
+while True:
+    for event in pygame.event.get():
+        if event.type == TICK:
+            fired += 1
+    if fired >= 3:
+        raise SystemExit(0)
+    pygame.display.flip()
+    clock.tick(50)
+"""
+    result = run_runtime_check(code, iterations=1, mode='forkserver', frame_budget=100)
+    assert result['passed'] is True
+    assert result['frames'][0] < 100
+
+def test_injected_input_reaches_handlers():
+    code = GAME_LOOP.replace("    for event in pygame.event.get():\n        pass",
+                             "    for event in pygame.event.get():\n        if event.type == pygame.KEYDOWN and event.key == pygame.K_UP:\n            x = 1 / 0")
+    idle = run_runtime_check(code, iterations=1, mode='forkserver', frame_budget=100)
+    assert idle['passed'] is True
+    driven = run_runtime_check(code, iterations=1, mode='forkserver', frame_budget=100, input_game='snake_game')
+    assert driven['passed'] is False
+    assert 'ZeroDivisionError' in driven['errors'][0]['error']
@@ -0,0 +1,21 @@
+import pytest
+from itertools import islice
+from testing.input_scripts import event_stream, GAME_INPUTS
+
+def test_streams_are_seeded():
+    for game in GAME_INPUTS:
+        first = list(islice(event_stream(game, seed=3), 200))
+        second = list(islice(event_stream(game, seed=3), 200))
+        assert first == second
+        assert any(first)
+
+def test_tic_tac_toe_clicks_hit_cells():
+    for batch in islice(event_stream('tic_tac_toe', seed=1), 500):
+        for type_name, attrs in batch:
+            if type_name == 'MOUSEBUTTONDOWN':
+                x, y = attrs['pos']
+                assert x % 200 == 100 and y % 200 == 100
+
+def test_unknown_game():
+    with pytest.raises(ValueError):
+        next(event_stream('chess'))
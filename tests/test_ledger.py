@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+import threading
+import pytest
+import gather_results
+from experiment.ledger import DONE, PENDING, RUNNING, WorkLedger, latest_run, run_base
+
+def test_ledger_states(tmp_path):
+    ledger = WorkLedger(str(tmp_path / 'run.ledger.sqlite3'))
+    units = [('snake_game', 'openai', rep) for rep in range(3)]
+    ledger.add(units)
+    ledger.start(units[0])
+    ledger.finish(units[0])
+    ledger.start(units[1])
+    # Adding again keeps existing states
+    ledger.add(units)
+    assert ledger.counts() == {PENDING: 1, RUNNING: 1, DONE: 1}
+    assert ledger.remaining(units) == units[1:]
+    assert list(ledger.interrupted()) == [units[1]]
+
+def test_logged_result_finishes_its_unit(tmp_path):
+    ledger = WorkLedger(str(tmp_path / 'run.ledger.sqlite3'))
+    units = [('snake_game', 'openai', rep) for rep in range(2)]
+    ledger.add(units)
+    ledger.start(units[0])
+    ledger.finish_logged(None)
+    # Logged, then the run died before finish()
+    ledger.finish_logged({'game': 'snake_game', 'model': 'openai', 'rep': 0, 'result': {}})
+    # Only running units are finished this way
+    ledger.finish_logged({'game': 'snake_game', 'model': 'openai', 'rep': 1, 'result': {}})
+    assert ledger.remaining(units) == units[1:]
+    assert ledger.interrupted() == {}
+
+def test_latest_run_and_run_base(tmp_path):
+    prefix = str(tmp_path / 'experiment_results_')
+    for name in ['experiment_results_100', 'experiment_results_with_logic_300']:
+        WorkLedger(str(tmp_path / name) + '.ledger.sqlite3')
+    assert latest_run(prefix) == prefix + '100'
+    assert latest_run(str(tmp_path / 'experiment_results_replay_')) is None
+    assert run_base('a/experiment_results_100.jsonl') == 'a/experiment_results_100'
+    assert run_base('experiment_results_100.ledger.sqlite3') == 'experiment_results_100'
+
+def test_resume_skips_done_units(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LLM_RESPONSE_STORE', str(tmp_path / 'responses.jsonl.gz'))
+    monkeypatch.setattr(gather_results, 'GAMES', ['tic_tac_toe'])
+    monkeypatch.setattr(gather_results, 'REPETITIONS', 4)
+    monkeypatch.setattr(gather_results, 'PIPELINE_GENERATORS', 1)
+    calls = []
+    calls_allowed_past_two = [False]
+
+    def fake_api(prompt, model_name, temperature):
+        calls.append(model_name)
+        return f"```python\nprint({len(calls)})\n```"
+
+    def fake_evaluate(code, game_name, repetition, cache=None):
+        if repetition == 2 and not calls_allowed_past_two[0]:
+            raise KeyboardInterrupt
+        return {'code': code, 'results': {}, 'summary': {'syntax_passed': True}}
+
+    monkeypatch.setattr(gather_results.providers, 'get_provider', lambda name: type('P', (), {'model': 'm'})())
+    monkeypatch.setattr(gather_results, 'call_llm_api', fake_api)
+    monkeypatch.setattr(gather_results, 'evaluate_sample', fake_evaluate)
+    monkeypatch.setattr(sys, 'argv', ['gather_results.py', 'openai'])
+    with pytest.raises(KeyboardInterrupt):
+        gather_results.main()
+    # In a real run the process exits here; let the leftover workers stop
+    for thread in threading.enumerate():
+        if thread.name.startswith('generate-'):
+            thread.join(5)
+    generated_before = len(calls)
+    assert generated_before >= 3
+
+    calls_allowed_past_two[0] = True
+    monkeypatch.setattr(sys, 'argv', ['gather_results.py', 'openai', '--resume'])
+    gather_results.main()
+    # Rep 2 reused its recorded response; only rep 3 could need a new call
+    assert len(calls) <= 4
+    [output] = [name for name in os.listdir(tmp_path) if name.endswith('.json') and name != 'results_matrix.json']
+    with open(tmp_path / output) as f:
+        view = json.load(f)
+    assert [r['code'] for r in view['tic_tac_toe']['openai']] == [f'print({i})' for i in range(1, 5)]
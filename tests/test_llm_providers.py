@@ -0,0 +1,125 @@
+import asyncio
+import time
+import pytest
+from llm import providers
+from llm.rate_limit import TokenBucket
+from tests.stub_server import ScriptedProvider, StubServer, register_scripted
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture(autouse=True)
+def scripted(monkeypatch):
+    register_scripted(monkeypatch)
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0
+    bucket.pause(3)
+    assert bucket.try_acquire() == pytest.approx(3)
+
+def test_concurrency_limit_and_overlap():
+    provider = ScriptedProvider(latency=0.2, concurrency=3)
+
+    async def batch():
+        return await asyncio.gather(*[provider.generate('p', 0) for _ in range(6)])
+
+    start = time.monotonic()
+    assert len(asyncio.run(batch())) == 6
+    elapsed = time.monotonic() - start
+    assert provider.peak_in_flight == 3
+    # Two waves of three, not six requests in a row
+    assert elapsed < 0.2 * 6 * 0.75
+
+def test_rate_limit_spaces_requests():
+    provider = ScriptedProvider(rate=10, burst=1)
+
+    async def batch():
+        await asyncio.gather(*[provider.generate('p', 0) for _ in range(4)])
+
+    asyncio.run(batch())
+    assert provider.calls[-1] - provider.calls[0] >= 0.25
+
+def test_429_pauses_and_retries():
+    provider = ScriptedProvider(failures=[(429, '0.3', 'HTTP 429')] * 2)
+    start = time.monotonic()
+    assert "print('hello')" in asyncio.run(provider.generate('p', 0))
+    assert time.monotonic() - start >= 0.6
+    assert provider.stats['rate_limited'] == 2
+    assert len(provider.calls) == 3
+
+def test_only_retryable_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(providers, 'BACKOFF_BASE', 0.01)
+    provider = ScriptedProvider(failures=[(400, None, 'HTTP 400: bad request')])
+    with pytest.raises(providers.ProviderError, match='HTTP 400'):
+        asyncio.run(provider.generate('p', 0))
+    assert len(provider.calls) == 1
+    # Server and connection errors are retried
+    provider.failures = [(503, None, 'HTTP 503'), ConnectionResetError('reset')]
+    assert "print('hello')" in asyncio.run(provider.generate('p', 0))
+    assert len(provider.calls) == 4 and provider.stats['retries'] == 2
+    # Anything else is a bug, not a failed request
+    provider.failures = [KeyError('oops')]
+    with pytest.raises(KeyError):
+        asyncio.run(provider.generate('p', 0))
+
+def test_generate_sync_uses_shared_provider():
+    providers.reset_providers()
+    try:
+        assert "print('hello')" in providers.generate_sync('scripted', 'p', 0.2)
+        assert providers.get_provider('scripted') is providers.get_provider('scripted')
+    finally:
+        providers.reset_providers()
+    with pytest.raises(providers.UnknownProvider):
+        providers.get_provider('nope')
+
+def test_latency_histograms():
+    providers.reset_providers()
+    try:
+        providers.get_provider('scripted').latency_s = 0.06
+        for _ in range(4):
+            providers.generate_sync('scripted', 'p', 0)
+        entry = providers.latency_report()['scripted']
+        assert entry['request']['count'] == entry['generate']['count'] == 4
+        assert entry['request']['p50_s'] == 0.1
+        assert 'scripted: 4 completions' in providers.format_latency_report(providers.latency_report())
+    finally:
+        providers.reset_providers()
+
+@pytest.mark.parametrize('sdk, cls', [('openai', providers.OpenAIProvider),
+                                      ('anthropic', providers.AnthropicProvider)])
+def test_sdk_providers_against_stub(sdk, cls):
+    pytest.importorskip(sdk)
+    with StubServer() as stub:
+        provider = cls(api_key='test-key', base_url=stub.url, rate=100, burst=10)
+
+        async def sequence():
+            return [await provider.generate('make a game', 0.5) for _ in range(3)]
+
+        assert all("print('hello')" in text for text in asyncio.run(sequence()))
+        assert 'test-key' in ' '.join(stub.requests[0]['headers'].values())
+        # The SDK client keeps its connection alive between requests
+        assert stub.connections == 1
+
+def test_sdk_errors_map_to_retries(monkeypatch):
+    pytest.importorskip('anthropic')
+    monkeypatch.setattr(providers, 'BACKOFF_BASE', 0.01)
+    with StubServer(rate_limited={1, 2}, retry_after=0.3, errors={3: 503, 5: 400}) as stub:
+        provider = providers.AnthropicProvider(api_key='k', base_url=stub.url, rate=100, burst=10)
+        start = time.monotonic()
+        assert "print('hello')" in asyncio.run(provider.generate('p', 0))
+        assert time.monotonic() - start >= 0.6
+        assert provider.stats['rate_limited'] == 2
+        assert len(stub.requests) == 4
+        with pytest.raises(providers.ProviderError, match='HTTP 400'):
+            asyncio.run(provider.generate('p', 0))
+        assert len(stub.requests) == 5
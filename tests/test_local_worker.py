@@ -0,0 +1,93 @@
+import asyncio
+import textwrap
+import pytest
+from llm import providers
+from llm.local_worker import LocalWorker, LocalWorkerError
+
+FAKE_LOCAL_LLM = '''
+import os
+import time
+
+LOADS = []
+BATCHES = []
+
+def load(model_path):
+    LOADS.append(model_path)
+
+def generate(prompt, model_path, temperature):
+    if prompt == 'crash':
+        os._exit(3)
+    if prompt == 'fail':
+        raise ValueError('bad prompt')
+    print('model chatter on stdout')
+    return f"{prompt}|{model_path}|{temperature}|loads={len(LOADS)}|pid={os.getpid()}"
+
+def generate_batch(prompts, model_path, temperatures):
+    time.sleep(0.05)
+    BATCHES.append(len(prompts))
+    return [f"{p}|batch={len(prompts)}|pid={os.getpid()}" for p in prompts]
+'''
+
+@pytest.fixture
+def model_dir(tmp_path):
+    (tmp_path / 'local_llm.py').write_text(textwrap.dedent(FAKE_LOCAL_LLM))
+    return tmp_path
+
+def test_one_worker_serves_many_requests(model_dir):
+    worker = LocalWorker('weights.bin', cwd=str(model_dir))
+    try:
+        prompt = "it's a '''tricky''' prompt\nwith \"quotes\" and \\ backslashes"
+        first = worker.submit(prompt, 0.5).result(30)
+        second = worker.submit('again', 0.1).result(30)
+        assert first.startswith(prompt + '|weights.bin|0.5|loads=1|')
+        assert first.split('pid=')[1] == second.split('pid=')[1]
+        assert worker.starts == 1
+    finally:
+        worker.close()
+
+def test_concurrent_requests_are_batched(model_dir):
+    worker = LocalWorker('m', cwd=str(model_dir))
+    try:
+        worker.submit('warm up', 0).result(30)
+        futures = [worker.submit(f'p{i}', 0) for i in range(6)]
+        texts = [future.result(30) for future in futures]
+        assert [text.split('|')[0] for text in texts] == [f'p{i}' for i in range(6)]
+        assert max(int(text.split('batch=')[1].split('|')[0]) for text in texts) > 1
+    finally:
+        worker.close()
+
+def test_errors_and_restart_after_crash(model_dir):
+    worker = LocalWorker('m', cwd=str(model_dir))
+    try:
+        with pytest.raises(LocalWorkerError) as failed:
+            worker.submit('fail', 0).result(30)
+        assert not failed.value.crashed and 'bad prompt' in str(failed.value)
+        with pytest.raises(LocalWorkerError) as crashed:
+            worker.submit('crash', 0).result(30)
+        assert crashed.value.crashed
+        assert 'loads=1' in worker.submit('after', 0).result(30)
+        assert worker.starts == 2
+    finally:
+        worker.close()
+
+def test_missing_module_is_not_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(providers, 'BACKOFF_BASE', 0.01)
+    provider = providers.LocalProvider('m', cwd=str(tmp_path))
+    try:
+        with pytest.raises(providers.ProviderError, match='local_llm'):
+            asyncio.run(provider.generate('p', 0))
+        assert provider.stats['retries'] == 0
+    finally:
+        provider.worker.close()
+
+def test_local_provider_retries_a_crash(model_dir, monkeypatch):
+    monkeypatch.setattr(providers, 'BACKOFF_BASE', 0.01)
+    provider = providers.LocalProvider('m', cwd=str(model_dir))
+    try:
+        text = asyncio.run(provider.generate('hello', 0.75))
+        assert text.startswith('hello|m|0.75|')
+        with pytest.raises(providers.ProviderError):
+            asyncio.run(provider.generate('crash', 0))
+        assert provider.stats['retries'] == providers.MAX_RETRIES
+    finally:
+        provider.worker.close()
@@ -0,0 +1,21 @@
+import pytest
+from testing.logic_pool import LogicWorkerPool
+from testing import game_logic_checker
+
+def _source(game):
+    with open(f'games/{game}.py') as f:
+        return f.read()
+
+def test_pool_matches_in_process():
+    code = _source('snakes_and_ladders')
+    with LogicWorkerPool() as pool:
+        assert pool.run(code, 'snakes_and_ladders') == game_logic_checker.test_game_logic_headless(code, 'snakes_and_ladders')
+        # Same worker serves the next sample
+        assert game_logic_checker.test_game_logic_headless(code, 'snakes_and_ladders', pool=pool) == (True, None)
+
+def test_pool_recycles_hung_worker():
+    with LogicWorkerPool(timeout=1) as pool:
+        passed, error = pool.run("import time\nfor _ in iter(int, 1):\n    time.sleep(0.1)\n", 'snakes_and_ladders')
+        assert not passed
+        assert 'timed out' in error
+        assert pool.run(_source('snakes_and_ladders'), 'snakes_and_ladders') == (True, None)
@@ -0,0 +1,233 @@
+import types
+import numpy as np
+import pytest
+from testing.oracles import tic_tac_toe, connect_four, snake, ball, snakes_ladders
+from testing import pygame_shim
+
+def _module(source):
+    module = types.ModuleType('candidate')
+    exec(source, module.__dict__)
+    return module
+
+TTT_TWO_ARG = """
+def check_win(b, p):
+    for i in range(3):
+        if b[i][0] == b[i][1] == b[i][2] == p or b[0][i] == b[1][i] == b[2][i] == p:
+            return True
+    return b[0][0] == b[1][1] == b[2][2] == p or b[0][2] == b[1][1] == b[2][0] == p
+"""
+
+def test_tic_tac_toe_reachable_positions():
+    positions = tic_tac_toe.reachable_positions()
+    assert len(positions) == 5478
+    assert tic_tac_toe.parse_position(tic_tac_toe.format_position(positions[-1])) == positions[-1]
+
+def test_tic_tac_toe_oracle_accepts_correct_check_win():
+    report = tic_tac_toe.check_check_win(_module(TTT_TWO_ARG))
+    assert report['mismatches'] == 0
+    assert report['checked'] == 2 * 5478
+
+def test_tic_tac_toe_oracle_reports_minimal_counterexample():
+    # Forgets the anti-diagonal; the module keeps its board as a global
+    source = (
+        "board = [[0] * 3 for _ in range(3)]\n"
+        "def check_win(player):\n"
+        "    lines = [[(r, c) for c in range(3)] for r in range(3)]\n"
+        "    lines += [[(r, c) for r in range(3)] for c in range(3)]\n"
+        "    lines.append([(0, 0), (1, 1), (2, 2)])\n"
+        "    return any(all(board[r][c] == player for r, c in line) for line in lines)\n"
+    )
+    report = tic_tac_toe.check_check_win(_module(source))
+    assert report['adapter'].startswith('check_win(player)')
+    assert report['mismatches'] > 0
+    example = report['counterexample']
+    assert example['expected'] is True
+    assert example['board'].replace(' / ', '').count('.') == 4
+
+def _brute_force_four(board, piece):
+    rows, cols = board.shape
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in [(0, 1), (1, 0), (1, 1), (-1, 1)]:
+                cells = [(r + i * dr, c + i * dc) for i in range(4)]
+                if all(0 <= rr < rows and 0 <= cc < cols and board[rr, cc] == piece for rr, cc in cells):
+                    return True
+    return False
+
+def test_connect_four_positions_are_legal():
+    boards = connect_four.generate_positions(2000, seed=1)
+    filled = boards != 0
+    # Gravity: nothing floats above an empty cell
+    assert (filled[:, 1:, :] <= filled[:, :-1, :]).all()
+    diff = (boards == 1).sum(axis=(1, 2)) - (boards == 2).sum(axis=(1, 2))
+    assert ((diff == 0) | (diff == 1)).all()
+    assert not connect_four.winners(boards).all(axis=1).any()
+
+def test_connect_four_bitboard_matches_brute_force():
+    boards = connect_four.generate_positions(500, seed=2)
+    truth = connect_four.winners(boards)
+    for board, row in zip(boards, truth):
+        assert list(row) == [_brute_force_four(board, 1), _brute_force_four(board, 2)]
+    assert truth.any()
+
+def test_connect_four_corpus_is_memory_mapped(tmp_path):
+    corpus = connect_four.load_corpus(300, seed=3, directory=str(tmp_path))
+    assert isinstance(corpus, np.memmap)
+    assert corpus.shape == (300, connect_four.ROWS, connect_four.COLS)
+    assert (np.asarray(corpus) == connect_four.generate_positions(300, seed=3)).all()
+
+def test_connect_four_oracle_finds_missing_diagonal(tmp_path):
+    corpus = connect_four.load_corpus(1000, seed=4, directory=str(tmp_path))
+    with open('games/connect_four.py') as f:
+        source = f.read()
+    start = source.index('def create_board')
+    end = source.index('def print_board')
+    helpers = "import numpy as np\nROW_COUNT = 6\nCOLUMN_COUNT = 7\n" + source[start:end]
+    good = source[source.index('def winning_move'):source.index('def draw_board')]
+    assert connect_four.check_module(_module(helpers + good), corpus=corpus)['mismatches'] == {}
+
+    bad = good.replace("range(3, ROW_COUNT)", "range(3, 3)")
+    report = connect_four.check_module(_module(helpers + bad), corpus=corpus)
+    assert set(report['mismatches']) <= {'winning_move(board, 1)', 'winning_move(board, 2)'}
+    assert sum(report['mismatches'].values()) > 0
+
+def _reference_snake_module(transform=lambda source: source):
+    with open('games/snake_game.py') as f:
+        source = transform(f.read())
+    module = types.ModuleType('candidate')
+    with pygame_shim.installed():
+        exec(source.replace("if __name__ == '__main__':\n    run_game()", ""), module.__dict__)
+    return module
+
+def test_snake_reference_model_collisions():
+    reference = snake.ReferenceSnake([(2, 0), (1, 0), (0, 0)], (0, -1), 5, 5)
+    reference.move_snake()
+    assert reference.check_collision() == 'wall'
+    reference = snake.ReferenceSnake([(1, 1), (2, 1), (2, 2), (1, 2), (0, 2)], (0, 1), 5, 5)
+    reference.move_snake()
+    assert reference.check_collision() == 'self'
+
+def test_snake_simulation_matches_reference_game():
+    report = snake.simulate(_reference_snake_module(), steps=2000)
+    assert report['divergence'] is None
+    assert report['steps'] == 2000
+    assert report['collisions']['wall'] > 0 and report['collisions']['self'] > 0
+
+def test_snake_simulation_finds_missing_self_collision():
+    module = _reference_snake_module(lambda source: source.replace(
+        "        for block in self.body[1:]:\n            if block == self.body[0]:\n                return True\n", ""))
+    divergence = snake.simulate(module)['divergence']
+    assert divergence['expected_collision'] == 'self'
+    assert divergence['actual_collision'] is False
+
+BALL_REFLECT = """
+class Ball:
+    def __init__(self):
+        self.pos = [400, 300]
+        self.velocity = [3, -4]
+ball = Ball()
+def move_ball():
+    for i, limit in ((0, 780), (1, 580)):
+        ball.pos[i] += ball.velocity[i]
+        if ball.pos[i] < 20:
+            ball.pos[i] = 40 - ball.pos[i]
+            ball.velocity[i] = -ball.velocity[i]
+        elif ball.pos[i] > limit:
+            ball.pos[i] = 2 * limit - ball.pos[i]
+            ball.velocity[i] = -ball.velocity[i]
+"""
+
+BALL_REVERSE = """
+ball_x, ball_y = 400, 300
+ball_dx, ball_dy = 7, -5
+ball_radius = 20
+def update_ball():
+    global ball_x, ball_y, ball_dx, ball_dy
+    ball_x += ball_dx
+    ball_y += ball_dy
+    if ball_x <= ball_radius or ball_x >= 800 - ball_radius:
+        ball_dx = -ball_dx
+    if ball_y <= ball_radius or ball_y >= 600 - ball_radius:
+        ball_dy = -ball_dy
+"""
+
+def _reference_ball_module(transform=lambda source: source):
+    with open('games/ball_bouncing.py') as f:
+        source = transform(f.read())
+    module = types.ModuleType('candidate')
+    with pygame_shim.installed():
+        exec(source.replace("if __name__ == '__main__':\n    run_game()", ""), module.__dict__)
+    return module
+
+def test_ball_reference_trajectories_stay_in_bounds():
+    starts = ball.start_states(64, seed=1)
+    for rule in ('clamp', 'reflect', 'predict'):
+        path = ball.reference_trajectories(starts, 500, rule)
+        assert path[..., 0].min() >= 20 and path[..., 0].max() <= 780
+        assert path[..., 1].min() >= 20 and path[..., 1].max() <= 580
+
+def test_ball_oracle_matches_reference_game():
+    report = ball.check_module(_reference_ball_module())
+    assert report['rule'] == 'clamp'
+    assert report['divergence'] is None and report['out_of_bounds'] is None
+
+def test_ball_oracle_accepts_reflecting_ball_object():
+    report = ball.check_module(_module(BALL_REFLECT))
+    assert report['rule'] == 'reflect'
+    assert report['divergence'] is None and report['out_of_bounds'] is None
+
+def test_ball_oracle_allows_overshoot_when_reversing_in_place():
+    report = ball.check_module(_module(BALL_REVERSE))
+    assert report['rule'] == 'reverse'
+    assert report['divergence'] is None and report['out_of_bounds'] is None
+
+def test_ball_oracle_reports_first_bad_frame():
+    module = _reference_ball_module(lambda source: source.replace(
+        "ball_y = WINDOW_HEIGHT - ball_radius", "ball_y = WINDOW_HEIGHT"))
+    report = ball.check_module(module)
+    # From the centre at 5 px/frame the ball reaches the floor on frame 56
+    assert report['out_of_bounds']['state'] == 0
+    assert report['out_of_bounds']['frame'] == 55
+    assert report['out_of_bounds']['position'] == [680.0, 600.0]
+
+def _reference_snakes_ladders_module(transform=lambda source: source):
+    with open('games/snakes_and_ladders.py') as f:
+        source = transform(f.read())
+    module = types.ModuleType('candidate')
+    with pygame_shim.installed():
+        exec(source.replace("if __name__ == '__main__':\n    run_game()", ""), module.__dict__)
+    return module
+
+def test_snakes_ladders_chain_expected_turns():
+    P = snakes_ladders.transition_matrix()
+    assert np.allclose(P.sum(axis=1), 1.0)
+    # Monte Carlo on the chain itself agrees with the fundamental matrix
+    rolls = np.random.default_rng(1).integers(1, 7, size=(4000, 400))
+    squares = snakes_ladders.simulate_reference(1, rolls)
+    assert (squares[:, -1] == 100).all()
+    turns = (squares < 100).sum(axis=1) + 1
+    mean, variance = snakes_ladders.expected_turns(1)
+    assert abs(turns.mean() - mean) < 4 * np.sqrt(variance / len(turns))
+
+def test_snakes_ladders_oracle_matches_reference_game():
+    report = snakes_ladders.check_module(_reference_snakes_ladders_module())
+    assert report['rule'] == 'stay'
+    assert report['transition_mismatches'] == 0 and report['divergence'] is None
+    assert abs(report['turns_z']) < snakes_ladders.MAX_TURNS_Z
+    assert report['landing_tv'] < snakes_ladders.MAX_LANDING_TV
+
+def test_snakes_ladders_oracle_finds_wrong_ladder():
+    module = _reference_snakes_ladders_module(lambda source: source.replace("3: 22,", "3: 21,"))
+    report = snakes_ladders.check_module(module)
+    assert report['counterexample'] == {'square': 1, 'roll': 2, 'expected': 22, 'actual': 9}
+
+def test_snakes_ladders_oracle_pure_move_function():
+    module = _module("""
+def move(position, roll):
+    position = min(position + roll, 100)
+    jumps = {3: 22, 5: 8, 11: 26, 20: 29, 17: 4, 27: 1, 21: 9, 19: 7, 25: 13, 15: 6}
+    return jumps.get(position, position)
+""")
+    report = snakes_ladders.check_module(module, games=200)
+    assert report['adapter'] == 'move(square, roll)'
+    assert report['rule'] == 'cap' and report['counterexample'] is None
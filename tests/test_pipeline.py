@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+import pytest
+from experiment.pipeline import Pipeline, StageError, format_metrics
+
+def test_results_arrive_in_unit_order():
+    rng = random.Random(0)
+    delays = [rng.uniform(0, 0.02) for _ in range(20)]
+    seen = []
+
+    def generate(unit):
+        time.sleep(delays[unit])
+        return unit * 2
+
+    pipeline = Pipeline(generate, lambda unit, value: value + 1,
+                        lambda unit, result: seen.append((unit, result)),
+                        generators=4, evaluators=2, queue_size=3)
+    pipeline.run(range(20))
+    assert seen == [(i, i * 2 + 1) for i in range(20)]
+    metrics = pipeline.metrics()
+    assert metrics['generate']['done'] == metrics['evaluate']['done'] == 20
+    assert 'ready queue' in format_metrics(metrics)
+
+def test_back_pressure_bounds_generation():
+    lock = threading.Lock()
+    state = {'generated': 0, 'evaluated': 0, 'ahead': 0}
+
+    def generate(unit):
+        with lock:
+            state['generated'] += 1
+            state['ahead'] = max(state['ahead'], state['generated'] - state['evaluated'])
+        return unit
+
+    def evaluate(unit, value):
+        time.sleep(0.01)
+        with lock:
+            state['evaluated'] += 1
+        return value
+
+    pipeline = Pipeline(generate, evaluate, lambda unit, result: None,
+                        generators=4, evaluators=1, queue_size=2)
+    pipeline.run(range(30))
+    metrics = pipeline.metrics()
+    assert metrics['ready_queue']['max'] <= 2
+    # Queue, one sample being evaluated, one per blocked generator
+    assert state['ahead'] <= 2 + 1 + 4
+    assert metrics['generate']['blocked_s'] > 0
+
+def test_generation_overlaps_evaluation():
+    def generate(unit):
+        time.sleep(0.05)
+        return unit
+
+    def evaluate(unit, value):
+        time.sleep(0.05)
+        return value
+
+    start = time.monotonic()
+    Pipeline(generate, evaluate, lambda unit, result: None, generators=4, evaluators=1).run(range(8))
+    # Sequentially this is 8 * 0.1s
+    assert time.monotonic() - start < 0.6
+
+def test_stage_errors_become_results():
+    def generate(unit):
+        if unit == 1:
+            raise RuntimeError('api down')
+        return unit
+
+    def evaluate(unit, value):
+        if isinstance(value, StageError):
+            return value
+        if unit == 2:
+            raise ValueError('bad sample')
+        return value
+
+    seen = {}
+    Pipeline(generate, evaluate, lambda unit, result: seen.__setitem__(unit, result)).run(range(4))
+    assert seen[0] == 0 and seen[3] == 3
+    assert seen[1].stage == 'generate' and 'api down' in seen[1].error
+    assert seen[2].stage == 'evaluate' and 'bad sample' in seen[2].error
+
+def test_interrupt_in_a_stage_stops_the_run():
+    def evaluate(unit, value):
+        if unit == 3:
+            raise KeyboardInterrupt
+        return value
+
+    seen = []
+    pipeline = Pipeline(lambda unit: unit, evaluate, lambda unit, result: seen.append(unit),
+                        generators=2, evaluators=1, queue_size=1)
+    with pytest.raises(KeyboardInterrupt):
+        pipeline.run(range(50))
+    assert seen == [0, 1, 2]
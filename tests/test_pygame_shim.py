@@ -0,0 +1,56 @@
+import sys
+import pytest
+from testing import pygame_shim
+from testing import game_logic_checker
+
+def test_installed_replaces_and_restores_pygame():
+    before = sys.modules.get('pygame')
+    with pygame_shim.installed():
+        import pygame
+        import pygame.display
+        from pygame.locals import QUIT, K_UP
+        assert pygame.IS_SHIM
+        assert pygame.display is pygame_shim.display
+        assert QUIT == 256 and K_UP == pygame.K_UP
+    assert sys.modules.get('pygame') is before
+
+def test_rect_and_vector():
+    rect = pygame_shim.Rect(10, 20, 30, 40)
+    assert rect.center == (25, 40)
+    assert rect.bottomright == (40, 60)
+    assert rect.collidepoint(10, 20) and not rect.collidepoint(40, 60)
+    assert rect.colliderect((35, 55, 10, 10))
+    rect.center = (0, 0)
+    assert rect.topleft == (-15, -20)
+
+    v = pygame_shim.Vector2(3, 4)
+    assert v.length() == 5
+    assert v + (1, 1) == (4, 5)
+    assert v * 2 == pygame_shim.Vector2(6, 8)
+    assert pygame_shim.Vector2(1, 0).reflect((1, 0)) == (-1, 0)
+
+def test_display_event_and_draw():
+    with pygame_shim.installed() as pygame:
+        pygame.init()
+        screen = pygame.display.set_mode((600, 400))
+        assert screen.get_rect().size == (600, 400)
+        assert pygame.draw.circle(screen, (255, 0, 0), (50, 50), 10) == pygame.Rect(40, 40, 20, 20)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        events = pygame.event.get()
+        assert [e.key for e in events] == [pygame.K_SPACE]
+        assert pygame.event.get() == []
+        assert pygame.time.Clock().tick(60) == 16
+
+def test_logic_check_uses_module_globals():
+    code = (
+        "import pygame\n"
+        "START = 5\n"
+        "class Snake:\n"
+        "    def __init__(self):\n"
+        "        self.body = [pygame.Vector2(START - i, START) for i in range(3)]\n"
+        "        self.direction = pygame.Vector2(1, 0)\n"
+        "    def move(self):\n"
+        "        self.body.insert(0, self.body[0] + self.direction)\n"
+        "        self.body.pop()\n"
+    )
+    assert game_logic_checker.test_game_logic_headless(code, 'snake_game') == (True, None)
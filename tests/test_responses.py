@@ -0,0 +1,70 @@
+import gzip
+import threading
+import gather_results
+from experiment.responses import ResponseStore
+
+def test_lookup_returns_latest_matching_response(tmp_path):
+    store = ResponseStore(str(tmp_path / 'responses.jsonl.gz'))
+    store.append('openai', 'gpt-4o-mini', 'prompt a', 0.75, 0, 'first')
+    store.append('openai', 'gpt-4o-mini', 'prompt a', 0.75, 0, 'second')
+    store.append('openai', 'gpt-4o-mini', 'prompt a', 0.75, 1, 'rep 1')
+    store.append('gemini', 'gemini-2.0-flash', 'prompt a', 0.75, 0, 'other provider')
+    store.append('openai', 'gpt-4o', 'prompt a', 0.75, 0, 'other model')
+    replay = ResponseStore(store.path)
+    assert replay.lookup('openai', 'gpt-4o-mini', 'prompt a', 0.75, 0) == 'second'
+    assert replay.lookup('openai', 'gpt-4o', 'prompt a', 0.75, 0) == 'other model'
+    assert replay.lookup('openai', 'gpt-4o-mini', 'prompt a', 0.75, 1) == 'rep 1'
+    assert replay.lookup('openai', 'gpt-4o-mini', 'prompt a', 0.5, 0) is None
+    assert replay.lookup('openai', 'gpt-4o-mini', 'prompt b', 0.75, 0) is None
+    # Appends after the index is built are visible
+    replay.append('openai', 'gpt-4o-mini', 'prompt b', 0.75, 0, 'late')
+    assert replay.lookup('openai', 'gpt-4o-mini', 'prompt b', 0.75, 0) == 'late'
+
+def test_concurrent_appends_and_truncated_tail(tmp_path):
+    store = ResponseStore(str(tmp_path / 'responses.jsonl.gz'))
+
+    def write(worker):
+        for rep in range(25):
+            store.append('openai', 'm', f'prompt {worker}', 0.75, rep, 'x' * 2000)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(list(store.records())) == 100
+    # A writer killed mid-record leaves a partial member at the end
+    member = gzip.compress(b'{"provider": "openai"}\n')
+    with open(store.path, 'ab') as f:
+        f.write(member[:len(member) // 2])
+    assert len(list(store.records())) == 100
+    # Reopening truncates it, so later appends stay readable
+    reopened = ResponseStore(store.path)
+    reopened.append('openai', 'm', 'after crash', 0.75, 0, 'kept')
+    assert len(list(reopened.records())) == 101
+    assert reopened.lookup('openai', 'm', 'after crash', 0.75, 0) == 'kept'
+
+def test_reader_resyncs_after_a_torn_member(tmp_path):
+    path = tmp_path / 'responses.jsonl.gz'
+    store = ResponseStore(str(path))
+    store.append('openai', 'm', 'before', 0.75, 0, 'one')
+    # A member torn mid-file, e.g. by a writer killed while others went on
+    torn = gzip.compress(b'{"provider": "openai"}\n')
+    with open(path, 'ab') as f:
+        f.write(torn[:len(torn) // 2])
+    store.append('openai', 'm', 'after', 0.75, 0, 'two')
+    assert [record['response'] for record in store.records()] == ['one', 'two']
+
+def test_replay_skips_the_api(tmp_path, monkeypatch):
+    store = ResponseStore(str(tmp_path / 'responses.jsonl.gz'))
+    prompt = gather_results.get_prompt('tic_tac_toe')
+    store.append('openai', 'gpt-4o-mini', prompt, gather_results.TEMPERATURE, 3,
+                 "```python\nprint('replayed')\n```")
+
+    def no_api(*args):
+        raise AssertionError('API called during replay')
+
+    monkeypatch.setattr(gather_results, 'call_llm_api', no_api)
+    code = gather_results.generate_sample('tic_tac_toe', 'openai', 3, store, replay=True)
+    assert code == "print('replayed')"
+    assert gather_results.generate_sample('tic_tac_toe', 'openai', 4, store, replay=True) is None
@@ -0,0 +1,44 @@
+import pytest
+from testing.result_cache import ResultCache, cache_key
+from testing.evaluator import evaluate_code
+from testing import semantic_checker
+
+def test_cache_roundtrip(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put("x = 1", 'tic_tac_toe', 'syntax', 1, [True, None])
+    assert cache.get("x = 1", 'tic_tac_toe', 'syntax', 1) == [True, None]
+    assert cache.get("x = 1", 'tic_tac_toe', 'syntax', 2) is None
+    assert cache.get("x = 1", 'connect_four', 'syntax', 1) is None
+
+def test_cache_key_normalizes_only_line_endings():
+    assert cache_key("x = 1\r\ny = 2\r\n", 'g', 'runtime', 1) == cache_key("x = 1\ny = 2\n", 'g', 'runtime', 1)
+    # Trailing whitespace can matter, e.g. inside a string literal
+    assert cache_key("s = '''a  \n'''", 'g', 'runtime', 1) != cache_key("s = '''a\n'''", 'g', 'runtime', 1)
+    assert cache_key("x = 1", 'g', 'runtime', 1, {'iterations': 5}) != cache_key("x = 1", 'g', 'runtime', 1, {'iterations': 10})
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'), max_entries=2)
+    cache.put("a = 1", 'g', 'syntax', 1, [True, None])
+    cache.put("b = 1", 'g', 'syntax', 1, [True, None])
+    cache.get("a = 1", 'g', 'syntax', 1)
+    cache.put("c = 1", 'g', 'syntax', 1, [True, None])
+    assert len(cache) == 2
+    assert cache.get("a = 1", 'g', 'syntax', 1) is not None
+    assert cache.get("b = 1", 'g', 'syntax', 1) is None
+
+def test_cache_invalidate_stage(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    cache.put("a = 1", 'g', 'syntax', 1, [True, None])
+    cache.put("a = 1", 'g', 'runtime', 1, {'passed': True})
+    assert cache.invalidate('runtime') == 1
+    assert cache.get("a = 1", 'g', 'syntax', 1) == [True, None]
+
+def test_evaluate_code_uses_cache(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite3'))
+    code = "print('test')"
+    first = evaluate_code(code, 'tic_tac_toe', runtime_iterations=2, static_check=False, cache=cache)
+    assert len(cache) == 3
+    cache.put(code, 'tic_tac_toe', 'semantic', semantic_checker.CHECKER_VERSION, [True, 'from cache'])
+    second = evaluate_code(code, 'tic_tac_toe', runtime_iterations=2, static_check=False, cache=cache)
+    assert second['runtime'] == first['runtime']
+    assert second['semantic']['error'] == 'from cache'
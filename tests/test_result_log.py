@@ -0,0 +1,44 @@
+import json
+from experiment import result_log
+from experiment.result_log import ResultLog, compact, last_record, materialize, read_log
+
+def test_compact_builds_nested_view(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    with ResultLog(path, fsync_every=2) as log:
+        log.append('tic_tac_toe', 'openai', 1, {'ok': 1})
+        log.append('tic_tac_toe', 'openai', 0, {'ok': 0})
+        log.append('tic_tac_toe', 'gemini', 0, {'ok': 'g'})
+        log.append('snake_game', 'openai', 0, {'ok': 's'})
+        # A rewrite of the same sample replaces the earlier record
+        log.append('tic_tac_toe', 'openai', 1, {'ok': 'again'})
+    view = materialize(path, str(tmp_path / 'run.json'))
+    assert view == {
+        'tic_tac_toe': {'openai': [{'ok': 0}, {'ok': 'again'}], 'gemini': [{'ok': 'g'}]},
+        'snake_game': {'openai': [{'ok': 's'}]},
+    }
+    assert list(view) == ['tic_tac_toe', 'snake_game']
+    with open(tmp_path / 'run.json') as f:
+        assert json.load(f) == view
+
+def test_torn_tail_is_dropped_and_repaired(tmp_path):
+    path = str(tmp_path / 'run.jsonl')
+    with ResultLog(path) as log:
+        log.append('snake_game', 'openai', 0, {'n': 0})
+        log.append('snake_game', 'openai', 1, {'n': 1})
+    with open(path, 'a') as f:
+        f.write('{"game": "snake_game", "model": "op')
+    assert len(list(read_log(path))) == 2
+    assert last_record(path)['rep'] == 1
+    with ResultLog(path) as log:
+        log.append('snake_game', 'openai', 2, {'n': 2})
+    assert [r['rep'] for r in read_log(path)] == [0, 1, 2]
+
+def test_last_record_reads_only_the_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_log, 'TAIL_BLOCK', 64)
+    path = str(tmp_path / 'run.jsonl')
+    with ResultLog(path) as log:
+        for rep in range(200):
+            log.append('ball_bouncing', 'openai', rep, {'code': 'x' * rep})
+    assert last_record(path)['rep'] == 199
+    assert last_record(str(tmp_path / 'missing.jsonl')) is None
+    assert compact([]) == {}
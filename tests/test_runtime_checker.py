@@ -1,5 +1,6 @@
 import pytest
-from testing.runtime_checker import check_runtime_errors
+from testing.runtime_checker import (check_runtime_errors, run_code_iterations, run_runtime_check,
+                                    required_successes, exact_decision, sprt_decision)
 
 def test_runtime_valid_code():
     code = "print('Hello')\nresult = 1 + 1"
@@ -18,3 +19,68 @@ def test_runtime_import_error():
     passed, error, errors = check_runtime_errors(code, iterations=5)
     assert passed is False
 
+
+def test_runtime_forkserver_valid_code():
+    code = "print('Hello')\nresult = 1 + 1"
+    passed, error, errors = check_runtime_errors(code, iterations=5, mode='forkserver')
+    assert passed is True
+    assert error is None
+
+def test_runtime_forkserver_error_code():
+    code = "x = 1 / 0\nprint(x)"
+    passed, error, errors = check_runtime_errors(code, iterations=3, mode='forkserver')
+    assert passed is False
+    assert [e['iteration'] for e in errors] == [1, 2, 3]
+    assert 'ZeroDivisionError' in errors[0]['error']
+
+def test_runtime_forkserver_timeout_counts_as_pass():
+    code = "while True:\n    pass"
+    success_rate, errors = run_code_iterations(code, iterations=2, timeout=0.2, mode='forkserver')
+    assert success_rate == 1.0
+    assert errors == []
+
+def test_runtime_parallel_error_order():
+    code = "import random, time\ntime.sleep(random.random() * 0.05)\nx = 1 / 0"
+    for mode in ('subprocess', 'forkserver'):
+        success_rate, errors = run_code_iterations(code, iterations=6, mode=mode, workers=3)
+        assert success_rate == 0.0
+        assert [e['iteration'] for e in errors] == [1, 2, 3, 4, 5, 6]
+
+def test_exact_decision_bounds():
+    needed = required_successes(50, 0.9)
+    assert needed == 45
+    assert exact_decision(45, 5, needed) is True
+    assert exact_decision(38, 6, needed) is False
+    assert exact_decision(40, 6, needed) is None
+
+def test_sprt_decision():
+    assert sprt_decision(40, 0, 0.9, 0.95) is True
+    assert sprt_decision(1, 3, 0.9, 0.95) is False
+    assert sprt_decision(5, 0, 0.9, 0.95) is None
+
+def test_runtime_early_stop_on_failures():
+    result = run_runtime_check("x = 1 / 0", iterations=20, mode='forkserver', early_stop=True)
+    assert result['passed'] is False
+    assert result['iterations_run'] == 3
+    assert result['stopped_early'] is True
+
+def test_runtime_early_stop_on_passes():
+    result = run_runtime_check("x = 1", iterations=20, mode='forkserver', early_stop=True)
+    assert result['passed'] is True
+    assert result['iterations_run'] == 18
+
+SLOW_FRAMES = """
+import pygame
+pygame.init()
+screen = pygame.display.set_mode((100, 100))
+while True:
+    pygame.event.get()
+    sum(range(200000))
+    pygame.display.flip()
+"""
+
+@pytest.mark.parametrize('mode', ['subprocess', 'forkserver'])
+def test_runtime_timeout_reports_frames_so_far(mode):
+    result = run_runtime_check(SLOW_FRAMES, iterations=1, timeout=1.5, mode=mode, frame_budget=100000)
+    assert result['passed'] is True
+    assert result['frames'][0] is not None and 0 < result['frames'][0] < 100000
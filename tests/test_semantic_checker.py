@@ -52,3 +52,39 @@ position = 1
     passed, error = check_semantic_correctness(code, 'snakes_and_ladders')
     assert isinstance(passed, bool)
 
+def test_semantic_skips_module_level_game_loop():
+    code = """
+import pygame
+pygame.init()
+screen = pygame.display.set_mode((300, 300))
+
+def check_win(board, player):
+    return any(all(cell == player for cell in row) for row in board)
+
+running = True
+while running:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            running = False
+"""
+    assert check_semantic_correctness(code, 'tic_tac_toe') == (True, None)
+
+def test_semantic_keeps_loops_inside_functions():
+    code = """
+import pygame
+
+def check_win(board, player):
+    row = 0
+    while row < 3:
+        if all(cell == player for cell in board[row]):
+            return True
+        row += 1
+    return False
+
+def game_loop():
+    while True:
+        pygame.event.get()
+
+game_loop()
+"""
+    assert check_semantic_correctness(code, 'tic_tac_toe') == (True, None)
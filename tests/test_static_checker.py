@@ -0,0 +1,54 @@
+import pytest
+from testing.static_checker import check_static
+
+GAME = """import pygame
+import sys
+pygame.init()
+screen = pygame.display.set_mode((600, 600))
+
+def draw():
+    screen.fill((0, 0, 0))
+
+while True:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+    draw()
+    pygame.display.flip()
+"""
+
+def test_reference_games_pass():
+    for game in ['tic_tac_toe', 'connect_four', 'snake_game', 'snakes_and_ladders', 'ball_bouncing']:
+        with open(f'games/{game}.py') as f:
+            assert check_static(f.read()) == (True, None, None)
+
+def test_minimal_game_passes():
+    assert check_static(GAME) == (True, None, None)
+
+def test_undefined_function():
+    ok, rule, error = check_static(GAME.replace("    draw()\n", "    draw_board()\n"))
+    assert not ok
+    assert rule == 'undefined_function'
+    assert 'draw_board' in error
+
+def test_undefined_name():
+    ok, rule, _ = check_static(GAME.replace("(0, 0, 0)", "BLACK"))
+    assert not ok
+    assert rule == 'undefined_name'
+
+def test_star_import_disables_name_rules():
+    code = "from pygame.locals import *\n" + GAME.replace("pygame.QUIT", "QUIT")
+    assert check_static(code) == (True, None, None)
+
+def test_top_level_exit():
+    code = GAME.replace("pygame.init()\n", "pygame.init()\nsys.exit()\n")
+    ok, rule, _ = check_static(code)
+    assert rule == 'top_level_exit'
+    # Exiting after the game loop is the normal shutdown path
+    assert check_static(GAME + "pygame.quit()\nsys.exit()\n") == (True, None, None)
+
+def test_no_display_and_no_event_loop():
+    assert check_static("print('hello')")[1] == 'no_display'
+    code = GAME.replace("pygame.event.get()", "[]")
+    assert check_static(code)[1] == 'no_event_loop'
@@ -0,0 +1,84 @@
+import asyncio
+import random
+import pytest
+import gather_results
+from gather_results import extract_code_from_response
+from llm import providers
+from llm.code_scanner import CodeScanner
+from tests.stub_server import ScriptedProvider, StubServer, register_scripted
+
+FENCED = ("Sure! First install pygame:\n```bash\npip install pygame\n```\n"
+          "Then run:\n```python\nimport pygame\nprint('game')\n```\n" + "More explanation. " * 200)
+
+def feed_randomly(scanner, text, seed):
+    rng = random.Random(seed)
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 9)
+        if not scanner.feed(text[position:position + size]):
+            break
+        position += size
+
+@pytest.mark.parametrize('seed', range(10))
+def test_scanner_stops_after_first_python_block(seed):
+    scanner = CodeScanner()
+    feed_randomly(scanner, FENCED, seed)
+    assert scanner.complete and scanner.abort_reason is None
+    assert len(scanner.text) < len(FENCED)
+    assert extract_code_from_response(scanner.text) == extract_code_from_response(FENCED)
+
+def test_scanner_aborts_prose_and_long_responses():
+    prose = CodeScanner(no_code_chars=200)
+    feed_randomly(prose, "I'm sorry, but I can't write that game for you. " * 20, 0)
+    assert prose.abort_reason == 'no code'
+    # Unfenced code is kept; the extractors fall back to the whole text
+    raw = CodeScanner(no_code_chars=200)
+    feed_randomly(raw, "import pygame\n" + "x = 1\n" * 100, 0)
+    assert not raw.stopped
+    long = CodeScanner(max_chars=500)
+    feed_randomly(long, "```python\n" + "x = 1\n" * 200, 0)
+    assert long.abort_reason == 'length budget'
+
+@pytest.fixture
+def scripted(monkeypatch):
+    register_scripted(monkeypatch)
+
+def test_streaming_stops_early(scripted):
+    provider = ScriptedProvider(completion=FENCED, stream_chunk=8)
+    scanner = asyncio.run(provider.generate_streaming('make a game', 0.5))
+    assert scanner.complete
+    assert extract_code_from_response(scanner.text) == "import pygame\nprint('game')"
+    assert provider.stats['stopped_early'] == 1
+    assert provider.stream_events < len(FENCED) // 8 // 2
+
+def test_streamed_retry_starts_over(scripted, monkeypatch):
+    monkeypatch.setattr(providers, 'BACKOFF_BASE', 0.01)
+    provider = ScriptedProvider(completion="```python\nx = 1\n```\n", failures=[(503, None, 'HTTP 503')])
+    scanner = CodeScanner()
+    scanner.feed("```python\nstale = True\n")
+    asyncio.run(provider.generate_streaming('p', 0, scanner))
+    assert extract_code_from_response(scanner.text) == 'x = 1'
+
+@pytest.mark.parametrize('sdk, cls', [('openai', providers.OpenAIProvider),
+                                      ('anthropic', providers.AnthropicProvider)])
+def test_sdk_streaming_stops_early(sdk, cls):
+    pytest.importorskip(sdk)
+    with StubServer(completion=FENCED, stream_chunk=8, stream_delay=0.002) as stub:
+        provider = cls(api_key='k', base_url=stub.url, rate=100, burst=10)
+        scanner = asyncio.run(provider.generate_streaming('make a game', 0.5))
+        assert scanner.complete
+        assert extract_code_from_response(scanner.text) == "import pygame\nprint('game')"
+        assert provider.stats['stopped_early'] == 1
+        # The server noticed the hang-up long before the end of the completion
+        assert stub.stream_events < len(FENCED) // 8 // 2
+        assert stub.requests[0]['body'].get('stream')
+
+def test_call_llm_api_streams_and_drops_prose(scripted, monkeypatch):
+    monkeypatch.setattr(gather_results, 'STREAM_GENERATION', True)
+    providers.reset_providers()
+    try:
+        providers.get_provider('scripted').completion = "No code here, sorry. " * 120
+        assert gather_results.call_llm_api('p', 'scripted') is None
+        assert providers.get_provider('scripted').stats['stopped_early'] == 1
+    finally:
+        providers.reset_providers()
@@ -1,5 +1,5 @@
 import pytest
-from testing.syntax_checker import check_syntax, validate_syntax
+from testing.syntax_checker import check_syntax, validate_syntax, validate_syntax_batch
 
 def test_valid_syntax():
     code = "x = 1 + 2\nprint(x)"
@@ -24,3 +24,9 @@ def test_validate_syntax_invalid():
     assert valid is False
     assert error_type is not None
 
+
+def test_validate_syntax_batch_matches_single():
+    codes = ["x = 1", "x = 1 +\n", "return 5", "def f():\n    return 2"] * 5
+    expected = [validate_syntax(code) for code in codes]
+    assert list(validate_syntax_batch(codes, workers=2, chunksize=3)) == expected
+    assert list(validate_syntax_batch(iter(codes), workers=1)) == expected